@@ -0,0 +1,59 @@
+# Latência do CacheResultados: tempo do solve sem cache, de um acerto com o mesmo ProblemaPL, com as linhas
+# embaralhadas (e desigualdades invertidas) e com o mesmo arquivo, para as famílias de PL geradas.
+#
+# Uso: python -m benchmarks.bench_cache_resultados
+import os
+import tempfile
+import time
+from dataclasses import replace
+import numpy as np
+
+import resolvedor
+from benchmarks.geradores import PROBLEMAS, escrever_pl
+from cache_resultados import CacheResultados, forma_canonica
+from registro import REGISTRO_SILENCIOSO
+
+TAMANHOS = {"denso": 50, "esparso": 100, "transporte": 20, "atribuicao": 15, "degenerado": 50}
+REPETICOES = 200
+INVERTIDO = {"<=": ">=", ">=": "<=", "=": "="}
+
+def embaralhado(problema, semente=0):
+    # Mesmo PL com as linhas em outra ordem, metade delas multiplicada por -1 (com o operador invertido)
+    rng = np.random.default_rng(semente)
+    m = len(problema.vetor_b)
+    ordem = rng.permutation(m)
+    sinais = np.where(rng.random(m) < 0.5, -1.0, 1.0)
+    operadores = np.array([op if s > 0 else INVERTIDO[op] for op, s in zip(problema.vetor_operadores, sinais)])
+    return replace(problema, matriz_coeficientes=(problema.matriz_coeficientes * sinais[:, None])[ordem],
+                   vetor_b=(problema.vetor_b * sinais)[ordem], vetor_operadores=operadores[ordem])
+
+def medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+def main():
+    print(f"{'família':>12} {'m x n':>9} {'solve (ms)':>11} {'chave (µs)':>11} {'mesmo PL (µs)':>14} {'embaralhado (µs)':>17} {'arquivo (µs)':>13}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for familia, tamanho in TAMANHOS.items():
+            A, b, c, operadores = PROBLEMAS[familia](tamanho)
+            caminho = os.path.join(pasta, f"{familia}.txt")
+            escrever_pl(caminho, A, b, c, operadores)
+            problema = resolvedor.ler_modelo(caminho, registro=REGISTRO_SILENCIOSO)
+            outro = embaralhado(problema)
+
+            tempo_solve = medir(lambda: resolvedor.solve(problema), 3)
+            cache = CacheResultados()
+            cache.solve(problema)
+            cache.solve(caminho)
+            tempo_chave = medir(lambda: forma_canonica(problema), REPETICOES)
+            tempo_mesmo = medir(lambda: cache.solve(problema), REPETICOES)
+            tempo_embaralhado = medir(lambda: cache.solve(outro), REPETICOES)
+            tempo_arquivo = medir(lambda: cache.solve(caminho), REPETICOES)
+            print(f"{familia:>12} {f'{A.shape[0]}x{A.shape[1]}':>9} {tempo_solve * 1e3:>11.2f} {tempo_chave * 1e6:>11.0f} {tempo_mesmo * 1e6:>14.0f}"
+                  f" {tempo_embaralhado * 1e6:>17.0f} {tempo_arquivo * 1e6:>13.0f}")
+            assert cache.faltas == 1, cache.estatisticas()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Vazão (cenários por segundo) de simplex_lote.resolver_cenarios contra uma chamada de resolvedor.solve por cenário,
+# em cenários de um mesmo PL denso (mesma A) com c e b perturbados. A resolução por cenário é medida numa amostra,
+# e os objetivos da amostra são comparados com os do lote.
+#
+# Uso: python -m benchmarks.bench_cenarios
+import time
+from dataclasses import replace
+import numpy as np
+
+import funcoes
+import resolvedor
+import simplex_lote
+from benchmarks.geradores import aleatorio_denso
+
+TAMANHOS = [(10, 20), (20, 40), (40, 80)]
+CENARIOS = 2000
+AMOSTRA = 100
+
+def cenarios(m, n, quantidade, semente=0):
+    # Problema base  min c^T x  s.a.  A x <= b, x >= 0  e cenários com c e b perturbados em até ±30%
+    A, b, c = aleatorio_denso(m, n, semente)
+    rng = np.random.default_rng(semente + 1)
+    custos = c * rng.uniform(0.7, 1.3, (quantidade, n))
+    lados_direitos = b * rng.uniform(0.7, 1.3, (quantidade, m))
+    variaveis = np.array([f"x_{j}" for j in range(n)])
+    problema = funcoes.ProblemaPL(n, variaveis, c, A, b, np.array(["<="] * m), None)
+    return problema, custos, lados_direitos
+
+def main():
+    print(f"{CENARIOS} cenários por tamanho (solve medido em {AMOSTRA})\n")
+    print(f"{'m x n':>8} {'solve (cen/s)':>14} {'lote (cen/s)':>13} {'ganho':>7} {'iguais':>7}")
+    for m, n in TAMANHOS:
+        problema, custos, lados_direitos = cenarios(m, n, CENARIOS)
+
+        inicio = time.perf_counter()
+        referencia = [
+            resolvedor.solve(replace(problema, vetor_de_custos=custos[k], vetor_b=lados_direitos[k]))
+            for k in range(AMOSTRA)
+        ]
+        vazao_solve = AMOSTRA / (time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        lote = simplex_lote.resolver_cenarios(problema, custos, lados_direitos)
+        vazao_lote = CENARIOS / (time.perf_counter() - inicio)
+
+        iguais = all(
+            r.status == lote.status[k] and np.isclose(r.objetivo, lote.objetivo[k], rtol=1e-7, atol=1e-7)
+            for k, r in enumerate(referencia)
+        )
+        print(f"{f'{m}x{n}':>8} {vazao_solve:>14.1f} {vazao_lote:>13.1f} {vazao_lote / vazao_solve:>6.1f}x {'sim' if iguais else 'não':>7}")
+
+if __name__ == "__main__":
+    main()
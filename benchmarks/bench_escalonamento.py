@@ -0,0 +1,70 @@
+# Compara pivôs, refatorações e tempo do simplex com e sem escalonamento em PL mal escalonados
+# (as famílias dos geradores com linhas e colunas multiplicadas por potências de 10 aleatórias).
+#
+# Uso: python -m benchmarks.bench_escalonamento
+import contextlib
+import os
+import time
+import numpy as np
+
+import funcoes
+from benchmarks.geradores import FAMILIAS, mal_escalonado
+from escalonamento import calcular_escala, escalar_matriz
+from fatoracao import FatoracaoLU
+from precificacao import REGRAS
+
+TAMANHOS = {"klee_minty": [6, 8], "denso": [50, 100], "esparso": [50, 100, 200]}
+ORDENS = [2, 4]
+
+def resolver(A, b, c, escalonar, regra="dantzig"):
+    # Forma padrão com folgas; com escalonamento, as folgas continuam unitárias (fatores potência de 2)
+    m, n = A.shape
+    matriz = np.hstack((A, np.eye(m)))
+    custos = np.concatenate((c, np.zeros(m)))
+    vetor_b = b
+    inicio = time.perf_counter()
+    if escalonar:
+        escala = calcular_escala(matriz)
+        matriz = escalar_matriz(matriz, escala.fatores_linhas, escala.fatores_colunas)
+        custos = custos * escala.fatores_colunas
+        vetor_b = b * escala.fatores_linhas
+        # A base das folgas escaladas é diag(fatores_linhas * fatores_colunas) = I
+    variaveis = np.array([f"x_{j}" for j in range(n)] + [f"f_{i}" for i in range(m)])
+    colunas_base = list(range(n, n + m))
+    B, N = funcoes.calcular_matrizes_B_N(matriz, colunas_base)
+    Cn, Cb = funcoes.calcular_vetores_Cn_Cb(matriz, custos, colunas_base)
+
+    contador = {"pivos": 0}
+    class RegraContada(REGRAS[regra]):
+        def atualizar(self, *args):
+            contador["pivos"] += 1
+            super().atualizar(*args)
+
+    fatoracao = FatoracaoLU(B)
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        try:
+            status, Z, *_ = funcoes.metodo_simplex(B, N, Cb, Cn, vetor_b, variaveis, colunas_base,
+                                                   fatoracao=fatoracao, regra=RegraContada())
+        except np.linalg.LinAlgError:
+            status, Z = "erro numérico", None
+    # Descontando a fatoração inicial
+    return status, Z, contador["pivos"], fatoracao.refatoracoes - 1, time.perf_counter() - inicio
+
+def main():
+    print(f"{'família':>12} {'tamanho':>8} {'ordens':>7} {'escala':>7} {'pivôs':>7} {'refat.':>7} {'tempo (s)':>10} {'objetivo':>14}")
+    total = {False: 0, True: 0}
+    for familia, gerar in FAMILIAS.items():
+        for tamanho in TAMANHOS[familia]:
+            for ordens in ORDENS:
+                A, b, c = mal_escalonado(*gerar(tamanho), ordens=ordens, semente=tamanho)
+                for escalonar in (False, True):
+                    status, Z, pivos, refatoracoes, tempo = resolver(A, b, c, escalonar)
+                    total[escalonar] += pivos
+                    objetivo = f"{Z:.8g}" if status == funcoes.STATUS_OTIMO else status
+                    print(f"{familia:>12} {tamanho:>8} {ordens:>7} {'sim' if escalonar else 'não':>7} {pivos:>7} "
+                          f"{refatoracoes:>7} {tempo:>10.3f} {objetivo:>14}")
+    print(f"\nTotal de pivôs: {total[False]} sem escalonamento, {total[True]} com escalonamento "
+          f"({100.0 * (1 - total[True] / max(total[False], 1)):.1f}% a menos)")
+
+if __name__ == "__main__":
+    main()
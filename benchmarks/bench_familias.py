@@ -0,0 +1,127 @@
+# Suíte de benchmarks das famílias de PL geradas (Klee–Minty, densos, esparsos, transporte, atribuição, degenerados,
+# inviáveis e ilimitados) numa varredura de tamanhos. Cada PL é gravado em arquivo e resolvido por resolvedor.solve;
+# a Instrumentacao separa o tempo de leitura, de transformação (presolve, forma padrão, escalonamento) e de resolução.
+# Os resultados vão para um JSON; com --comparar, cada tempo é comparado com o de um JSON anterior (a linha de base) e
+# as regressões (tempo acima da tolerância, status ou objetivo diferentes) são apontadas, com código de saída 1.
+#
+# Uso: python -m benchmarks.bench_familias --saida base.json
+#      python -m benchmarks.bench_familias --saida novo.json --comparar base.json
+#      python -m benchmarks.bench_familias --rapido --familias denso transporte
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+
+import resolvedor
+from benchmarks.geradores import PROBLEMAS, escrever_pl
+from instrumentacao import Instrumentacao
+
+TAMANHOS = {
+    "klee_minty": [6, 8, 10],
+    "denso": [25, 50, 100],
+    "esparso": [50, 100, 200],
+    "transporte": [10, 20, 30],
+    "atribuicao": [10, 15, 20],
+    "degenerado": [25, 50, 100],
+    "inviavel": [25, 50, 100],
+    "ilimitado": [25, 50, 100],
+}
+# Fases da Instrumentacao somadas em cada etapa medida
+ETAPAS = {
+    "leitura": ["leitura"],
+    "transformacao": ["presolve", "forma_padrao", "escalonamento"],
+    "resolucao": ["simplex", "fase_1", "fase_2", "pontos_interiores", "crossover", "pos_processamento"],
+}
+TOLERANCIA_TEMPO = 0.25  # Mais de 25% acima da linha de base é regressão...
+TEMPO_MINIMO = 2e-3  # ...se a diferença também passar disso (abaixo, é ruído do relógio)
+
+def medir(caminho, repeticoes, opcoes):
+    # Menor tempo de cada etapa em algumas repetições (o menor é o menos afetado por outros processos)
+    tempos = {etapa: np.inf for etapa in [*ETAPAS, "total"]}
+    for _ in range(repeticoes):
+        instrumentacao = Instrumentacao(guardar_iteracoes=False)
+        inicio = time.perf_counter()
+        resultado = resolvedor.solve(caminho, instrumentacao=instrumentacao, **opcoes)
+        tempos["total"] = min(tempos["total"], time.perf_counter() - inicio)
+        for etapa, fases in ETAPAS.items():
+            tempos[etapa] = min(tempos[etapa], sum(instrumentacao.tempos.get(fase, 0.0) for fase in fases))
+    return resultado, tempos
+
+def executar(familias, rapido, repeticoes, opcoes):
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        for familia in familias:
+            for tamanho in TAMANHOS[familia][:1] if rapido else TAMANHOS[familia]:
+                A, b, c, operadores = PROBLEMAS[familia](tamanho)
+                caminho = os.path.join(pasta, f"{familia}_{tamanho}.txt")
+                escrever_pl(caminho, A, b, c, operadores)
+                resultado, tempos = medir(caminho, repeticoes, opcoes)
+                resultados.append({
+                    "familia": familia, "tamanho": tamanho, "linhas": A.shape[0], "colunas": A.shape[1],
+                    "status": resultado.status, "objetivo": resultado.objetivo, "iteracoes": resultado.iteracoes,
+                    "tempos": tempos,
+                })
+                print(f"{familia:>12} {tamanho:>7} {f'{A.shape[0]}x{A.shape[1]}':>9} {resultado.status:>10} {resultado.iteracoes:>6}"
+                      + "".join(f" {tempos[etapa]:>12.4f}" for etapa in [*ETAPAS, "total"]))
+    return resultados
+
+def comparar(resultados, linha_de_base, tolerancia):
+    # Devolve as regressões como texto: tempo de uma etapa acima da tolerância, status ou objetivo diferentes
+    base = {(r["familia"], r["tamanho"]): r for r in linha_de_base["resultados"]}
+    regressoes = []
+    for r in resultados:
+        anterior = base.get((r["familia"], r["tamanho"]))
+        if anterior is None:
+            continue
+        nome = f"{r['familia']} {r['tamanho']}"
+        if r["status"] != anterior["status"]:
+            regressoes.append(f"{nome}: status {anterior['status']} -> {r['status']}")
+        elif r["objetivo"] is not None and not np.isclose(r["objetivo"], anterior["objetivo"], rtol=1e-6, atol=1e-6):
+            regressoes.append(f"{nome}: objetivo {anterior['objetivo']} -> {r['objetivo']}")
+        for etapa, tempo in r["tempos"].items():
+            antes = anterior["tempos"].get(etapa)
+            if antes is not None and tempo > antes * (1 + tolerancia) and tempo - antes > TEMPO_MINIMO:
+                regressoes.append(f"{nome}: {etapa} {antes:.4f} s -> {tempo:.4f} s (+{100 * (tempo / antes - 1):.0f}%)")
+    return regressoes
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks das famílias de PL geradas, com comparação com uma linha de base.")
+    parser.add_argument("--saida", help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior (linha de base)")
+    parser.add_argument("--familias", nargs="+", choices=list(TAMANHOS), default=list(TAMANHOS), help="famílias (padrão: todas)")
+    parser.add_argument("--rapido", action="store_true", help="só o menor tamanho de cada família")
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições por PL; vale o menor tempo (padrão: 3)")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_TEMPO, help="aumento de tempo aceito (padrão: 0.25)")
+    parser.add_argument("--metodo", choices=["simplex", "ipm"], default="simplex", help="método do solve (padrão: simplex)")
+    argumentos = parser.parse_args(argumentos)
+
+    print(f"{'família':>12} {'tamanho':>7} {'m x n':>9} {'status':>10} {'pivôs':>6}"
+          + "".join(f" {etapa + ' (s)':>12}" for etapa in [*ETAPAS, "total"]))
+    resultados = executar(argumentos.familias, argumentos.rapido, argumentos.repeticoes, {"method": argumentos.metodo})
+    saida = {
+        "maquina": {"sistema": platform.platform(), "processador": platform.processor(), "cpus": os.cpu_count(),
+                    "python": platform.python_version(), "numpy": np.__version__},
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "opcoes": {"metodo": argumentos.metodo, "repeticoes": argumentos.repeticoes},
+        "resultados": resultados,
+    }
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(saida, arquivo, ensure_ascii=False, indent=1)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo), argumentos.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) em relação a {argumentos.comparar}:")
+            for regressao in regressoes:
+                print("  " + regressao)
+            sys.exit(1)
+        print(f"\nSem regressões em relação a {argumentos.comparar}")
+
+if __name__ == "__main__":
+    main()
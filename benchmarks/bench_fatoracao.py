@@ -0,0 +1,67 @@
+# Compara o custo por iteração do simplex revisado com inversa explícita (np.linalg.inv a cada pivô)
+# e com a fatoração LU atualizada na forma produto (FTRAN/BTRAN).
+#
+# Uso: python -m benchmarks.bench_fatoracao [m1 m2 ...]
+import sys
+import time
+import numpy as np
+
+from fatoracao import FatoracaoLU
+
+def gerar_base(m, rng):
+    # Base aleatória bem condicionada (diagonal dominante)
+    return rng.normal(size=(m, m)) + m * np.eye(m)
+
+def iteracoes_com_inversa(B, colunas, b, c):
+    B = B.copy()
+    for k, a in colunas:
+        B_inv = np.linalg.inv(B)
+        x_B = B_inv @ b
+        y = c @ B_inv
+        d_B = -B_inv @ a
+        B[:, k] = a
+
+def iteracoes_com_lu(B, colunas, b, c):
+    B = B.copy()
+    fatoracao = FatoracaoLU(B)
+    for k, a in colunas:
+        if fatoracao.precisa_refatorar:
+            fatoracao.refatorar(B)
+        x_B = fatoracao.ftran(b)
+        y = fatoracao.btran(c)
+        alpha = fatoracao.ftran(a)
+        fatoracao.atualizar(k, alpha)
+        B[:, k] = a
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+def main(tamanhos):
+    rng = np.random.default_rng(0)
+    iteracoes = 128
+    resultados = []
+    print(f"{'m':>6} {'inversa (ms/it)':>16} {'LU+eta (ms/it)':>16}")
+    for m in tamanhos:
+        B = gerar_base(m, rng)
+        b = rng.normal(size=m)
+        c = rng.normal(size=m)
+        # Cada pivô troca a coluna k por uma nova coluna que mantém a base bem condicionada
+        posicoes = rng.integers(m, size=iteracoes)
+        colunas = [(int(k), rng.normal(size=m) + m * np.eye(m)[:, k]) for k in posicoes]
+        t_inv = medir(iteracoes_com_inversa, B, colunas, b, c) / iteracoes
+        t_lu = medir(iteracoes_com_lu, B, colunas, b, c) / iteracoes
+        resultados.append((m, t_inv, t_lu))
+        print(f"{m:>6} {1e3 * t_inv:>16.3f} {1e3 * t_lu:>16.3f}")
+
+    # Expoente empírico do crescimento do tempo por iteração (inclinação em escala log-log)
+    if len(resultados) > 1:
+        ms = np.log([r[0] for r in resultados])
+        inclinacao_inv = np.polyfit(ms, np.log([r[1] for r in resultados]), 1)[0]
+        inclinacao_lu = np.polyfit(ms, np.log([r[2] for r in resultados]), 1)[0]
+        print(f"\nCrescimento do tempo por iteração: inversa ~ O(m^{inclinacao_inv:.2f}), LU+eta ~ O(m^{inclinacao_lu:.2f})")
+
+if __name__ == "__main__":
+    tamanhos = [int(arg) for arg in sys.argv[1:]] or [100, 200, 400, 800, 1600]
+    main(tamanhos)
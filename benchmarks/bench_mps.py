@@ -0,0 +1,85 @@
+# Vazão da leitura e da gravação de arquivos MPS, em não nulos por segundo, para PL esparsos gerados de vários tamanhos
+# (de dezenas de milhares a centenas de milhares de não nulos). Cada modelo é gravado por mps.escrever_mps, lido de volta
+# por mps.ler_mps (direto para a MatrizCSC) e conferido com o original. Para comparação, nos tamanhos menores o mesmo
+# modelo também é gravado no formato de texto e lido por funcoes.gerar_formato_matricial.
+#
+# Uso: python -m benchmarks.bench_mps
+#      python -m benchmarks.bench_mps --nao-nulos 100000 1000000 --repeticoes 1
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+import funcoes
+import mps
+from benchmarks.geradores import escrever_pl
+from esparsa import MatrizCSC
+from funcoes import ProblemaPL
+from registro import REGISTRO_SILENCIOSO
+
+NAO_NULOS = [20_000, 100_000, 500_000]
+NAO_NULOS_POR_COLUNA = 5
+LIMITE_TEXTO = 20_000  # O leitor de texto monta a matriz densa e usa expressões regulares: só nos tamanhos pequenos
+
+def gerar_modelo(nao_nulos, semente=0):
+    # n colunas com NAO_NULOS_POR_COLUNA entradas cada, em m = n / 4 linhas <=; limites em 1/3 das variáveis
+    rng = np.random.default_rng(semente)
+    n = nao_nulos // NAO_NULOS_POR_COLUNA
+    m = max(n // 4, NAO_NULOS_POR_COLUNA)
+    colunas = np.repeat(np.arange(n), NAO_NULOS_POR_COLUNA)
+    linhas = np.concatenate([rng.choice(m, NAO_NULOS_POR_COLUNA, replace=False) for _ in range(n)])
+    valores = np.round(rng.random(len(linhas)) * 10 + 0.1, 4)
+    matriz = MatrizCSC.de_trincas(linhas, colunas, valores, (m, n))
+    superiores = np.where(rng.random(n) < 1 / 3, np.round(rng.random(n) * 100, 2) + 1, np.inf)
+    return ProblemaPL(
+        n, np.array([f"x_{j // 100}_{j % 100}" for j in range(n)]), -np.round(rng.random(n) * 10, 3), matriz,
+        np.round(rng.random(m) * n, 2) + 1, np.array(["<="] * m), None, esparso=True,
+        limites_inferiores=np.zeros(n), limites_superiores=superiores,
+    )
+
+def medir(funcao, repeticoes):
+    # Menor tempo em algumas repetições, e o resultado da última
+    melhor = np.inf
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def conferir(original, lido):
+    a, b = original.matriz_coeficientes, lido.matriz_coeficientes
+    return (list(original.vetor_variaveis) == list(lido.vetor_variaveis) and np.array_equal(a.dados, b.dados)
+            and np.array_equal(a.indices, b.indices) and np.array_equal(a.ponteiros, b.ponteiros)
+            and np.array_equal(original.vetor_b, lido.vetor_b) and np.array_equal(original.vetor_de_custos, lido.vetor_de_custos)
+            and np.array_equal(original.limites_superiores, lido.limites_superiores))
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Vazão da leitura e da gravação de arquivos MPS.")
+    parser.add_argument("--nao-nulos", type=int, nargs="+", default=NAO_NULOS, help="tamanhos, em não nulos")
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições por medida; vale o menor tempo (padrão: 3)")
+    argumentos = parser.parse_args(argumentos)
+
+    print(f"{'não nulos':>10} {'m x n':>13} {'MB':>6} {'gravação (s)':>13} {'nnz/s':>11} {'leitura (s)':>12} {'nnz/s':>11}"
+          f" {'confere':>8} {'texto (s)':>10} {'nnz/s':>11}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for nao_nulos in argumentos.nao_nulos:
+            problema = gerar_modelo(nao_nulos)
+            nnz = problema.matriz_coeficientes.nnz
+            caminho = os.path.join(pasta, f"modelo_{nnz}.mps")
+            tempo_gravacao, _ = medir(lambda: mps.escrever_mps(problema, caminho), argumentos.repeticoes)
+            tempo_leitura, lido = medir(lambda: mps.ler_mps(caminho, esparso=True, registro=REGISTRO_SILENCIOSO), argumentos.repeticoes)
+            texto = f"{'-':>10} {'-':>11}"
+            if nnz <= LIMITE_TEXTO:
+                caminho_texto = os.path.join(pasta, f"modelo_{nnz}.txt")
+                escrever_pl(caminho_texto, problema.matriz_coeficientes.toarray(), problema.vetor_b, problema.vetor_de_custos,
+                            problema.vetor_operadores)
+                tempo_texto, _ = medir(lambda: funcoes.gerar_formato_matricial(caminho_texto, esparso=True, registro=REGISTRO_SILENCIOSO),
+                                       argumentos.repeticoes)
+                texto = f"{tempo_texto:>10.3f} {nnz / tempo_texto:>11,.0f}"
+            m, n = problema.matriz_coeficientes.shape
+            print(f"{nnz:>10,} {f'{m}x{n}':>13} {os.path.getsize(caminho) / 2**20:>6.1f} {tempo_gravacao:>13.3f} {nnz / tempo_gravacao:>11,.0f}"
+                  f" {tempo_leitura:>12.3f} {nnz / tempo_leitura:>11,.0f} {'sim' if conferir(problema, lido) else 'NÃO':>8} {texto}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# Tempo de resolvedor.solve com method="simplex" e method="ipm" (com e sem crossover) à medida que o PL cresce,
+# nas famílias densa e esparsa de geradores.py. Confere que os objetivos coincidem.
+#
+# Uso: python -m benchmarks.bench_pontos_interiores
+import time
+import numpy as np
+
+import funcoes
+import resolvedor
+from benchmarks.geradores import aleatorio_denso, aleatorio_esparso
+
+TAMANHOS = [25, 50, 100, 200]
+FAMILIAS = {
+    "denso": lambda m: aleatorio_denso(m, 2 * m),
+    "esparso": lambda m: aleatorio_esparso(m, 4 * m, densidade=0.1),
+}
+METODOS = {
+    "simplex": {"method": "simplex"},
+    "ipm+crossover": {"method": "ipm"},
+    "ipm": {"method": "ipm", "crossover": False},
+}
+
+def problema(A, b, c):
+    # min c^T x  s.a.  A x <= b, x >= 0
+    variaveis = np.array([f"x_{j}" for j in range(A.shape[1])])
+    return funcoes.ProblemaPL(A.shape[1], variaveis, c, A, b, np.array(["<="] * A.shape[0]), None)
+
+def main():
+    print(f"{'família':>8} {'m':>5} " + " ".join(f"{nome + ' (s)':>18}" for nome in METODOS) + f" {'pivôs s/ipm':>12} {'iguais':>7}")
+    for familia, gerador in FAMILIAS.items():
+        for m in TAMANHOS:
+            pl = problema(*gerador(m))
+            tempos, resultados = [], []
+            for opcoes in METODOS.values():
+                inicio = time.perf_counter()
+                resultados.append(resolvedor.solve(pl, **opcoes))
+                tempos.append(time.perf_counter() - inicio)
+            iguais = all(r.status == resultados[0].status and np.isclose(r.objetivo, resultados[0].objetivo, rtol=1e-6)
+                         for r in resultados[1:])
+            pivos = f"{resultados[0].iteracoes}/{resultados[1].iteracoes}"
+            print(f"{familia:>8} {m:>5} " + " ".join(f"{tempo:>18.3f}" for tempo in tempos) + f" {pivos:>12} {'sim' if iguais else 'não':>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Compara número de iterações e tempo de cada regra de precificação em famílias de PL geradas.
+#
+# Uso: python -m benchmarks.bench_precificacao
+import contextlib
+import os
+import time
+import numpy as np
+
+import funcoes
+from benchmarks.geradores import FAMILIAS
+from precificacao import REGRAS
+
+TAMANHOS = {"klee_minty": [6, 8, 10], "denso": [50, 100, 200], "esparso": [50, 100, 200]}
+
+def resolver_com_folgas(A, b, c, regra):
+    # Monta a forma padrão com folgas e resolve a partir da base das folgas
+    m, n = A.shape
+    matriz = np.hstack((A, np.eye(m)))
+    custos = np.concatenate((c, np.zeros(m)))
+    variaveis = np.array([f"x_{j}" for j in range(n)] + [f"f_{i}" for i in range(m)])
+    colunas_base = list(range(n, n + m))
+    B, N = funcoes.calcular_matrizes_B_N(matriz, colunas_base)
+    Cn, Cb = funcoes.calcular_vetores_Cn_Cb(matriz, custos, colunas_base)
+
+    contador = {"iteracoes": 0}
+    class RegraContada(REGRAS[regra]):
+        def atualizar(self, *args):
+            contador["iteracoes"] += 1
+            super().atualizar(*args)
+
+    inicio = time.perf_counter()
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        status, Z, *_ = funcoes.metodo_simplex(B, N, Cb, Cn, b, variaveis, colunas_base, regra=RegraContada())
+    return status, Z, contador["iteracoes"], time.perf_counter() - inicio
+
+def main():
+    print(f"{'família':>12} {'tamanho':>8} {'regra':>10} {'iterações':>10} {'tempo (s)':>10} {'objetivo':>14}")
+    for familia, gerar in FAMILIAS.items():
+        for tamanho in TAMANHOS[familia]:
+            A, b, c = gerar(tamanho)
+            for regra in REGRAS:
+                status, Z, iteracoes, tempo = resolver_com_folgas(A, b, c, regra)
+                objetivo = f"{Z:.6g}" if status == funcoes.STATUS_OTIMO else status
+                print(f"{familia:>12} {tamanho:>8} {regra:>10} {iteracoes:>10} {tempo:>10.3f} {objetivo:>14}")
+
+if __name__ == "__main__":
+    main()
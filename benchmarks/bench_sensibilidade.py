@@ -0,0 +1,59 @@
+# Custo da análise de sensibilidade (preços sombra, custos reduzidos e faixas dos custos e do lado direito) a partir da
+# base ótima, para as famílias de PL geradas. Compara três jeitos de obter as mesmas faixas:
+#   em lote:  sensibilidade.variacoes_na_base (um BTRAN, um FTRAN com a identidade e produtos por blocos)
+#   por item: um FTRAN por coluna não básica e um por linha, com a mesma fatoração
+#   re-solve: o que se fazia antes, estimado como 2 (n + m) solves (um para cada extremo de cada faixa)
+#
+# Uso: python -m benchmarks.bench_sensibilidade
+import time
+import numpy as np
+
+import resolvedor
+import sensibilidade
+from benchmarks.geradores import PROBLEMAS
+from esparsa import MatrizCSC
+from fatoracao import FatoracaoLU
+from funcoes import ProblemaPL
+from registro import REGISTRO_SILENCIOSO
+
+TAMANHOS = {"denso": [50, 100], "esparso": [100, 200], "transporte": [15, 25], "atribuicao": [10, 15], "degenerado": [50, 100]}
+
+def por_item(simplex, B, colunas_base):
+    # As mesmas colunas de B⁻¹ e do tableau, uma resolução por vez
+    A = simplex.matriz_coeficientes
+    m, n = A.shape
+    colunas_base = np.asarray(colunas_base)
+    fatoracao = FatoracaoLU(sensibilidade.matriz_da_base(A, B, colunas_base))
+    for j in np.setdiff1d(np.arange(n), colunas_base):
+        fatoracao.ftran(A.coluna(j) if isinstance(A, MatrizCSC) else A[:, j])
+    for i in range(m):
+        fatoracao.ftran(np.eye(m)[:, i])
+
+def medir(funcao, repeticoes=3):
+    melhor = np.inf
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    print(f"{'família':>12} {'m x n':>9} {'solve (ms)':>11} {'em lote (ms)':>13} {'por item (ms)':>14} {'re-solve (ms)':>14}")
+    for familia, tamanhos in TAMANHOS.items():
+        for tamanho in tamanhos:
+            A, b, c, operadores = PROBLEMAS[familia](tamanho)
+            m, n = A.shape
+            problema = ProblemaPL(n, np.array([f"x{j + 1}" for j in range(n)]), c, A, b, operadores, None)
+            modelo = resolvedor.compilar(problema, usar_presolve=False)
+            simplex = modelo.simplex
+            status, _, B, colunas_base, _, x = resolvedor.resolver_simplex(simplex, registro=REGISTRO_SILENCIOSO)
+            if status != "optimal":
+                continue
+            tempo_solve = medir(lambda: resolvedor.solve(problema, usar_presolve=False))
+            tempo_lote = medir(lambda: sensibilidade.variacoes_na_base(simplex, B, colunas_base, x))
+            tempo_item = medir(lambda: por_item(simplex, B, colunas_base))
+            print(f"{familia:>12} {f'{m}x{n}':>9} {tempo_solve * 1e3:>11.2f} {tempo_lote * 1e3:>13.2f} {tempo_item * 1e3:>14.2f}"
+                  f" {2 * (n + m) * tempo_solve * 1e3:>14.0f}")
+
+if __name__ == "__main__":
+    main()
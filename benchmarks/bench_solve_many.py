@@ -0,0 +1,39 @@
+# Vazão (PL resolvidos por segundo) de resolvedor.solve_many com 1, 2, 4 e 8 threads, num lote de PL densos gerados.
+# Confere também que cada resultado é igual ao da resolução sequencial.
+# Para medir o ganho das threads, e não o do BLAS, convém fixar o BLAS em uma thread:
+#
+# Uso: OMP_NUM_THREADS=1 OPENBLAS_NUM_THREADS=1 python -m benchmarks.bench_solve_many
+import os
+import time
+import numpy as np
+
+import funcoes
+import resolvedor
+from benchmarks.geradores import aleatorio_denso
+
+TAMANHO = 150
+QUANTIDADE = 16
+THREADS = [1, 2, 4, 8]
+
+def problema_denso(m, n, semente):
+    # min c^T x  s.a.  A x <= b, x >= 0
+    A, b, c = aleatorio_denso(m, n, semente)
+    variaveis = np.array([f"x_{j}" for j in range(n)])
+    return funcoes.ProblemaPL(n, variaveis, c, A, b, np.array(["<="] * m), None)
+
+def main():
+    problemas = [problema_denso(TAMANHO, TAMANHO, semente) for semente in range(QUANTIDADE)]
+    referencia = [resolvedor.solve(problema) for problema in problemas]
+    print(f"{QUANTIDADE} PL densos {TAMANHO}x{TAMANHO}, {os.cpu_count()} CPU(s)\n")
+    print(f"{'threads':>8} {'tempo (s)':>10} {'PL/s':>8} {'aceleração':>11} {'iguais':>7}")
+    base = None
+    for threads in THREADS:
+        inicio = time.perf_counter()
+        resultados = resolvedor.solve_many(problemas, max_workers=threads)
+        tempo = time.perf_counter() - inicio
+        base = base or tempo
+        iguais = all(r.status == s.status and np.isclose(r.objetivo, s.objetivo) for r, s in zip(resultados, referencia))
+        print(f"{threads:>8} {tempo:>10.3f} {QUANTIDADE / tempo:>8.2f} {base / tempo:>11.2f} {'sim' if iguais else 'não':>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Geradores de famílias de PL para os benchmarks.
+# Os de FAMILIAS devolvem (A, b, c) do problema  min c^T x  s.a.  A x <= b, x >= 0,  com b >= 0
+# (a base formada pelas folgas é viável, então o simplex começa sem Fase I); os de PROBLEMAS devolvem também os operadores.
+import numpy as np
+
+def klee_minty(n):
+    # Cubo de Klee–Minty: a regra de Dantzig (sem escalonamento) visita os 2^n vértices.
+    # A última coluna do cubo só tem o 1 da última linha: o crash a poria na base valendo 5^n, que já é o ótimo. A linha
+    # sum x <= 2 * 5^n (nunca ativa no cubo, onde x_j <= 5^j) dá a ela um segundo não nulo sem mudar o caminho do simplex.
+    # A primeira linha (x_1 <= 5) vira limite no presolve, e o caminho também não muda
+    A = np.zeros((n + 1, n))
+    for i in range(n):
+        for j in range(i):
+            A[i, j] = 2.0 ** (i - j + 1)
+        A[i, i] = 1.0
+    A[n] = 1.0
+    b = np.append(5.0 ** np.arange(1, n + 1), 2 * 5.0 ** n)
+    c = -(2.0 ** np.arange(n - 1, -1, -1))
+    return A, b, c
+
+def aleatorio_denso(m, n, semente=0):
+    rng = np.random.default_rng(semente)
+    A = rng.random((m, n)) + 0.1
+    b = rng.random(m) * n + n
+    c = -rng.random(n)
+    return A, b, c
+
+def aleatorio_esparso(m, n, densidade=0.05, semente=0):
+    rng = np.random.default_rng(semente)
+    A = rng.random((m, n)) * (rng.random((m, n)) < densidade)
+    # Garante ao menos um não nulo por coluna, para o problema ser limitado
+    A[rng.integers(m, size=n), np.arange(n)] += 0.5
+    b = rng.random(m) * 10 + 1
+    c = -rng.random(n)
+    return A, b, c
+
+def mal_escalonado(A, b, c, ordens=4, semente=0):
+    # Mesmo PL com linhas e colunas multiplicadas por potências de 10 aleatórias (até 10^±ordens):
+    # A' = R A S, b' = R b, c' = S c. As soluções se correspondem por x = S x' e o custo ótimo não muda.
+    rng = np.random.default_rng(semente)
+    R = 10.0 ** rng.uniform(-ordens, ordens, A.shape[0])
+    S = 10.0 ** rng.uniform(-ordens, ordens, A.shape[1])
+    return A * R[:, None] * S[None, :], b * R, c * S
+
+FAMILIAS = {
+    "klee_minty": lambda tamanho: klee_minty(tamanho),
+    "denso": lambda tamanho: aleatorio_denso(tamanho, 2 * tamanho),
+    "esparso": lambda tamanho: aleatorio_esparso(tamanho, 4 * tamanho),
+}
+
+# Famílias com operadores quaisquer: cada gerador devolve (A, b, c, operadores) do problema  min c^T x,  x >= 0
+def transporte(fornecedores, clientes, semente=0):
+    # x_ij enviado do fornecedor i ao cliente j: oferta (<=) em cada fornecedor, demanda (>=) em cada cliente.
+    # A oferta total passa a demanda total em 10%, então o problema é viável (e precisa de Fase I)
+    rng = np.random.default_rng(semente)
+    oferta = rng.integers(20, 50, fornecedores).astype(float)
+    demanda = rng.dirichlet(np.ones(clientes)) * oferta.sum() / 1.1
+    A = np.zeros((fornecedores + clientes, fornecedores * clientes))
+    for i in range(fornecedores):
+        A[i, i * clientes:(i + 1) * clientes] = 1.0
+        A[fornecedores + np.arange(clientes), i * clientes + np.arange(clientes)] = 1.0
+    c = rng.integers(1, 20, fornecedores * clientes).astype(float)
+    return A, np.concatenate((oferta, np.round(demanda, 4))), c, np.array(["<="] * fornecedores + [">="] * clientes)
+
+def atribuicao(n, semente=0):
+    # Cada pessoa i faz exatamente uma tarefa j e cada tarefa é feita por uma pessoa: 2n igualdades, muito degenerado
+    A, b, c, _ = transporte(n, n, semente)
+    return A, np.ones(2 * n), c, np.array(["="] * (2 * n))
+
+def degenerado(m, n, semente=0):
+    # m - 1 restrições A x <= 0 passando pela origem (a base das folgas começa com todas em 0) e  sum x <= n  para limitar
+    rng = np.random.default_rng(semente)
+    A = np.vstack((rng.integers(-3, 4, (m - 1, n)).astype(float), np.ones((1, n))))
+    b = np.concatenate((np.zeros(m - 1), [float(n)]))
+    return A, b, -rng.random(n).round(4), np.array(["<="] * m)
+
+def inviavel(m, n, semente=0):
+    # A x <= b com A > 0 e, na última linha, a primeira restrição ao contrário: A_0 x >= b_0 + 1
+    A, b, c = aleatorio_denso(m - 1, n, semente)
+    return np.vstack((A, A[:1])), np.concatenate((b, [b[0] + 1])), c, np.array(["<="] * (m - 1) + [">="])
+
+def ilimitado(m, n, semente=0):
+    # A primeira coluna só tem coeficientes negativos e custo negativo: x_0 cresce sem limite
+    A, b, c = aleatorio_denso(m, n, semente)
+    A[:, 0] *= -1
+    return A, b, c, np.array(["<="] * m)
+
+def com_folgas(gerador):
+    # Adapta um gerador de FAMILIAS (A x <= b) para devolver também os operadores
+    def gerar(tamanho):
+        A, b, c = gerador(tamanho)
+        return A, b, c, np.array(["<="] * len(b))
+    return gerar
+
+PROBLEMAS = {
+    "klee_minty": com_folgas(FAMILIAS["klee_minty"]),
+    "denso": com_folgas(FAMILIAS["denso"]),
+    "esparso": com_folgas(FAMILIAS["esparso"]),
+    "transporte": lambda tamanho: transporte(tamanho, tamanho),
+    "atribuicao": lambda tamanho: atribuicao(tamanho),
+    "degenerado": lambda tamanho: degenerado(tamanho, 2 * tamanho),
+    "inviavel": lambda tamanho: inviavel(tamanho, 2 * tamanho),
+    "ilimitado": lambda tamanho: ilimitado(tamanho, 2 * tamanho),
+}
+
+def nome_variavel(j):
+    # O formato de arquivo só aceita letras nos nomes: x, depois j em base 26 (xa, xb, ..., xba, ...)
+    letras = ""
+    while True:
+        j, resto = divmod(j, 26)
+        letras = chr(ord("a") + resto) + letras
+        if j == 0:
+            return "x" + letras
+
+def numero(valor):
+    # Sem notação científica (o leitor não a aceita)
+    return f"{valor:.10f}".rstrip("0").rstrip(".") or "0"
+
+def escrever_pl(caminho, A, b, c, operadores):
+    # Grava  min c^T x  s.a.  A x (op) b,  x >= 0  no formato de arquivo lido por funcoes.gerar_formato_matricial
+    nomes = [nome_variavel(j) for j in range(A.shape[1])]
+    def termos(coeficientes):
+        return " ".join(f"{'-' if v < 0 else '+'} {numero(abs(v))}{nomes[j]}" for j, v in enumerate(coeficientes) if v != 0)
+    linhas = ["min " + termos(c)]
+    for i in range(A.shape[0]):
+        linhas.append(("s.a. " if i == 0 else "") + f"{termos(A[i])} {operadores[i]} {numero(b[i])}")
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("\n".join(linhas) + "\n")
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+
+# Cache em disco dos modelos compilados ################################################################################################################################################################################################
+# Cada entrada é uma pasta com nome igual à chave (hash do conteúdo do arquivo e das opções que mudam a compilação):
+#   modelo.pkl  a estrutura do objeto guardado (ProblemaPL, DadosPostsolve, Escala...), sem os vetores grandes
+#   0.npy, 1.npy, ...  os vetores numéricos grandes, em formato binário cru; na leitura são mapeados na memória (mmap)
+#   base.npz  a última base ótima (colunas da base e x), para o simplex partir dela
+# Um arquivo alterado tem outra chave, então a entrada antiga nunca é usada de novo: ela só sai pelo LRU, que remove as
+# entradas usadas há mais tempo (data de modificação da pasta, atualizada a cada acerto) quando o total passa do limite.
+# Os arquivos .pkl são carregados com pickle: a pasta do cache deve ser tão confiável quanto o próprio código.
+VERSAO_CACHE = 2  # Muda quando o formato dos objetos guardados muda, invalidando as entradas antigas
+TAMANHO_MAXIMO = 1 << 30  # 1 GiB
+TAMANHO_MINIMO_MAPEADO = 4096  # Vetores menores que isso (em bytes) ficam dentro do modelo.pkl
+TIPOS_MAPEADOS = "biufU"  # Tipos do NumPy que o np.load consegue mapear (sem objetos do Python)
+
+class _Gravador(pickle.Pickler):
+    # Pickler que desvia os vetores grandes para arquivos .npy (um por vetor, mesmo que apareça em vários objetos)
+    def __init__(self, arquivo, pasta):
+        super().__init__(arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self.pasta = pasta
+        self.gravados = {}  # id do vetor -> (nome do arquivo, vetor), mantendo o vetor vivo enquanto grava
+
+    def persistent_id(self, objeto):
+        if not (isinstance(objeto, np.ndarray) and objeto.dtype.kind in TIPOS_MAPEADOS and objeto.nbytes >= TAMANHO_MINIMO_MAPEADO):
+            return None
+        if id(objeto) not in self.gravados:
+            nome = f"{len(self.gravados)}.npy"
+            np.save(os.path.join(self.pasta, nome), objeto)
+            self.gravados[id(objeto)] = (nome, objeto)
+        return self.gravados[id(objeto)][0]
+
+class _Leitor(pickle.Unpickler):
+    def __init__(self, arquivo, pasta):
+        super().__init__(arquivo)
+        self.pasta = pasta
+
+    def persistent_load(self, nome):
+        # Somente leitura: os vetores do modelo não são alterados no próprio lugar (como no ProblemaPL)
+        return np.load(os.path.join(self.pasta, nome), mmap_mode="r")
+
+class CacheModelos:
+    # Cache em disco de modelos compilados (lidos, com presolve, na forma padrão e escalonados), com LRU por tamanho.
+    #   pasta: diretório do cache (criado se não existir)
+    #   tamanho_maximo: total em bytes; ao guardar uma entrada, as usadas há mais tempo saem até o total caber
+    def __init__(self, pasta, tamanho_maximo=TAMANHO_MAXIMO):
+        self.pasta = str(pasta)
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.faltas = 0
+        os.makedirs(self.pasta, exist_ok=True)
+
+    def chave(self, arquivo, opcoes=None):
+        # SHA-256 do conteúdo do arquivo (lido em blocos) junto com as opções que mudam o modelo compilado
+        resumo = hashlib.sha256(json.dumps({"versao": VERSAO_CACHE, "opcoes": opcoes or {}}, sort_keys=True).encode())
+        with open(arquivo, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                resumo.update(bloco)
+        return resumo.hexdigest()
+
+    def _pasta_entrada(self, chave):
+        return os.path.join(self.pasta, chave)
+
+    def carregar(self, chave):
+        # Devolve o objeto guardado (com os vetores grandes mapeados na memória) ou None
+        pasta = self._pasta_entrada(chave)
+        try:
+            with open(os.path.join(pasta, "modelo.pkl"), "rb") as f:
+                objeto = _Leitor(f, pasta).load()
+            os.utime(pasta)  # Marca como usada agora (LRU)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Entrada ausente, removida por outro processo no meio da leitura ou incompleta
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        return objeto
+
+    def guardar(self, chave, objeto):
+        # Grava numa pasta temporária e renomeia: quem lê nunca vê uma entrada pela metade
+        temporaria = tempfile.mkdtemp(prefix=".tmp_", dir=self.pasta)
+        try:
+            with open(os.path.join(temporaria, "modelo.pkl"), "wb") as f:
+                _Gravador(f, temporaria).dump(objeto)
+            os.rename(temporaria, self._pasta_entrada(chave))
+        except OSError:
+            # Outro processo já guardou a mesma chave
+            shutil.rmtree(temporaria, ignore_errors=True)
+        self.remover_excedente()
+
+    def carregar_base(self, chave):
+        # Última base ótima guardada: (colunas da base, x) ou None
+        try:
+            with np.load(os.path.join(self._pasta_entrada(chave), "base.npz")) as dados:
+                return dados["colunas_base"], dados["x"]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def guardar_base(self, chave, colunas_base, x):
+        pasta = self._pasta_entrada(chave)
+        if not os.path.isdir(pasta):
+            return
+        temporario = os.path.join(pasta, f".base_{os.getpid()}.npz")
+        np.savez(temporario, colunas_base=np.asarray(colunas_base, dtype=np.int64), x=np.asarray(x, dtype=float))
+        os.replace(temporario, os.path.join(pasta, "base.npz"))
+
+    def entradas(self):
+        # (data de uso, tamanho em bytes, pasta) de cada entrada, da usada há mais tempo para a mais recente
+        entradas = []
+        for item in os.scandir(self.pasta):
+            if not item.is_dir() or item.name.startswith("."):
+                continue
+            try:
+                tamanho = sum(arquivo.stat().st_size for arquivo in os.scandir(item.path))
+                entradas.append((item.stat().st_mtime, tamanho, item.path))
+            except OSError:
+                continue
+        return sorted(entradas)
+
+    def tamanho(self):
+        return sum(tamanho for _, tamanho, _ in self.entradas())
+
+    def remover_excedente(self):
+        # LRU: remove as entradas usadas há mais tempo até o total caber em tamanho_maximo
+        entradas = self.entradas()
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, pasta in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            shutil.rmtree(pasta, ignore_errors=True)
+            total -= tamanho
+
+    def limpar(self):
+        for _, _, pasta in self.entradas():
+            shutil.rmtree(pasta, ignore_errors=True)
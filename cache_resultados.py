@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+import numpy as np
+
+import resolvedor
+from funcoes import limites_das_variaveis, nomes_das_restricoes
+from presolve import extrair_trincas
+from registro import REGISTRO_SILENCIOSO
+from resolvedor import ResultadoPL
+from sensibilidade import AnaliseSensibilidade
+
+# Cache de resultados do solve sobre a forma canônica do modelo ########################################################################################################################################################################
+# Dois PL que só diferem na ordem das restrições, no sentido de uma desigualdade (a x >= b escrita como -a x <= -b), no
+# sinal de uma igualdade ou nos nomes das variáveis e das restrições têm a mesma forma canônica e, com as mesmas opções, a
+# mesma chave. O resultado guardado volta na ordem das linhas e com os nomes de quem pediu (duais com o sinal de cada linha).
+VERSAO_RESULTADOS = 1  # Muda quando o formato do ResultadoPL ou da FormaCanonica muda, invalidando as entradas antigas
+TOLERANCIA_QUANTIZACAO = 1e-9  # Valores são arredondados para múltiplos disso antes do hash
+STATUS_GUARDADOS = {"optimal", "infeasible", "unbounded"}  # Limites de iteração/tempo e interrupções não vão para o cache
+OPCOES_IGNORADAS = {"verbose", "registro", "instrumentacao", "cache"}  # Não mudam o resultado
+CODIGOS_OPERADORES = {"<=": 0, "<": 0, ">=": 1, ">": 1, "=": 2}
+# Constantes da mistura de inteiros (splitmix64) que dá a assinatura de cada linha, independente da ordem das entradas
+MISTURA_1 = np.uint64(0x9E3779B97F4A7C15)
+MISTURA_2 = np.uint64(0xBF58476D1CE4E5B9)
+MISTURA_3 = np.uint64(0x94D049BB133111EB)
+
+@dataclass
+class FormaCanonica:
+    chave: str
+    nomes: list  # Nomes das variáveis, na ordem das colunas do problema
+    restricoes: list  # Nomes das restrições, na ordem das linhas do problema
+    ordem: np.ndarray  # ordem[k]: linha do problema na posição k da forma canônica
+    sinais: np.ndarray  # 1 ou -1: sinal aplicado a cada linha do problema na forma canônica
+
+def quantizar(valores, tolerancia):
+    # Arredonda para múltiplos da tolerância; + 0.0 troca -0.0 por 0.0 (mesmos bytes no hash)
+    return np.round(np.asarray(valores, dtype=float) / tolerancia) * tolerancia + 0.0
+
+def opcoes_relevantes(opcoes):
+    # As opções do solve que mudam o resultado, em texto estável (sem objetos como o registro ou a instrumentação)
+    return json.dumps({nome: valor for nome, valor in (opcoes or {}).items() if nome not in OPCOES_IGNORADAS}, sort_keys=True, default=str)
+
+def misturar(valores):
+    # splitmix64: espalha os bits (com overflow de 64 bits, que é o esperado)
+    with np.errstate(over="ignore"):
+        valores = (valores ^ (valores >> np.uint64(30))) * MISTURA_2
+        valores = (valores ^ (valores >> np.uint64(27))) * MISTURA_3
+        return valores ^ (valores >> np.uint64(31))
+
+def forma_canonica(problema, opcoes=None, tolerancia=TOLERANCIA_QUANTIZACAO) -> FormaCanonica:
+    # Chave SHA-256 do modelo canônico: linhas ">=" viram "<=" e as igualdades ficam com o primeiro coeficiente positivo
+    # (multiplicando a linha por -1), os nomes saem (só a posição da coluna conta), os valores são quantizados e as
+    # linhas são ordenadas por (operador, b, assinatura da linha). A assinatura é uma soma (módulo 2^64) de uma mistura
+    # de (coluna, valor) de cada entrada, que não depende da ordem: linhas permutadas dão a mesma ordem canônica.
+    num_linhas, num_colunas = problema.matriz_coeficientes.shape
+    linhas, colunas, valores = extrair_trincas(problema.matriz_coeficientes)
+    linhas, colunas = np.asarray(linhas, dtype=np.int64), np.asarray(colunas, dtype=np.int64)
+    codigos = np.array([CODIGOS_OPERADORES[op] for op in problema.vetor_operadores], dtype=np.int64)
+
+    # Sinal de cada linha: -1 nas ">=" e nas igualdades cujo primeiro coeficiente (menor coluna) é negativo
+    sinais = np.where(codigos == 1, -1.0, 1.0)
+    if len(linhas):
+        ordem_entradas = np.lexsort((colunas, linhas))
+        primeiras = ordem_entradas[np.r_[True, linhas[ordem_entradas][1:] != linhas[ordem_entradas][:-1]]]
+        negativas = linhas[primeiras][(valores[primeiras] < 0) & (codigos[linhas[primeiras]] == 2)]
+        sinais[negativas] = -1.0
+    codigos = np.where(codigos == 1, 0, codigos)
+    valores = quantizar(valores * sinais[linhas], tolerancia)
+    vetor_b = quantizar(np.asarray(problema.vetor_b, dtype=float) * sinais, tolerancia)
+
+    # Assinatura de cada linha e ordem canônica
+    assinaturas = np.zeros(num_linhas, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        entradas = misturar(colunas.astype(np.uint64) * MISTURA_1 ^ misturar(valores.view(np.uint64)))
+    np.add.at(assinaturas, linhas, entradas)
+    ordem = np.lexsort((assinaturas, vetor_b, codigos))
+    posicao = np.empty(num_linhas, dtype=np.int64)
+    posicao[ordem] = np.arange(num_linhas)
+
+    # Matriz com as linhas renumeradas, em ordem de (coluna, linha canônica)
+    novas_linhas = posicao[linhas]
+    ordem_entradas = np.lexsort((novas_linhas, colunas))
+    inferiores, superiores = limites_das_variaveis(problema)
+    resumo = hashlib.sha256()
+    resumo.update(json.dumps({
+        "versao": VERSAO_RESULTADOS, "tipo": int(problema.tipo), "forma": [num_linhas, num_colunas], "tolerancia": tolerancia,
+        "constante": float(quantizar(problema.constante_objetivo, tolerancia)),
+        "opcoes": opcoes_relevantes(opcoes),
+    }, sort_keys=True, default=str).encode())
+    for vetor in (quantizar(problema.vetor_de_custos, tolerancia), quantizar(inferiores, tolerancia), quantizar(superiores, tolerancia),
+                  codigos[ordem], vetor_b[ordem], colunas[ordem_entradas], novas_linhas[ordem_entradas], valores[ordem_entradas]):
+        resumo.update(np.ascontiguousarray(vetor).tobytes())
+    return FormaCanonica(resumo.hexdigest(), np.asarray(problema.vetor_variaveis).astype(str).tolist(), nomes_das_restricoes(problema),
+                         ordem, sinais)
+
+def adaptar_resultado(resultado: ResultadoPL, guardada: FormaCanonica, pedida: FormaCanonica) -> ResultadoPL:
+    # O resultado de um modelo (guardada) nos nomes e na ordem das linhas de outro com a mesma forma canônica (pedida)
+    if (guardada.nomes == pedida.nomes and guardada.restricoes == pedida.restricoes and np.array_equal(guardada.ordem, pedida.ordem)
+            and np.array_equal(guardada.sinais, pedida.sinais)):
+        return resultado  # O mesmo modelo: o próprio objeto guardado
+    if resultado.status != "optimal":
+        return replace(resultado, base=None)
+    renomear = dict(zip(guardada.nomes, pedida.nomes))
+    # Linha guardada que corresponde a cada linha de quem pediu, e o sinal relativo entre as duas
+    linha_guardada = np.empty(len(pedida.ordem), dtype=np.int64)
+    linha_guardada[pedida.ordem] = guardada.ordem
+    sinais = guardada.sinais[linha_guardada] * pedida.sinais
+    duais = None
+    if resultado.duais is not None:
+        duais = np.asarray(resultado.duais)[linha_guardada] * sinais
+    sensibilidade = None
+    if resultado.sensibilidade is not None:
+        # Os custos não mudam com as linhas; uma linha com o sinal trocado tem o preço sombra e a faixa de b trocados
+        analise = resultado.sensibilidade
+        linhas = [guardada.restricoes[i] for i in linha_guardada]
+        sensibilidade = AnaliseSensibilidade(
+            {nome: analise.precos_sombra[linha] * sinal for nome, linha, sinal in zip(pedida.restricoes, linhas, sinais)},
+            {renomear[var]: valor for var, valor in analise.custos_reduzidos.items()},
+            {renomear[var]: faixa for var, faixa in analise.faixas_custos.items()},
+            {nome: analise.faixas_lado_direito[linha] if sinal > 0 else tuple(-v for v in reversed(analise.faixas_lado_direito[linha]))
+             for nome, linha, sinal in zip(pedida.restricoes, linhas, sinais)},
+        )
+    return replace(
+        resultado,
+        x=None if resultado.x is None else {renomear[var]: valor for var, valor in resultado.x.items()},
+        duais=duais,
+        custos_reduzidos=None if resultado.custos_reduzidos is None else {renomear[var]: valor for var, valor in resultado.custos_reduzidos.items()},
+        base=None,  # Os nomes da forma padrão (folgas f_1, e_1, ...) dependem da ordem das linhas
+        sensibilidade=sensibilidade,
+    )
+
+class CacheResultados:
+    # Cache LRU de resultados do solve, na memória e, com pasta, também em disco (um .pkl por chave).
+    #   max_entradas, max_bytes: limites da memória (o tamanho de um resultado é o do seu pickle)
+    #   pasta, max_bytes_disco: pasta do cache em disco (None: só memória) e o limite dela
+    # Um acerto devolve o ResultadoPL guardado (o próprio objeto, se o modelo for o mesmo), sem passar pelo simplex.
+    # Para arquivos, a forma canônica fica associada ao hash do conteúdo: um arquivo repetido nem é lido de novo.
+    def __init__(self, max_entradas=1024, max_bytes=64 << 20, pasta=None, max_bytes_disco=256 << 20,
+                 tolerancia=TOLERANCIA_QUANTIZACAO):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.pasta = None if pasta is None else str(pasta)
+        self.max_bytes_disco = max_bytes_disco
+        self.tolerancia = tolerancia
+        self.entradas = OrderedDict()  # Chave -> (resultado, forma canônica guardada, bytes), da menos para a mais recente
+        self.arquivos = OrderedDict()  # (hash do arquivo, opções) -> forma canônica do arquivo
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.remocoes = 0
+        if self.pasta is not None:
+            os.makedirs(self.pasta, exist_ok=True)
+
+    def estatisticas(self):
+        consultas = self.acertos + self.faltas
+        return {"acertos": self.acertos, "faltas": self.faltas, "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+                "remocoes": self.remocoes, "entradas": len(self.entradas), "bytes": self.bytes}
+
+    def solve(self, problema, **opcoes):
+        # Mesmos argumentos de resolvedor.solve; só resolve se o modelo canônico (com as mesmas opções) não estiver no cache
+        forma, hash_arquivo = None, None
+        if isinstance(problema, (str, Path)):
+            resumo = hashlib.sha256()
+            with open(problema, "rb") as f:
+                for bloco in iter(lambda: f.read(1 << 20), b""):
+                    resumo.update(bloco)
+            hash_arquivo = (resumo.hexdigest(), opcoes_relevantes(opcoes))
+            forma = self.arquivos.get(hash_arquivo)
+        if forma is None:
+            if isinstance(problema, (str, Path)):
+                problema = resolvedor.ler_modelo(problema, esparso=opcoes.get("esparso", False), registro=REGISTRO_SILENCIOSO)
+            forma = forma_canonica(problema, opcoes, self.tolerancia)
+            if hash_arquivo is not None:
+                self.arquivos[hash_arquivo] = forma
+                if len(self.arquivos) > self.max_entradas:
+                    self.arquivos.popitem(last=False)
+
+        encontrado = self.buscar(forma.chave)
+        if encontrado is not None:
+            self.acertos += 1
+            resultado, guardada = encontrado
+            return adaptar_resultado(resultado, guardada, forma)
+        self.faltas += 1
+        resultado = resolvedor.solve(problema, **opcoes)
+        if resultado.status in STATUS_GUARDADOS:
+            self.guardar(forma, resultado)
+        return resultado
+
+    def buscar(self, chave):
+        entrada = self.entradas.get(chave)
+        if entrada is not None:
+            self.entradas.move_to_end(chave)
+            return entrada[0], entrada[1]
+        if self.pasta is None:
+            return None
+        caminho = os.path.join(self.pasta, f"{chave}.pkl")
+        try:
+            with open(caminho, "rb") as f:
+                dados = f.read()
+            resultado, guardada = pickle.loads(dados)
+            os.utime(caminho)  # LRU do disco
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self._guardar_na_memoria(guardada, resultado, len(dados))
+        return resultado, guardada
+
+    def guardar(self, forma: FormaCanonica, resultado: ResultadoPL):
+        dados = pickle.dumps((resultado, forma), protocol=pickle.HIGHEST_PROTOCOL)
+        self._guardar_na_memoria(forma, resultado, len(dados))
+        if self.pasta is not None:
+            descritor, temporario = tempfile.mkstemp(prefix=".tmp_", dir=self.pasta)
+            with os.fdopen(descritor, "wb") as f:
+                f.write(dados)
+            caminho = os.path.join(self.pasta, f"{forma.chave}.pkl")
+            os.replace(temporario, caminho)
+            self._remover_excedente_disco(caminho)
+
+    def _guardar_na_memoria(self, forma, resultado, tamanho):
+        anterior = self.entradas.pop(forma.chave, None)
+        if anterior is not None:
+            self.bytes -= anterior[2]
+        self.entradas[forma.chave] = (resultado, forma, tamanho)
+        self.bytes += tamanho
+        # LRU: sai a entrada usada há mais tempo até caber nos dois limites (a recém-guardada sempre fica)
+        while len(self.entradas) > 1 and (len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes):
+            _, (_, _, tamanho_removido) = self.entradas.popitem(last=False)
+            self.bytes -= tamanho_removido
+            self.remocoes += 1
+
+    def _remover_excedente_disco(self, recente):
+        # LRU do disco pela data de modificação (atualizada a cada acerto); a entrada recém-gravada sempre fica
+        arquivos = []
+        for item in os.scandir(self.pasta):
+            if item.name.endswith(".pkl") and not item.name.startswith(".") and item.path != recente:
+                try:
+                    estado = item.stat()
+                except OSError:
+                    continue
+                arquivos.append((estado.st_mtime, estado.st_size, item.path))
+        total = os.path.getsize(recente) + sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self.max_bytes_disco:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+            total -= tamanho
+
+    def limpar(self):
+        self.entradas.clear()
+        self.arquivos.clear()
+        self.bytes = 0
@@ -0,0 +1,117 @@
+import numpy as np
+from dataclasses import dataclass, replace
+
+from esparsa import MatrizCSC
+from funcoes import ProblemaPL
+from registro import obter_registro
+
+@dataclass
+class Escala:
+    # A escalada = diag(fatores_linhas) A diag(fatores_colunas); b escalado = fatores_linhas * b; c escalado = fatores_colunas * c
+    fatores_linhas: np.ndarray
+    fatores_colunas: np.ndarray
+    passadas: int  # Passadas da média geométrica até convergir
+    razao_antes: float  # max|a_ij| / min|a_ij| (não nulos) antes do escalonamento
+    razao_depois: float
+
+# Escalonamento (média geométrica + equilibração) ########################################################################################################################################################################################
+def trincas_absolutas(matriz_coeficientes):
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        return matriz_coeficientes.indices, matriz_coeficientes.colunas_dos_dados, np.abs(matriz_coeficientes.dados)
+    linhas, colunas = np.nonzero(matriz_coeficientes)
+    return linhas, colunas, np.abs(matriz_coeficientes[linhas, colunas])
+
+def extremos(indices, valores, tamanho):
+    # Maior e menor |a| de cada linha (ou coluna); linhas vazias ficam com 1 nos dois
+    maiores = np.zeros(tamanho)
+    menores = np.full(tamanho, np.inf)
+    np.maximum.at(maiores, indices, valores)
+    np.minimum.at(menores, indices, valores)
+    vazias = maiores == 0
+    maiores[vazias] = 1.0
+    menores[vazias] = 1.0
+    return maiores, menores
+
+def razao_escala(valores):
+    return float(valores.max() / valores.min()) if len(valores) else 1.0
+
+def potencia_de_dois(fatores):
+    # Fatores potência de 2 não introduzem erro de arredondamento (e colunas unitárias continuam exatamente unitárias)
+    return np.exp2(np.round(np.log2(fatores)))
+
+def calcular_escala(matriz_coeficientes, max_passadas=20, melhora_minima=0.1):
+    # Média geométrica alternando linhas e colunas, até a razão max/min parar de cair mais que melhora_minima,
+    # seguida de uma equilibração (maior |a| de cada linha e depois de cada coluna igual a 1)
+    num_linhas, num_colunas = matriz_coeficientes.shape
+    linhas, colunas, valores = trincas_absolutas(matriz_coeficientes)
+    fatores_linhas = np.ones(num_linhas)
+    fatores_colunas = np.ones(num_colunas)
+    razao_antes = razao = razao_escala(valores)
+
+    escalados = valores.copy()
+    passadas = 0
+    while passadas < max_passadas and len(valores):
+        maiores, menores = extremos(linhas, escalados, num_linhas)
+        fatores_linhas /= np.sqrt(maiores * menores)
+        escalados = valores * fatores_linhas[linhas] * fatores_colunas[colunas]
+        maiores, menores = extremos(colunas, escalados, num_colunas)
+        fatores_colunas /= np.sqrt(maiores * menores)
+        escalados = valores * fatores_linhas[linhas] * fatores_colunas[colunas]
+        passadas += 1
+        nova_razao = razao_escala(escalados)
+        if nova_razao > (1.0 - melhora_minima) * razao:
+            break
+        razao = nova_razao
+
+    # Equilibração
+    if len(valores):
+        maiores, _ = extremos(linhas, escalados, num_linhas)
+        fatores_linhas /= maiores
+        escalados = valores * fatores_linhas[linhas] * fatores_colunas[colunas]
+        maiores, _ = extremos(colunas, escalados, num_colunas)
+        fatores_colunas /= maiores
+
+    fatores_linhas = potencia_de_dois(fatores_linhas)
+    fatores_colunas = potencia_de_dois(fatores_colunas)
+    razao_depois = razao_escala(valores * fatores_linhas[linhas] * fatores_colunas[colunas])
+    return Escala(fatores_linhas, fatores_colunas, passadas, razao_antes, razao_depois)
+
+def escalar_matriz(matriz_coeficientes, fatores_linhas, fatores_colunas):
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        return matriz_coeficientes.escalar_linhas(fatores_linhas).escalar_colunas(fatores_colunas)
+    return matriz_coeficientes * fatores_linhas[:, None] * fatores_colunas[None, :]
+
+def escalonar_problema(problema: ProblemaPL, max_passadas=20, registro=None):
+    # Recebe a forma padrão e devolve (problema escalado, escala). O custo ótimo não muda: c_e^T x_e = c^T x.
+    escala = calcular_escala(problema.matriz_coeficientes, max_passadas)
+    escalado = ProblemaPL(
+        len(problema.vetor_variaveis), problema.vetor_variaveis,
+        np.asarray(problema.vetor_de_custos, dtype=float) * escala.fatores_colunas,
+        escalar_matriz(problema.matriz_coeficientes, escala.fatores_linhas, escala.fatores_colunas),
+        np.asarray(problema.vetor_b, dtype=float) * escala.fatores_linhas,
+        problema.vetor_operadores, problema.vetor_operadores_novo, esparso=problema.esparso, sinais_linhas=problema.sinais_linhas,
+        sinais_colunas=problema.sinais_colunas,
+    )
+    if problema.limites_superiores is not None:
+        # z = diag(fatores_colunas) z_e: limites e deslocamentos passam para a escala de z_e
+        escalado = replace(
+            escalado, limites_inferiores=np.asarray(problema.limites_inferiores, dtype=float),
+            limites_superiores=np.asarray(problema.limites_superiores, dtype=float) / escala.fatores_colunas,
+            deslocamentos=np.asarray(problema.deslocamentos, dtype=float) / escala.fatores_colunas,
+        )
+    obter_registro(registro)(f"\nEscalonamento: {escala.passadas} passada(s), max|a|/min|a| de {escala.razao_antes:.3g} para {escala.razao_depois:.3g}")
+    return escalado, escala
+
+# Volta para o problema sem escala ######################################################################################################################################################################################################
+def desescalonar_x(escala: Escala, x, colunas=None):
+    # x = diag(fatores_colunas) x_e; colunas indica a que variáveis x se refere (por exemplo, as colunas da base)
+    fatores = escala.fatores_colunas if colunas is None else escala.fatores_colunas[list(colunas)]
+    return np.asarray(x, dtype=float) * fatores
+
+def desescalonar_duais(escala: Escala, y):
+    # A_e^T y_e <= c_e  equivale a  A^T (diag(fatores_linhas) y_e) <= c
+    return np.asarray(y, dtype=float) * escala.fatores_linhas
+
+def desescalonar_custos_reduzidos(escala: Escala, custos_reduzidos, colunas=None):
+    fatores = escala.fatores_colunas if colunas is None else escala.fatores_colunas[list(colunas)]
+    return np.asarray(custos_reduzidos, dtype=float) / fatores
@@ -0,0 +1,139 @@
+import numpy as np
+
+# Matriz esparsa no formato CSC (colunas comprimidas) ####################################################################################################################################################################################
+class MatrizCSC:
+    # Os valores não nulos da coluna j ficam em dados[ponteiros[j]:ponteiros[j+1]],
+    # com as linhas correspondentes em indices[ponteiros[j]:ponteiros[j+1]].
+    # Implementa apenas o que o simplex usa: colunas densas, A x, y^T A e concatenação de colunas.
+    __array_ufunc__ = None  # Faz o NumPy delegar "y @ A" para __rmatmul__
+
+    def __init__(self, dados, indices, ponteiros, shape):
+        self.dados = np.asarray(dados, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.ponteiros = np.asarray(ponteiros, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._colunas_dos_dados = None
+
+    @classmethod
+    def de_trincas(cls, linhas, colunas, valores, shape):
+        linhas = np.asarray(linhas, dtype=np.int64)
+        colunas = np.asarray(colunas, dtype=np.int64)
+        valores = np.asarray(valores, dtype=float)
+        # Ordena por coluna e depois por linha (ordenação estável: entre repetidos, o último informado vem por último)
+        ordem = np.lexsort((linhas, colunas))
+        linhas, colunas, valores = linhas[ordem], colunas[ordem], valores[ordem]
+        # Entradas repetidas na mesma posição: vale a última, como na atribuição da matriz densa
+        if len(linhas):
+            ultima = np.ones(len(linhas), dtype=bool)
+            ultima[:-1] = (linhas[1:] != linhas[:-1]) | (colunas[1:] != colunas[:-1])
+            linhas, colunas, valores = linhas[ultima], colunas[ultima], valores[ultima]
+        # Descarta zeros explícitos
+        nao_nulos = valores != 0
+        linhas, colunas, valores = linhas[nao_nulos], colunas[nao_nulos], valores[nao_nulos]
+        ponteiros = np.zeros(shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(colunas, minlength=shape[1]), out=ponteiros[1:])
+        return cls(valores, linhas, ponteiros, shape)
+
+    @classmethod
+    def de_densa(cls, matriz):
+        matriz = np.asarray(matriz, dtype=float)
+        colunas, linhas = np.nonzero(matriz.T)
+        return cls.de_trincas(linhas, colunas, matriz[linhas, colunas], matriz.shape)
+
+    @classmethod
+    def colunas_unitarias(cls, num_linhas, linhas, valores):
+        # Bloco em que a coluna k tem um único valor, valores[k], na linha linhas[k] (folgas, excessos, artificiais)
+        linhas = np.asarray(linhas, dtype=np.int64)
+        valores = np.broadcast_to(np.asarray(valores, dtype=float), linhas.shape)
+        return cls(valores.copy(), linhas, np.arange(len(linhas) + 1), (num_linhas, len(linhas)))
+
+    @property
+    def nnz(self):
+        return len(self.dados)
+
+    @property
+    def colunas_dos_dados(self):
+        # Índice da coluna de cada valor não nulo (calculado uma vez e reaproveitado)
+        if self._colunas_dos_dados is None:
+            self._colunas_dos_dados = np.repeat(np.arange(self.shape[1]), np.diff(self.ponteiros))
+        return self._colunas_dos_dados
+
+    def copy(self):
+        return MatrizCSC(self.dados.copy(), self.indices.copy(), self.ponteiros.copy(), self.shape)
+
+    def toarray(self):
+        matriz = np.zeros(self.shape)
+        matriz[self.indices, self.colunas_dos_dados] = self.dados
+        return matriz
+
+    def coluna(self, j):
+        inicio, fim = self.ponteiros[j], self.ponteiros[j + 1]
+        coluna = np.zeros(self.shape[0])
+        coluna[self.indices[inicio:fim]] = self.dados[inicio:fim]
+        return coluna
+
+    def colunas_densas(self, indices_colunas):
+        resultado = np.zeros((self.shape[0], len(indices_colunas)))
+        for k, j in enumerate(indices_colunas):
+            inicio, fim = self.ponteiros[j], self.ponteiros[j + 1]
+            resultado[self.indices[inicio:fim], k] = self.dados[inicio:fim]
+        return resultado
+
+    def selecionar_colunas(self, indices_colunas):
+        indices_colunas = np.asarray(indices_colunas, dtype=np.int64)
+        tamanhos = self.ponteiros[indices_colunas + 1] - self.ponteiros[indices_colunas]
+        ponteiros = np.zeros(len(indices_colunas) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=ponteiros[1:])
+        # Posição, nos dados originais, de cada valor das colunas escolhidas
+        deslocamento = np.repeat(self.ponteiros[indices_colunas] - ponteiros[:-1], tamanhos)
+        posicoes = np.arange(ponteiros[-1]) + deslocamento
+        return MatrizCSC(self.dados[posicoes], self.indices[posicoes], ponteiros, (self.shape[0], len(indices_colunas)))
+
+    def hstack(self, outra):
+        # Concatena as colunas de outra matriz à direita, sem densificar
+        return MatrizCSC(
+            np.concatenate((self.dados, outra.dados)),
+            np.concatenate((self.indices, outra.indices)),
+            np.concatenate((self.ponteiros, outra.ponteiros[1:] + self.ponteiros[-1])),
+            (self.shape[0], self.shape[1] + outra.shape[1]),
+        )
+
+    def escalar_colunas(self, fatores):
+        return MatrizCSC(self.dados * np.asarray(fatores)[self.colunas_dos_dados], self.indices, self.ponteiros, self.shape)
+
+    def escalar_linhas(self, fatores):
+        return MatrizCSC(self.dados * np.asarray(fatores)[self.indices], self.indices, self.ponteiros, self.shape)
+
+    def transposta(self):
+        return MatrizCSC.de_trincas(self.colunas_dos_dados, self.indices, self.dados, (self.shape[1], self.shape[0]))
+
+    def __getitem__(self, chave):
+        # Suporta apenas A[:, j], que devolve a coluna j densa
+        linhas, j = chave
+        if linhas != slice(None):
+            raise IndexError("MatrizCSC só permite acesso a colunas inteiras (A[:, j])")
+        return self.coluna(j)
+
+    def __setitem__(self, chave, valores):
+        # A[:, j] = coluna densa: reescreve os não nulos da coluna j
+        linhas, j = chave
+        if linhas != slice(None):
+            raise IndexError("MatrizCSC só permite atribuir colunas inteiras (A[:, j] = ...)")
+        valores = np.asarray(valores, dtype=float)
+        novas_linhas = np.nonzero(valores)[0]
+        inicio, fim = self.ponteiros[j], self.ponteiros[j + 1]
+        self.dados = np.concatenate((self.dados[:inicio], valores[novas_linhas], self.dados[fim:]))
+        self.indices = np.concatenate((self.indices[:inicio], novas_linhas, self.indices[fim:]))
+        self.ponteiros = self.ponteiros.copy()  # Os ponteiros podem ser compartilhados com outra matriz
+        self.ponteiros[j + 1:] += len(novas_linhas) - (fim - inicio)
+        self._colunas_dos_dados = None
+
+    def __matmul__(self, x):
+        # A x
+        x = np.asarray(x, dtype=float)
+        return np.bincount(self.indices, weights=self.dados * x[self.colunas_dos_dados], minlength=self.shape[0])
+
+    def __rmatmul__(self, y):
+        # y^T A (usado no cálculo dos custos reduzidos)
+        y = np.asarray(y, dtype=float)
+        return np.bincount(self.colunas_dos_dados, weights=self.dados * y[self.indices], minlength=self.shape[1])
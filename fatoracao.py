@@ -0,0 +1,162 @@
+import numpy as np
+
+# Fatoração LU da base ###################################################################################################################################################################################################################
+TAMANHO_BLOCO = 64  # Largura dos blocos usados na fatoração e nas substituições triangulares
+
+def fatorar_lu(B, tamanho_bloco=TAMANHO_BLOCO):
+    # Fatoração LU com pivoteamento parcial, feita em blocos para que a maior parte do trabalho seja produto de matrizes
+    # Ao final vale B[perm] = L @ U, com L (triangular inferior unitária) e U guardadas juntas em LU
+    LU = np.array(B, dtype=float)
+    m = LU.shape[0]
+    perm = np.arange(m)
+    tolerancia = 1e-13 * max(np.max(np.abs(LU)) if LU.size else 0.0, 1.0)
+
+    for inicio in range(0, m, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, m)
+        # Fatora o painel [inicio:fim] coluna a coluna
+        for k in range(inicio, fim):
+            p = k + np.argmax(np.abs(LU[k:, k]))
+            if abs(LU[p, k]) <= tolerancia:
+                raise np.linalg.LinAlgError("Matriz da base singular")
+            if p != k:
+                LU[[k, p], :] = LU[[p, k], :]
+                perm[[k, p]] = perm[[p, k]]
+            LU[k + 1:, k] /= LU[k, k]
+            LU[k + 1:, k + 1:fim] -= np.outer(LU[k + 1:, k], LU[k, k + 1:fim])
+        if fim < m:
+            # Calcula o bloco de U à direita do painel e atualiza o restante da matriz de uma só vez
+            L11 = np.tril(LU[inicio:fim, inicio:fim], -1) + np.eye(fim - inicio)
+            LU[inicio:fim, fim:] = np.linalg.solve(L11, LU[inicio:fim, fim:])
+            LU[fim:, fim:] -= LU[fim:, inicio:fim] @ LU[inicio:fim, fim:]
+
+    return LU, perm
+
+def inversas_blocos_diagonais(LU, tamanho_bloco=TAMANHO_BLOCO):
+    # Inverte os blocos diagonais de L e U, assim cada substituição triangular vira uma sequência de produtos matriz-vetor
+    m = LU.shape[0]
+    blocos = []
+    for inicio in range(0, m, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, m)
+        bloco = LU[inicio:fim, inicio:fim]
+        L_inv = np.linalg.inv(np.tril(bloco, -1) + np.eye(fim - inicio))
+        U_inv = np.linalg.inv(np.triu(bloco))
+        blocos.append((inicio, fim, L_inv, U_inv))
+    return blocos
+
+def aplicar_eta(x, k, eta):
+    # Multiplica x pela matriz eta (identidade com a coluna k trocada por eta)
+    x_k = x[k].copy()
+    x[k] = 0
+    if x.ndim == 1:
+        x += eta * x_k
+    else:
+        x += np.outer(eta, x_k)
+    return x
+
+class FatoracaoLU:
+    # Mantém B = P^T L U junto de um arquivo de matrizes eta (forma produto da inversa):
+    # B_atual⁻¹ = E_k ... E_1 U⁻¹ L⁻¹ P. A cada pivô só uma eta é acrescentada (O(m)),
+    # e a fatoração completa é refeita periodicamente ou quando o resíduo cresce demais.
+    def __init__(self, B, max_atualizacoes=64, tolerancia_residuo=1e-9):
+        self.max_atualizacoes = max_atualizacoes
+        self.tolerancia_residuo = tolerancia_residuo
+        self.refatoracoes = 0
+        self.refatorar(B)
+
+    def refatorar(self, B):
+        self.LU, self.perm = fatorar_lu(B)
+        self.blocos = inversas_blocos_diagonais(self.LU)
+        self.etas = []
+        self.refatoracoes += 1
+
+    @property
+    def precisa_refatorar(self):
+        return len(self.etas) >= self.max_atualizacoes
+
+    def ftran(self, a):
+        # Resolve B x = a (a pode ser um vetor ou uma matriz com várias colunas)
+        x = np.array(a, dtype=float)[self.perm]
+        LU = self.LU
+        for inicio, fim, L_inv, _ in self.blocos:
+            if inicio > 0:
+                x[inicio:fim] -= LU[inicio:fim, :inicio] @ x[:inicio]
+            x[inicio:fim] = L_inv @ x[inicio:fim]
+        for inicio, fim, _, U_inv in reversed(self.blocos):
+            x[inicio:fim] -= LU[inicio:fim, fim:] @ x[fim:]
+            x[inicio:fim] = U_inv @ x[inicio:fim]
+        for k, eta in self.etas:
+            aplicar_eta(x, k, eta)
+        return x
+
+    def btran(self, c):
+        # Resolve B^T y = c, isto é, y^T = c^T B⁻¹ (usado para as variáveis duais)
+        y = np.array(c, dtype=float)
+        for k, eta in reversed(self.etas):
+            y[k] = eta @ y
+        LU = self.LU
+        for inicio, fim, _, U_inv in self.blocos:
+            if inicio > 0:
+                y[inicio:fim] -= LU[:inicio, inicio:fim].T @ y[:inicio]
+            y[inicio:fim] = U_inv.T @ y[inicio:fim]
+        for inicio, fim, L_inv, _ in reversed(self.blocos):
+            y[inicio:fim] -= LU[fim:, inicio:fim].T @ y[fim:]
+            y[inicio:fim] = L_inv.T @ y[inicio:fim]
+        resultado = np.empty_like(y)
+        resultado[self.perm] = y
+        return resultado
+
+    def atualizar(self, k, alpha):
+        # Troca a coluna k da base pela coluna cujo FTRAN é alpha (alpha = B⁻¹ a_j)
+        pivo = alpha[k]
+        if abs(pivo) < 1e-11:
+            raise np.linalg.LinAlgError("Pivô muito pequeno na atualização da base")
+        eta = -np.asarray(alpha, dtype=float) / pivo
+        eta[k] = 1.0 / pivo
+        self.etas.append((k, eta))
+
+    def residuo(self, B, x, b):
+        # Resíduo relativo de B x = b, usado para decidir se a fatoração deve ser refeita
+        return np.linalg.norm(B @ x - b, np.inf) / (1.0 + np.linalg.norm(b, np.inf))
+
+    def residuo_aceitavel(self, B, x, b):
+        return self.residuo(B, x, b) <= self.tolerancia_residuo
+
+# Fatoração de Cholesky das equações normais ##############################################################################################################################################################################################
+class FatoracaoCholesky:
+    # M = L L^T de uma matriz simétrica definida positiva (as equações normais A Θ A^T dos pontos interiores).
+    # A fatoração é feita uma vez por iteração e usada em todas as resoluções da iteração (preditor e corretor).
+    # Se M não for numericamente definida positiva (linhas dependentes, Θ muito mal condicionada), uma regularização
+    # δ I crescente é somada à diagonal até a fatoração passar.
+    def __init__(self, M, regularizacao=1e-12, tamanho_bloco=TAMANHO_BLOCO):
+        M = np.array(M, dtype=float)
+        m = M.shape[0]
+        escala = max(np.max(np.abs(np.diag(M))) if m else 0.0, 1.0)
+        diagonal = M[np.diag_indices(m)].copy()
+        self.regularizacao = 0.0
+        while True:
+            try:
+                self.L = np.linalg.cholesky(M)
+                break
+            except np.linalg.LinAlgError:
+                self.regularizacao = regularizacao * escala if self.regularizacao == 0.0 else 100.0 * self.regularizacao
+                if self.regularizacao > escala:
+                    raise
+                M[np.diag_indices(m)] = diagonal + self.regularizacao
+        # Como na LU, as substituições triangulares viram produtos com as inversas dos blocos diagonais
+        self.blocos = []
+        for inicio in range(0, m, tamanho_bloco):
+            fim = min(inicio + tamanho_bloco, m)
+            self.blocos.append((inicio, fim, np.linalg.inv(self.L[inicio:fim, inicio:fim])))
+
+    def resolver(self, r):
+        # Resolve M x = r: L z = r e depois L^T x = z
+        x = np.array(r, dtype=float)
+        L = self.L
+        for inicio, fim, L_inv in self.blocos:
+            if inicio > 0:
+                x[inicio:fim] -= L[inicio:fim, :inicio] @ x[:inicio]
+            x[inicio:fim] = L_inv @ x[inicio:fim]
+        for inicio, fim, L_inv in reversed(self.blocos):
+            x[inicio:fim] -= L[fim:, inicio:fim].T @ x[fim:]
+            x[inicio:fim] = L_inv.T @ x[inicio:fim]
+        return x
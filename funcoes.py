@@ -1,9 +1,35 @@
 import re
+import time
 import numpy as np
 from fractions import Fraction
-from dataclasses import dataclass
-
-@dataclass
+from dataclasses import dataclass, replace
+from fatoracao import FatoracaoLU
+from esparsa import MatrizCSC
+from particao import ColunasNaoBasicas
+from precificacao import RegraBland, criar_regra
+from registro import obter_registro
+from instrumentacao import IteracaoSimplex, obter_instrumentacao
+
+# Situações possíveis ao fim do método simplex
+STATUS_OTIMO = "optimal"
+STATUS_ILIMITADO = "unbounded"
+STATUS_INVIAVEL = "infeasible"
+STATUS_LIMITE_ITERACOES = "iteration_limit"
+STATUS_LIMITE_TEMPO = "time_limit"
+STATUS_LIMITE_OBJETIVO = "objective_limit"
+STATUS_INTERROMPIDO = "interrupted"  # O callback da instrumentação pediu para parar
+
+TOLERANCIA_PIVO = 1e-9  # Componentes de d_B menores que isso (em módulo) não são usados como pivô
+LIMITE_PIVOS_DEGENERADOS = 50  # Pivôs degenerados seguidos antes de recorrer à regra de Bland
+LIMITE_ESTAGNACAO = 3  # Pivôs degenerados seguidos antes de perturbar o lado direito
+TOLERANCIA_HARRIS = 1e-9  # Folga nos limites das básicas na primeira passada do teste da razão de Harris
+TOLERANCIA_PRIMAL = 1e-9  # Violação de limite aceita numa básica ao retirar a perturbação
+PERTURBACAO_RELATIVA = 1e-6  # Tamanho da perturbação de cada básica, relativo a 1 + |x_B|
+
+# Cada problema é uma instância imutável (os campos não podem ser reatribuídos e não há atributos de classe compartilhados):
+# as funções que transformam o PL devolvem uma nova instância, com replace() quando só alguns campos mudam.
+# Os vetores também não são alterados no próprio lugar, então uma instância pode ser usada por várias threads ao mesmo tempo.
+@dataclass(frozen=True, slots=True)
 class ProblemaPL:
     quantidade_variaveis: int
     vetor_variaveis: np.ndarray
@@ -12,499 +38,464 @@ class ProblemaPL:
     vetor_b: np.ndarray
     vetor_operadores: np.ndarray
     vetor_operadores_novo: np.ndarray
+    tipo: int = 0  # 1 para "max", 0 para "min"
+    variaveis_livres: np.ndarray = None
+    variaveis_sinal: np.ndarray = None
+    esparso: bool = False  # Se True, matriz_coeficientes é uma MatrizCSC em todo o caminho até o simplex
+    sinais_linhas: np.ndarray = None  # -1 nas linhas multiplicadas por -1 na forma padrão (b negativo), 1 nas demais
+    # Limites das variáveis (None: x >= 0, com as variáveis livres e de sinal ajustadas). Na forma padrão, o inferior é 0 ou -inf
+    limites_inferiores: np.ndarray = None
+    limites_superiores: np.ndarray = None
+    # Só na forma padrão: a variável do arquivo vale sinal * (deslocamento + z), com sinal -1 nas variáveis x'
+    deslocamentos: np.ndarray = None
+    # Só na forma padrão: o sinal de cada variável do arquivo, que são as primeiras len(sinais_colunas) colunas; as demais
+    # são folgas e excessos (e artificiais, na Fase I). A posição da coluna é o que conta, não o nome: um arquivo MPS
+    # pode ter variáveis chamadas f_1, e_1, a_1 ou x'
+    sinais_colunas: np.ndarray = None
+    constante_objetivo: float = 0.0  # Parcela constante do objetivo, no sentido do arquivo (somada ao valor ótimo)
+    nomes_restricoes: np.ndarray = None  # Nome de cada restrição (None: R1, R2, ... na ordem das linhas)
 
 # Interpretação do arquivo.txt ########################################################################################################################################################################################################
-def contar_variaveis_e_vetor(arquivo):
-    variaveis = set()  # Usar um set para evitar duplicação
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        for linha in f:
-            # Remove as palavras "max", "s.a." e "livre" da linha
-            linha_sem_palavras = re.sub(r'\b(max|s\.a\.|livre|min|s\.a\. )\b', '', linha)
-            
-            # Regex para extrair as variáveis, assumindo que elas são compostas apenas por letras
-            termos = re.findall(r'[a-zA-Z]+', linha_sem_palavras)
-            
-            # Adiciona as variáveis ao set
-            variaveis.update(termos)
-    
-    # Converte o set para uma lista (vetor de variáveis) e ordena
-    vetor_variaveis = np.array(sorted(list(variaveis)))
-    
-    # Retorna a quantidade de variáveis e o vetor de variáveis
-    return len(variaveis), vetor_variaveis
+# Expressões regulares compiladas uma única vez e usadas na leitura em passagem única
+RE_PALAVRAS_CHAVE = re.compile(r'\b(max|s\.a\.|livre|min|s\.a\. )\b')
+RE_VARIAVEL = re.compile(r'[a-zA-Z]+')
+RE_OBJETIVO = re.compile(r'^(max|min)\s+')
+RE_PREFIXO_RESTRICAO = re.compile(r'^\s*(s\.a\.|livre|subject\s+to)\s*', re.IGNORECASE)
+RE_RESTRICAO_DE_SINAL = re.compile(r'^[a-zA-Z]+\s*(<=|>=|=|<|>)\s*0$')
+RE_TERMO = re.compile(r'([+-]?\s*\d*\.*\d*)\s*([a-zA-Z]+)')
+RE_OPERADOR = re.compile(r'(<=|>=|=|<|>)')
+RE_LADO_DIREITO = re.compile(r'(<=|>=|=|<|>)\s*(-?\d+(?:\.\d+)?(?:/\d+)?|\d+/\d+)')
+RE_VARIAVEL_LIVRE = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s+livre$', re.IGNORECASE)
+RE_VARIAVEL_SINAL = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*(<=|<)\s*0$')
+RE_LIMITE = re.compile(r'^([a-zA-Z]+)\s*(<=|>=|<|>)\s*(-?\d+(?:\.\d+)?(?:/\d+)?|-?\.\d+)$')  # "x <= 10", "y >= -3/2"
+
+def converter_coeficiente(coef):
+    coef = coef.replace(" ", "")  # Remove espaços em branco
+    if coef in ["", ".", "+"]:  # Caso o coeficiente esteja ausente, assume 1
+        return 1.0
+    if coef == "-":  # Caso seja apenas "-", assume -1
+        return -1.0
+    try:
+        return float(coef)  # Tenta converter o coeficiente para número
+    except ValueError:
+        return 0.0  # Se não for um número válido, define como 0
+
+def converter_lado_direito(valor_str):
+    valor_str = valor_str.replace(" ", "")  # Remove espaços
+    # Converte frações corretamente
+    if "/" in valor_str:
+        return float(Fraction(valor_str))
+    return float(valor_str)
+
+def ler_arquivo_pl(arquivo):
+    # Lê o arquivo uma única vez, linha a linha, e extrai tudo o que o PL precisa:
+    # custos, termos das restrições (em trincas linha/variável/coeficiente), operadores, lado direito
+    # e as declarações de variáveis livres e de sinal. Os nomes viram índices por um dicionário no final.
+    variaveis = set()
+    tipo = 0
+    termos_objetivo = []
+    termos_restricoes = []  # Uma lista de (variável, coeficiente) por restrição
+    vetor_b = []
+    operadores = []
+    variaveis_livres = []
+    variaveis_sinal = []
+    inferiores_declarados = {}
+    superiores_declarados = {}
 
-def obter_vetor_de_custos(arquivo, vetor_variaveis):
     with open(arquivo, 'r', encoding="utf-8") as f:
-        primeira_linha = f.readline().strip()  # Lê a primeira linha
-
-    # Verifica se a função objetivo é "max" ou "min"
-    match = re.match(r'^(max|min)\s+', primeira_linha)
-    if match:
-        tipo_objetivo = match.group(1)  # Armazena se era "max" ou "min"
-        primeira_linha = re.sub(r'^(max|min)\s+', '', primeira_linha)  # Remove "max" ou "min"
+        for numero_linha, linha in enumerate(f):
+            linha = linha.strip()
+
+            # Todas as palavras (exceto as palavras-chave) são nomes de variáveis
+            variaveis.update(RE_VARIAVEL.findall(RE_PALAVRAS_CHAVE.sub('', linha)))
+
+            # Declarações de variáveis livres ("z livre") e de sinal ("x <= 0")
+            match = RE_VARIAVEL_LIVRE.match(linha)
+            if match:
+                variaveis_livres.append(match.group(1))
+            match = RE_VARIAVEL_SINAL.match(linha)
+            if match:
+                variaveis_sinal.append(match.group(1))
+
+            if numero_linha == 0:
+                # Função objetivo: "max" ou "min" seguido dos termos
+                match = RE_OBJETIVO.match(linha)
+                if match:
+                    tipo = 1 if match.group(1) == "max" else 0
+                    linha = RE_OBJETIVO.sub('', linha)
+                termos_objetivo = [(var, converter_coeficiente(coef)) for coef, var in RE_TERMO.findall(linha)]
+                continue
+
+            # Remove o prefixo "s.a." (ou qualquer outra coisa que anteceda a restrição)
+            linha = RE_PREFIXO_RESTRICAO.sub('', linha)
+
+            # Limites de uma variável ("x <= 10", "y >= 2", e também as restrições de sinal "x <= 0", "y >= 0")
+            # não viram linhas da matriz: ficam nos vetores de limites
+            match = RE_LIMITE.match(linha)
+            if match:
+                var, op, valor = match.group(1), match.group(2), converter_lado_direito(match.group(3))
+                if op in ('<=', '<'):
+                    superiores_declarados[var] = min(superiores_declarados.get(var, np.inf), valor)
+                else:
+                    inferiores_declarados[var] = max(inferiores_declarados.get(var, -np.inf), valor)
+                continue
+            if RE_RESTRICAO_DE_SINAL.search(linha):
+                continue
+
+            match_operador = RE_OPERADOR.search(linha)
+            match_b = RE_LADO_DIREITO.search(linha)
+            if not match_operador or not match_b:
+                continue  # Linha inválida (sem restrição)
+
+            operadores.append(match_operador.group(1))
+            vetor_b.append(converter_lado_direito(match_b.group(2)))
+            termos_restricoes.append([(var, converter_coeficiente(coef)) for coef, var in RE_TERMO.findall(linha)])
+
+    # Converte o set para um vetor ordenado e cria o mapa nome -> índice
+    vetor_variaveis = np.array(sorted(variaveis))
+    indice = {var: i for i, var in enumerate(vetor_variaveis)}
+
+    vetor_de_custos = np.zeros(len(vetor_variaveis), dtype=float)
+    for var, coef in termos_objetivo:
+        vetor_de_custos[indice[var]] = coef
+
+    # Trincas (linha, coluna, valor) da matriz de coeficientes
+    linhas, colunas, valores = [], [], []
+    for i, termos in enumerate(termos_restricoes):
+        for var, coef in termos:
+            linhas.append(i)
+            colunas.append(indice[var])
+            valores.append(coef)
+
+    # Limites: x >= 0 por padrão, sem limite inferior nas livres ("z livre") e nas de sinal ("x <= 0"). Uma linha de uma
+    # variável só aperta esse domínio, como quando era uma linha da matriz: "x <= -5" ou "x >= -5" mantêm x >= 0
+    livres = set(variaveis_livres)
+    sinal = set(variaveis_sinal)
+    limites_inferiores = np.zeros(len(vetor_variaveis))
+    limites_superiores = np.full(len(vetor_variaveis), np.inf)
+    for var, j in indice.items():
+        padrao = -np.inf if (var in livres or var in sinal) else 0.0
+        limites_inferiores[j] = max(padrao, inferiores_declarados.get(var, -np.inf))
+        limites_superiores[j] = superiores_declarados.get(var, np.inf)
+
+    return (
+        vetor_variaveis, vetor_de_custos, tipo,
+        (np.array(linhas, dtype=int), np.array(colunas, dtype=int), np.array(valores, dtype=float)),
+        np.array(vetor_b, dtype=float), np.array(operadores),
+        np.array(variaveis_livres), np.array(variaveis_sinal),
+        (limites_inferiores, limites_superiores),
+    )
 
-    if tipo_objetivo == "max":
-        tipo = 1
+def montar_matriz_esparsa(trincas, num_linhas, num_colunas):
+    linhas, colunas, valores = trincas
+    return MatrizCSC.de_trincas(linhas, colunas, valores, (num_linhas, num_colunas))
+
+def montar_matriz_densa(trincas, num_linhas, num_colunas):
+    linhas, colunas, valores = trincas
+    matriz_coeficientes = np.zeros((num_linhas, num_colunas), dtype=float)
+    # Atribuição (e não soma): se a variável aparecer duas vezes na linha, vale o último coeficiente
+    matriz_coeficientes[linhas, colunas] = valores
+    return matriz_coeficientes
+
+def gerar_formato_matricial(arquivo, esparso=False, registro=None):
+    registro = obter_registro(registro)
+    (vetor_variaveis, vetor_de_custos, tipo, trincas, vetor_b, vetor_operadores,
+     var_livres, var_sinais, (limites_inferiores, limites_superiores)) = ler_arquivo_pl(arquivo)
+    if esparso:
+        matriz_coeficientes = montar_matriz_esparsa(trincas, len(vetor_b), len(vetor_variaveis))
     else:
-        tipo = 0
-
-    # Inicializa o vetor de coeficientes como zeros
-    coeficientes = np.zeros(len(vetor_variaveis), dtype=float)
-
-    # Encontra os coeficientes e as variáveis
-    termos = re.findall(r'([+-]?\s*\d*\.*\d*)\s*([a-zA-Z]+)', primeira_linha)
-
-    for coef, var in termos:
-        coef = coef.replace(" ", "")  # Remove espaços em branco
-        if coef in ["", "+"]:  # Caso o coeficiente esteja ausente, assume 1
-            coef = "1"
-        elif coef == "-":  # Caso seja apenas "-", assume -1
-            coef = "-1"
-        
-        coef = float(coef)  # Converte para número
-        
-        # Atualiza a posição correta no vetor de coeficientes
-        if var in vetor_variaveis:
-            index = np.where(vetor_variaveis == var)[0][0]
-            coeficientes[index] = coef
-
-    return coeficientes, tipo
-
-def obter_matriz_coeficientes_restricoes(arquivo, vetor_variaveis):
-    # Lê as linhas do arquivo
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
-
-    # Inicializa a matriz de coeficientes das restrições
-    matriz_coeficientes = []
-
-    # A partir da segunda linha, processa as restrições
-    for linha in linhas[1:]:  # Ignora a primeira linha (função objetivo)
-        # Remove quebras de linha e espaços extras
-        linha = linha.strip()
-
-        # Remove o prefixo "s.a." (ou qualquer outra coisa que anteceda a restrição)
-        linha = re.sub(r'^\s*(s\.a\.|livre|subject\s+to)\s*', '', linha, flags=re.IGNORECASE)
-
-        # Ignora restrições que são do tipo "variável livre", como "x <= 0", "y >= 0"
-        if re.search(r'^[a-zA-Z]+\s*(<=|>=|=|>|<)\s*0', linha):  
-            continue  # Ignora restrições de variáveis livres
-
-        # Identifica o tipo de restrição (<=, >=, =)
-        if '<=' in linha or '<' in linha:
-            tipo_restricao = '<=|<'
-        elif '>=' in linha or '>' in linha:
-            tipo_restricao = '>=|>'
-        elif '=' in linha:
-            tipo_restricao = '='
-        else:
-            continue  # Linha inválida (sem restrição)
-
-        # Divide a linha em termos
-        termos = re.findall(r'([+-]?\s*\d*\.*\d*)\s*([a-zA-Z]+)', linha)
-
-        # Inicializa um vetor de coeficientes para esta restrição
-        coeficientes_restricao = np.zeros(len(vetor_variaveis), dtype=float)
-
-        # Preenche o vetor de coeficientes
-        for coef, var in termos:
-            coef = coef.strip()
-            coef = coef.replace(" ", "")
-
-            # Caso o coeficiente seja vazio ou apenas o sinal
-            if coef in ["", ".", "+"]:
-                coef = "1"  # Define 1, pois 'x' é implicitamente 1x
-            elif coef == "-":
-                coef = "-1"  # Define -1, pois '-x' é implicitamente -1x
-            elif coef == ".":
-                coef = "0"  # Caso seja apenas um ponto, substituímos por 0
-            else:
-                coef = coef.replace(" ", "")  # Remove espaços extras
-                try:
-                    
-                    coef = float(coef)  # Tenta converter o coeficiente para número
-                except ValueError:
-                    coef = 0.0  # Se não for um número válido, define como 0
-
-            # Encontra o índice da variável no vetor de variáveis
-            indices = np.where(vetor_variaveis == var)[0]
-            if len(indices) > 0:
-                index = indices[0]  # Assume que a variável está no vetor
-                coeficientes_restricao[index] = coef
-
-        # Adiciona o vetor de coeficientes dessa restrição à matriz
-        matriz_coeficientes.append(coeficientes_restricao)
-
-    # Converte a lista de listas para uma matriz NumPy
-    return np.array(matriz_coeficientes)
-
-def obter_vetor_b(arquivo):
-    # Lê as linhas do arquivo
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
-
-    # Inicializa o vetor b
-    vetor_b = []
-
-    # A partir da segunda linha, processa as restrições
-    for linha in linhas[1:]:  # Ignora a primeira linha (função objetivo)
-        linha = linha.strip()
-
-        # Ignora prefixos como "s.a.", "livre", etc., mas não interfere nas restrições
-        linha = re.sub(r'^\s*(s\.a\.|livre|subject\s+to)\s*', '', linha, flags=re.IGNORECASE)
-
-        # Ignora restrições de variáveis livres como "x <= 0", "y >= 0" (apenas essas)
-        if re.search(r'^[a-zA-Z]+\s*(<=|>=|=|<|>)\s*0$', linha):  
-            continue  # Ignora essas restrições específicas
-
-        # Verifica se há um número no lado direito da restrição e extrai (suportando frações e decimais)
-        match = re.search(r'(<=|>=|=|<|>)\s*(-?\d+(?:\.\d+)?(?:/\d+)?|\d+/\d+)', linha)
-        if match:
-            valor_str = match.group(2).replace(" ", "")  # Remove espaços
-
-            # Converte frações corretamente
-            if "/" in valor_str:
-                valor_b = float(Fraction(valor_str))  # Converte fração para float
-            else:
-                valor_b = float(valor_str)  # Converte número decimal normalmente
-            
-            vetor_b.append(valor_b)
-    # Retorna o vetor de b como um array NumPy
-    return np.array(vetor_b)
-
-def obter_operadores_restricoes(arquivo):
-    # Lê as linhas do arquivo
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
+        matriz_coeficientes = montar_matriz_densa(trincas, len(vetor_b), len(vetor_variaveis))
 
-    # Inicializa o vetor de operadores
-    operadores = []
+    registro("\n Problema dado:\n")
+    # O texto do modelo só é montado se o registro estiver ativo
+    registro(lambda: gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, vetor_de_custos, vetor_variaveis, var_livres, var_sinais, tipo,
+                                           limites=(limites_inferiores, limites_superiores)))
 
-    # A partir da segunda linha, processa as restrições
-    for linha in linhas[1:]:  # Ignora a primeira linha (função objetivo)
-        linha = linha.strip()
-
-        # Ignora prefixos como "s.a.", "livre", etc., mas não interfere nas restrições
-        linha = re.sub(r'^\s*(s\.a\.|livre|subject\s+to)\s*', '', linha, flags=re.IGNORECASE)
-
-        # Ignora restrições de variáveis livres como "x <= 0", "y >= 0" (apenas essas)
-        if re.search(r'^[a-zA-Z]+\s*(<=|>=|=|<|>)\s*0$', linha):  
-            continue  # Ignora essas restrições específicas
-
-        # Verifica se há operadores de comparação
-        match = re.search(r'(<=|>=|=|<|>)', linha)
-        if match:
-            operador = match.group(1)  # Extrai o operador encontrado
-            operadores.append(operador)
-
-    # Retorna o vetor de operadores como um array NumPy
-    return np.array(operadores)
-
-def gerar_formato_matricial(arquivo):
-    quantidade_variaveis, vetor_variaveis = contar_variaveis_e_vetor(arquivo)
-    vetor_de_custos, tipo = obter_vetor_de_custos(arquivo, vetor_variaveis)
-    matriz_coeficientes = obter_matriz_coeficientes_restricoes(arquivo, vetor_variaveis)
-    vetor_b = obter_vetor_b(arquivo)
-    vetor_operadores = obter_operadores_restricoes(arquivo)
-
-    var_livres = verificar_variaveis_livres(arquivo, vetor_variaveis)
-    var_sinais = verificar_variaveis_sinal(arquivo, vetor_variaveis)
-    print("\n Problema dado:\n")
-    resultado = gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, vetor_de_custos, vetor_variaveis, var_livres, var_sinais, tipo)
-    print(resultado)
-
-    ProblemaPL.quantidade_variaveis = quantidade_variaveis
-    ProblemaPL.vetor_variaveis = vetor_variaveis
-    ProblemaPL.vetor_de_custos = vetor_de_custos
-    ProblemaPL.matriz_coeficientes = matriz_coeficientes
-    ProblemaPL.vetor_b = vetor_b
-    ProblemaPL.vetor_operadores = vetor_operadores
-
-    return ProblemaPL
-
-def transformar_para_forma_padrao(problema: ProblemaPL, arquivo: str) -> ProblemaPL:
-    vetor_coef_tratado = transformar_para_min(arquivo, problema.vetor_de_custos)
-    matriz_tratada, novas_variaveis, vetor_coef_tratado = tratar_variaveis_de_sinal(
-        arquivo, problema.matriz_coeficientes, problema.vetor_variaveis, vetor_coef_tratado
+    return ProblemaPL(
+        len(vetor_variaveis), vetor_variaveis, vetor_de_custos, matriz_coeficientes, vetor_b, vetor_operadores, None,
+        tipo=tipo, variaveis_livres=var_livres, variaveis_sinal=var_sinais, esparso=esparso,
+        limites_inferiores=limites_inferiores, limites_superiores=limites_superiores,
     )
-    matriz_tratada, novas_variaveis, vetor_coef_tratado = tratar_variaveis_livres(
-        arquivo, matriz_tratada, novas_variaveis, vetor_coef_tratado
+
+def transformar_para_forma_padrao(problema: ProblemaPL, registro=None) -> ProblemaPL:
+    registro = obter_registro(registro)
+    vetor_coef_tratado = transformar_para_min(problema.vetor_de_custos, problema.tipo)
+    inferiores, superiores = limites_das_variaveis(problema)
+    (matriz_tratada, novas_variaveis, vetor_coef_tratado, vetor_b, limites_inferiores, limites_superiores, deslocamentos,
+     sinais_colunas) = tratar_limites(
+        problema.matriz_coeficientes, problema.vetor_variaveis, vetor_coef_tratado, problema.vetor_b, inferiores, superiores
     )
     matriz_tratada, novo_vetor_b, novo_vetor_operadores = ajustar_vetor_b(
-        matriz_tratada, problema.vetor_b, problema.vetor_operadores
-    )
-    matriz_tratada, novas_variaveis, vetor_coef_tratado, novo_vetor_operadores = adicionar_variavel_folga(
-        matriz_tratada, novas_variaveis, novo_vetor_operadores, vetor_coef_tratado
+        matriz_tratada, vetor_b, problema.vetor_operadores
     )
-    matriz_tratada, novas_variaveis, vetor_coef_tratado, novo_vetor_operadores = adicionar_variavel_excesso(
+    sinais_linhas = np.where(np.asarray(vetor_b) < 0, -1.0, 1.0)  # Linhas invertidas por ajustar_vetor_b
+    operadores_ajustados = novo_vetor_operadores  # Sentido de cada linha já com b >= 0 (usado na Fase I)
+    matriz_tratada, novas_variaveis, vetor_coef_tratado, novo_vetor_operadores = adicionar_folgas_e_excessos(
         matriz_tratada, novas_variaveis, novo_vetor_operadores, vetor_coef_tratado
     )
 
-    print("\nTransformando para forma padrão:\n")
-    resultado = gerar_formato_textual(
-        matriz_tratada, novo_vetor_operadores, novo_vetor_b, vetor_coef_tratado, novas_variaveis, [], [], 0
+    # Folgas e excessos: [0, +inf), sem deslocamento
+    auxiliares = len(novas_variaveis) - len(limites_inferiores)
+    limites_inferiores = np.concatenate((limites_inferiores, np.zeros(auxiliares)))
+    limites_superiores = np.concatenate((limites_superiores, np.full(auxiliares, np.inf)))
+    deslocamentos = np.concatenate((deslocamentos, np.zeros(auxiliares)))
+
+    registro("\nTransformando para forma padrão:\n")
+    registro(lambda: gerar_formato_textual(
+        matriz_tratada, novo_vetor_operadores, novo_vetor_b, vetor_coef_tratado, novas_variaveis, [], [], 0,
+        limites=(limites_inferiores, limites_superiores),
+    ))
+
+    # Retorna um novo objeto ProblemaPL (já na forma de minimização, com os limites nos vetores de limites)
+    return ProblemaPL(
+        len(novas_variaveis), np.array(novas_variaveis), vetor_coef_tratado, matriz_tratada, novo_vetor_b,
+        operadores_ajustados, novo_vetor_operadores, esparso=problema.esparso, sinais_linhas=sinais_linhas,
+        limites_inferiores=limites_inferiores, limites_superiores=limites_superiores, deslocamentos=deslocamentos,
+        sinais_colunas=sinais_colunas,
     )
-    print(resultado)
-
-    ProblemaPL.quantidade_variaveis = len(novas_variaveis)
-    ProblemaPL.vetor_variaveis=np.array(novas_variaveis)
-    ProblemaPL.vetor_de_custos=vetor_coef_tratado
-    ProblemaPL.matriz_coeficientes=matriz_tratada
-    ProblemaPL.vetor_b=novo_vetor_b
-    ProblemaPL.vetor_operadores_novo=novo_vetor_operadores
-
-    # Retorna um novo objeto ProblemaPL atualizado
-    return ProblemaPL
 
 # Transformar para forma padrão ##################################################################################################################################################################################################
-def transformar_para_min(arquivo, vetor_de_custos):
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        primeira_linha = f.readline().strip()  # Lê a primeira linha
-
-    # Verifica se a função objetivo é "max" ou "min"
-    match = re.match(r'^(max|min)\s+', primeira_linha)
-    if match:
-        tipo_objetivo = match.group(1)  # Armazena se era "max" ou "min"
-        primeira_linha = re.sub(r'^(max|min)\s+', '', primeira_linha)  # Remove "max" ou "min"
+def transformar_para_min(vetor_de_custos, tipo):
+    vetor_de_custos = vetor_de_custos.copy()
 
     # Se o problema era de maximização, multiplica os coeficientes por -1
-    if tipo_objetivo == "max":
+    if tipo == 1:
         vetor_de_custos[vetor_de_custos != 0] *= -1  # Apenas elementos diferentes de zero são multiplicados
 
     return vetor_de_custos
 
-def tratar_variaveis_de_sinal(arquivo, matriz_coeficientes, vetor_variaveis, vetor_coef_objetivo):
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
-
+def tratar_variaveis_de_sinal(variaveis_sinal, matriz_coeficientes, vetor_variaveis, vetor_coef_objetivo):
     # Converte vetor de variáveis para lista para permitir modificações
     novas_variaveis = list(vetor_variaveis)
-    matriz_modificada = matriz_coeficientes.copy()
-    vetor_coef_objetivo_modificado = vetor_coef_objetivo.copy()
+    indice = {var: i for i, var in enumerate(novas_variaveis)}
+    sinais = np.ones(len(novas_variaveis))
     
-    # Percorre as linhas para encontrar restrições de sinal no formato "x <= 0"
-    for linha in linhas:
-        linha = linha.strip()
-        
-        # Identifica variáveis com restrições do tipo "x <= 0"
-        match = re.match(r'^([a-zA-Z]+)\s*(<=|<)\s*0$', linha)
-        if match:
-            variavel = match.group(1)  # Captura a variável
-
-            # Verifica se a variável está no vetor de variáveis
-            if variavel in novas_variaveis:
-                indice = novas_variaveis.index(variavel)  # Pega o índice na lista
-
-                # Substitui a variável por uma nova variável x'
-                novas_variaveis[indice] = f"{variavel}'"
-                
-                # Multiplica a coluna correspondente na matriz de coeficientes por -1, se houver valores diferentes de zero
-                if np.any(matriz_modificada[:, indice] != 0):
-                    matriz_modificada[:, indice] *= -1
-
-                # Multiplica o coeficiente correspondente na função objetivo por -1, se for diferente de zero
-                if vetor_coef_objetivo_modificado[indice] != 0:
-                    vetor_coef_objetivo_modificado[indice] *= -1
-
-    # Substituir -0.0 por 0.0 para manter a clareza
-    matriz_modificada[matriz_modificada == -0.0] = 0.0
-    vetor_coef_objetivo_modificado[vetor_coef_objetivo_modificado == -0.0] = 0.0
-    # Retorna as variáveis como array NumPy novamente, junto com as variáveis de sinal alterado
-    return matriz_modificada, np.array(novas_variaveis), vetor_coef_objetivo_modificado
-
-def tratar_variaveis_livres(arquivo, matriz_coeficientes, vetor_variaveis, vetor_coef_objetivo):
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
+    # Percorre as variáveis declaradas no formato "x <= 0"
+    for variavel in variaveis_sinal:
+        # Verifica se a variável está no vetor de variáveis
+        if variavel in indice:
+            indice_var = indice[variavel]  # Pega o índice na lista
+
+            # Substitui a variável por uma nova variável x'
+            novas_variaveis[indice_var] = f"{variavel}'"
+            
+            # A coluna correspondente na matriz e o coeficiente na função objetivo serão multiplicados por -1
+            sinais[indice_var] = -1
 
-    novas_variaveis = list(vetor_variaveis)
-    matriz_modificada = matriz_coeficientes.copy()
-    vetor_coef_objetivo_modificado = vetor_coef_objetivo.copy()
-
-    # Percorre as linhas para encontrar variáveis livres no formato "z livre"
-    for linha in linhas:
-        linha = linha.strip()
-        
-        match = re.match(r'^([a-zA-Z]+)\s+livre$', linha, re.IGNORECASE)
-        if match:
-            variavel = match.group(1)  # Captura a variável
-
-            # Verifica se a variável está no vetor de variáveis
-            if variavel in novas_variaveis:
-                indice = novas_variaveis.index(variavel)  # Pega o índice na lista
-
-                # Define novas variáveis z* e z**
-                var_estrela = f"{variavel}*"
-                var_duplo_estrela = f"{variavel}**"
-
-                # Substitui a variável original pelas duas novas variáveis
-                novas_variaveis[indice] = var_estrela  # Substitui a variável antiga por z*
-                novas_variaveis.append(var_duplo_estrela)  # Adiciona z**
-
-                # Adiciona uma nova coluna para z**
-                nova_coluna = np.zeros((matriz_modificada.shape[0], 1))  # Coluna zerada inicialmente
-                matriz_modificada = np.hstack((matriz_modificada, nova_coluna))  # Adiciona nova coluna
-
-                # Modifica a matriz de coeficientes para z = z* - z**
-                matriz_modificada[:, indice] *= 1  # Mantém coeficientes de z* como estão
-                matriz_modificada[:, -1] = -matriz_modificada[:, indice]  # Define coeficientes de z** como -z*
-
-                # Adiciona um coeficiente 0 para z** na função objetivo
-                vetor_coef_objetivo_modificado = np.append(vetor_coef_objetivo_modificado, -vetor_coef_objetivo_modificado[indice])
-
-    # Substituir -0.0 por 0.0 para manter a clareza
-    matriz_modificada[matriz_modificada == -0.0] = 0.0
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        matriz_modificada = matriz_coeficientes.escalar_colunas(sinais)
+    else:
+        matriz_modificada = matriz_coeficientes * sinais
+        # Substituir -0.0 por 0.0 para manter a clareza
+        matriz_modificada[matriz_modificada == -0.0] = 0.0
+    vetor_coef_objetivo_modificado = vetor_coef_objetivo * sinais
     vetor_coef_objetivo_modificado[vetor_coef_objetivo_modificado == -0.0] = 0.0
-    
+    # Retorna as variáveis como array NumPy novamente, junto com as variáveis de sinal alterado
     return matriz_modificada, np.array(novas_variaveis), vetor_coef_objetivo_modificado
 
-def verificar_variaveis_livres(arquivo, vetor_variaveis):
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
+def limites_das_variaveis(problema: ProblemaPL):
+    # Limites de cada variável do modelo; sem os vetores de limites, vale x >= 0,
+    # com as variáveis livres ("z livre") sem limites e as de sinal ("x <= 0") em (-inf, 0]
+    if problema.limites_inferiores is not None:
+        return np.array(problema.limites_inferiores, dtype=float), np.array(problema.limites_superiores, dtype=float)
+    livres = set(problema.variaveis_livres if problema.variaveis_livres is not None else [])
+    sinal = set(problema.variaveis_sinal if problema.variaveis_sinal is not None else [])
+    inferiores = np.array([-np.inf if (var in livres or var in sinal) else 0.0 for var in problema.vetor_variaveis])
+    superiores = np.array([0.0 if (var in sinal and var not in livres) else np.inf for var in problema.vetor_variaveis])
+    return inferiores, superiores
+
+def nomes_das_restricoes(problema: ProblemaPL):
+    # Nomes das restrições do modelo; o formato de texto não dá nomes, e as linhas ficam R1, R2, ... (como no escrever_mps)
+    if problema.nomes_restricoes is not None:
+        return [str(nome) for nome in problema.nomes_restricoes]
+    return [f"R{i + 1}" for i in range(len(problema.vetor_b))]
+
+def tratar_limites(matriz_coeficientes, vetor_variaveis, vetor_coef_objetivo, vetor_b, inferiores, superiores):
+    # Leva cada variável para uma variável z da forma padrão com limite inferior 0 (ou -inf, se for livre):
+    #   l finito:           x = l + z,  0 <= z <= u - l
+    #   só u finito:        x = u - z,  z >= 0           (a coluna é negada e a variável vira x', como nas de sinal)
+    #   livre:              x = z,      z livre          (sem dividir em z* - z**)
+    # O lado direito é corrigido pelos deslocamentos: b - A d. Também devolve o sinal de cada coluna (-1 nas negadas)
+    incompativeis = np.nonzero(inferiores > superiores)[0]
+    if len(incompativeis):
+        raise ValueError(f"Limites incompatíveis para a variável {vetor_variaveis[incompativeis[0]]}")
+    inferior_finito = np.isfinite(inferiores)
+    negar = ~inferior_finito & np.isfinite(superiores)
+    d = np.where(inferior_finito, inferiores, np.where(negar, superiores, 0.0))
+
+    vetor_b = np.asarray(vetor_b, dtype=float)
+    if np.any(d != 0):
+        vetor_b = vetor_b - matriz_coeficientes @ d
+    matriz_modificada, novas_variaveis, vetor_coef_objetivo_modificado = tratar_variaveis_de_sinal(
+        np.asarray(vetor_variaveis)[negar], matriz_coeficientes, vetor_variaveis, vetor_coef_objetivo
+    )
 
-    # Lista para armazenar as variáveis livres
-    variaveis_livres = []
+    limites_inferiores = np.where(inferior_finito | negar, 0.0, -np.inf)
+    limites_superiores = np.where(inferior_finito, superiores - inferiores, np.inf)
+    deslocamentos = np.where(negar, -d, d)
+    sinais_colunas = np.where(negar, -1.0, 1.0)
+    return (matriz_modificada, novas_variaveis, vetor_coef_objetivo_modificado, vetor_b, limites_inferiores, limites_superiores, deslocamentos,
+            sinais_colunas)
 
-    # Percorre as linhas para encontrar variáveis livres no formato "z livre"
-    for linha in linhas:
-        linha = linha.strip()
-        
-        # Verifica se a linha corresponde ao formato "variavel livre"
-        match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s+livre$', linha, re.IGNORECASE)
-        if match:
-            variavel = match.group(1)  # Captura a variável
-            if variavel in vetor_variaveis:
-                variaveis_livres.append(variavel)
-    
-    return np.array(variaveis_livres)
-
-def verificar_variaveis_sinal(arquivo, vetor_variaveis):
-    with open(arquivo, 'r', encoding="utf-8") as f:
-        linhas = f.readlines()
-
-    # Lista para armazenar as variáveis com restrições de sinal
-    variaveis_de_sinal = []
-
-    # Percorre as linhas para encontrar restrições no formato "x <= 0" ou "x < 0"
-    for linha in linhas:
-        linha = linha.strip()
-        
-        # Verifica se a linha corresponde ao formato "variavel <= 0" ou "variavel < 0"
-        match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*(<=|<)\s*0$', linha)
-        if match:
-            variavel = match.group(1)  # Captura a variável
-            if variavel in vetor_variaveis:
-                variaveis_de_sinal.append(variavel)
-    
-    return np.array(variaveis_de_sinal)
+# Inverte o sentido de uma desigualdade quando a linha é multiplicada por -1
+SENTIDO_INVERTIDO = {'>=': '<=', '<=': '>=', '>': '<', '<': '>'}
 
 def ajustar_vetor_b(matriz_coeficientes, vetor_b, operadores):
-    matriz_ajustada = matriz_coeficientes.copy()
-    vetor_b_ajustado = vetor_b.copy()
+    vetor_b = np.asarray(vetor_b, dtype=float)
+    sinais = np.where(vetor_b < 0, -1.0, 1.0)
     operadores_ajustados = operadores.copy()  # Copia o vetor de operadores
 
-    for i in range(len(vetor_b_ajustado)):
-        if vetor_b_ajustado[i] < 0:
-            # Multiplica a linha correspondente na matriz por -1
-            matriz_ajustada[i, :] *= -1
-            # Multiplica o valor de b por -1
-            vetor_b_ajustado[i] *= -1
-            # Troca o operador '>=', '<='
-            if operadores_ajustados[i] == '>=':
-                operadores_ajustados[i] = '<='
-            elif operadores_ajustados[i] == '<=':
-                operadores_ajustados[i] = '>='
-            elif operadores_ajustados[i] == '<':
-                operadores_ajustados[i] = '>'
-            elif operadores_ajustados[i] == '>':
-                operadores_ajustados[i] = '<'
-
-    # Substituir -0.0 por 0.0 para manter a clareza
-    matriz_ajustada[matriz_ajustada == -0.0] = 0.0
+    # As linhas com b < 0 são multiplicadas por -1 de uma vez (uma única cópia da matriz)
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        matriz_ajustada = matriz_coeficientes.escalar_linhas(sinais)
+    else:
+        matriz_ajustada = matriz_coeficientes * sinais[:, None]
+        # Substituir -0.0 por 0.0 para manter a clareza
+        matriz_ajustada[matriz_ajustada == -0.0] = 0.0
+    vetor_b_ajustado = vetor_b * sinais
     vetor_b_ajustado[vetor_b_ajustado == -0.0] = 0.0
 
-    return matriz_ajustada, vetor_b_ajustado, operadores_ajustados
-
-def adicionar_variavel_folga(matriz_coeficientes, vetor_variaveis, restricoes, coef_objetivo):
-    # Converte para lista para adicionar variáveis
-    novas_variaveis = vetor_variaveis.tolist()
-    num_linhas = matriz_coeficientes.shape[0]
-
-    # Inicializa matriz identidade para as variáveis de folga
-    identidade = np.zeros((num_linhas, 0))  # Começa sem colunas
-
-    operadores_ajustados = restricoes.copy()  # Copia o vetor de operadores
-
-    count = 0
-    for i, restricao in enumerate(restricoes):
-        if restricao == '<=' or restricao == '<':
-            count += 1
-            nova_coluna = np.zeros((num_linhas, 1))  # Cria nova coluna
-            nova_coluna[i, 0] = 1  # Define o 1 na posição correta
-            identidade = np.hstack((identidade, nova_coluna))  # Adiciona à matriz identidade
-            novas_variaveis.append(f"f_{count}")  # Adiciona a variável de folga
-
-            # Adiciona 0 no vetor de coeficiente da função objetiva para a variável de folga
-            coef_objetivo = np.append(coef_objetivo, 0)
-            operadores_ajustados[i] = "="
-
-    # Se pelo menos uma coluna foi adicionada, concatena com a matriz de coeficientes
-    if identidade.shape[1] > 0:
-        matriz_coeficientes = np.hstack((matriz_coeficientes, identidade))
+    # Troca o operador '>=', '<=' (e '>', '<') só nas linhas invertidas
+    for i in np.nonzero(sinais < 0)[0]:
+        operadores_ajustados[i] = SENTIDO_INVERTIDO.get(operadores_ajustados[i], operadores_ajustados[i])
 
-    return matriz_coeficientes, np.array(novas_variaveis), coef_objetivo, operadores_ajustados
-
-def adicionar_variavel_excesso(matriz_coeficientes, vetor_variaveis, restricoes, coef_objetivo):
-    # Converte para lista para adicionar variáveis
-    novas_variaveis = vetor_variaveis.tolist()
-    num_linhas = matriz_coeficientes.shape[0]
+    return matriz_ajustada, vetor_b_ajustado, operadores_ajustados
 
-    # Inicializa matriz identidade para as variáveis de excesso
-    identidade = np.zeros((num_linhas, 0))  # Começa sem colunas
+def concatenar_colunas(matriz_coeficientes, linhas_novas, valores):
+    # Acrescenta um bloco de colunas unitárias (folgas, excessos, artificiais): a coluna k tem valores[k] na linha linhas_novas[k].
+    # Na matriz esparsa o bloco entra só com seus não nulos; na densa, a matriz final é alocada uma única vez
+    num_linhas, num_colunas = matriz_coeficientes.shape
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        return matriz_coeficientes.hstack(MatrizCSC.colunas_unitarias(num_linhas, linhas_novas, valores))
+    matriz = np.zeros((num_linhas, num_colunas + len(linhas_novas)))
+    matriz[:, :num_colunas] = matriz_coeficientes
+    matriz[linhas_novas, num_colunas + np.arange(len(linhas_novas))] = valores
+    return matriz
+
+def adicionar_folgas_e_excessos(matriz_coeficientes, vetor_variaveis, restricoes, coef_objetivo):
+    # Monta a forma padrão de uma vez: as linhas "<=" / "<" ganham uma folga (+1) e as ">=" / ">" um excesso (-1).
+    # As colunas são contadas antes, e a matriz, os custos e os nomes finais são alocados uma única vez, na ordem
+    # originais, folgas (f_1, f_2, ... na ordem das linhas) e excessos (e_1, e_2, ...).
+    restricoes_array = np.asarray(restricoes, dtype=object)
+    linhas_folga = np.nonzero((restricoes_array == '<=') | (restricoes_array == '<'))[0]
+    linhas_excesso = np.nonzero((restricoes_array == '>=') | (restricoes_array == '>'))[0]
+    num_folgas, num_excessos = len(linhas_folga), len(linhas_excesso)
 
     operadores_ajustados = restricoes.copy()  # Copia o vetor de operadores
+    for i in np.concatenate((linhas_folga, linhas_excesso)):
+        operadores_ajustados[i] = "="
 
-    count = 0
-    for i, restricao in enumerate(restricoes):
-        if restricao == '>=' or restricao == '>':
-            count += 1
-            nova_coluna = np.zeros((num_linhas, 1))  # Cria nova coluna
-            nova_coluna[i, 0] = -1  # Define o 1 na posição correta
-            identidade = np.hstack((identidade, nova_coluna))  # Adiciona à matriz identidade
-            novas_variaveis.append(f"e_{count}")  # Adiciona a variável de excesso
-
-            # Adiciona 0 no vetor de coeficiente da função objetiva para a variável de excesso
-            coef_objetivo = np.append(coef_objetivo, 0)
-            operadores_ajustados[i] = "="
+    if num_folgas + num_excessos == 0:
+        return matriz_coeficientes, np.asarray(vetor_variaveis), coef_objetivo, operadores_ajustados
 
-    # Se pelo menos uma coluna foi adicionada, concatena com a matriz de coeficientes
-    if identidade.shape[1] > 0:
-        matriz_coeficientes = np.hstack((matriz_coeficientes, identidade))
+    linhas_novas = np.concatenate((linhas_folga, linhas_excesso))
+    valores = np.concatenate((np.ones(num_folgas), -np.ones(num_excessos)))
+    matriz_coeficientes = concatenar_colunas(matriz_coeficientes, linhas_novas, valores)
 
-    return matriz_coeficientes, np.array(novas_variaveis), coef_objetivo, operadores_ajustados
+    # Adiciona 0 no vetor de coeficiente da função objetiva para as folgas e os excessos
+    coef_objetivo = np.concatenate((coef_objetivo, np.zeros(len(linhas_novas))))
+    novas_variaveis = np.concatenate((
+        np.asarray(vetor_variaveis, dtype=object),
+        [f"f_{k}" for k in range(1, num_folgas + 1)],
+        [f"e_{k}" for k in range(1, num_excessos + 1)],
+    ))
+    return matriz_coeficientes, novas_variaveis.astype(str), coef_objetivo, operadores_ajustados
 
 # Gerar PL extra #######################################################################################################################################################################################################
-def possui_solucao_basica_viavel(matriz_coeficientes):
-    num_linhas, num_colunas = matriz_coeficientes.shape
-    identidade = np.eye(num_linhas)  # Matriz identidade do tamanho adequado
-
-    colunas_base = []  # Lista para armazenar os índices das colunas que formam a identidade
-    colunas_nao_encontradas = []
-
-    for i in range(num_linhas):  # Percorre as linhas da identidade (primeira coluna, depois a segunda, etc.)
-        coluna_encontrada = False
-        for j in range(num_colunas):  # Percorre as colunas da matriz de coeficientes
-            if j not in colunas_base:  # Garante que não repete colunas já usadas
-                if np.allclose(matriz_coeficientes[:, j], identidade[:, i]):  # Compara a coluna com a correspondente na identidade
-                    colunas_base.append(j)  # Salva o índice da coluna encontrada
-                    coluna_encontrada = True
-                    break  # Passa para a próxima linha da identidade
-        if not coluna_encontrada:  # Se não encontrou uma correspondência para a coluna da identidade
-            colunas_nao_encontradas.append(i)  # Salva o índice da coluna da identidade que não foi encontrada
-    # Se encontrou todas as colunas na ordem correta, retorna sucesso
-    if len(colunas_base) == num_linhas:
-        return True, colunas_base, colunas_nao_encontradas
-    
-    return False, [], colunas_nao_encontradas  # Retorna falso se não encontrou todas as colunas necessárias
+TOLERANCIA_CRASH = 1e-2  # Pivô do crash: |a_ij| relativo ao maior valor da coluna, para a base não sair mal condicionada
+
+def possui_solucao_basica_viavel(matriz_coeficientes, limites_superiores=None, vetor_b=None):
+    # Procura uma base inicial viável (x_B = B⁻¹ b >= 0 e dentro dos limites) sem variáveis artificiais, numa única passada
+    # pelos não nulos (formato CSC). Sem vetor_b, só servem as colunas da identidade sem limite superior (x_B = b).
+    # Com vetor_b entra o crash: colunas com um único não nulo de qualquer valor (folgas escalonadas, por exemplo) e depois
+    # colunas estruturais em forma triangular; as linhas que sobrarem ficam para as artificiais.
+    # Retorna (todas as linhas cobertas, colunas da base na ordem das linhas cobertas, linhas não cobertas)
+    matriz = matriz_coeficientes if isinstance(matriz_coeficientes, MatrizCSC) else MatrizCSC.de_densa(matriz_coeficientes)
+    num_linhas, num_colunas = matriz.shape
+    superiores = np.full(num_colunas, np.inf) if limites_superiores is None else np.asarray(limites_superiores, dtype=float)
+    cobertura = crash_base(matriz, superiores, vetor_b)
+    colunas_base = cobertura[cobertura >= 0].tolist()
+    colunas_nao_encontradas = np.nonzero(cobertura < 0)[0].tolist()
+    return not colunas_nao_encontradas, colunas_base, colunas_nao_encontradas
+
+def crash_base(matriz: MatrizCSC, superiores, vetor_b=None):
+    # Coluna que cobre cada linha na base inicial (-1 nas não cobertas).
+    # 1) Colunas singleton: a coluna j com único não nulo a na linha i vale b_i / a, que precisa ficar em [0, u_j].
+    #    As colunas da identidade têm preferência (e, entre elas, a de menor índice), como na busca original.
+    # 2) Crash triangular: uma coluna estrutural com um único não nulo nas linhas ainda não cobertas cobre essa linha
+    #    (vale b_i / a) se os seus outros não nulos estiverem em linhas de singletons que continuem em [0, u] depois do ajuste.
+    #    Cada coluna aceita tem a sua linha própria e zeros nas que ainda estavam livres, então a base é triangular.
+    num_linhas, num_colunas = matriz.shape
+    cobertura = np.full(num_linhas, -1)
+    contagem = np.diff(matriz.ponteiros)
+    singletons = np.nonzero(contagem == 1)[0]
+    linhas = matriz.indices[matriz.ponteiros[singletons]]
+    valores = matriz.dados[matriz.ponteiros[singletons]]
+    unitarias = np.isclose(valores, 1.0)
+    if vetor_b is None:
+        aceitas = unitarias & ~np.isfinite(superiores[singletons])
+        x = np.zeros(len(singletons))
+    else:
+        b = np.asarray(vetor_b, dtype=float)
+        x = b[linhas] / valores
+        aceitas = (x >= 0) & (x <= superiores[singletons])
+    singletons, linhas, valores, x = singletons[aceitas], linhas[aceitas], valores[aceitas], x[aceitas]
+    ordem = np.lexsort((singletons, ~unitarias[aceitas]))
+    linhas_cobertas, primeiras = np.unique(linhas[ordem], return_index=True)
+    escolhidas = ordem[primeiras]
+    cobertura[linhas_cobertas] = singletons[escolhidas]
+    if vetor_b is None or len(linhas_cobertas) == num_linhas:
+        return cobertura
+
+    # Valor e coeficiente da singleton de cada linha coberta (ajustados a cada coluna triangular aceita)
+    valor = np.full(num_linhas, np.nan)
+    coeficiente = np.full(num_linhas, np.nan)
+    valor[linhas_cobertas] = x[escolhidas]
+    coeficiente[linhas_cobertas] = valores[escolhidas]
+    limite = np.full(num_linhas, np.inf)
+    limite[linhas_cobertas] = superiores[cobertura[linhas_cobertas]]
+    usadas = np.zeros(num_colunas, dtype=bool)
+    usadas[cobertura[linhas_cobertas]] = True
+
+    # Colunas mais curtas primeiro, como nos crashes triangulares usuais
+    for j in np.argsort(contagem, kind="stable"):
+        if contagem[j] < 2 or usadas[j]:
+            continue
+        inicio, fim = matriz.ponteiros[j], matriz.ponteiros[j + 1]
+        linhas_j, valores_j = matriz.indices[inicio:fim], matriz.dados[inicio:fim]
+        livres = cobertura[linhas_j] < 0
+        if np.count_nonzero(livres) != 1:
+            continue
+        k = np.argmax(livres)
+        if abs(valores_j[k]) < TOLERANCIA_CRASH * np.max(np.abs(valores_j)):
+            continue
+        x_j = b[linhas_j[k]] / valores_j[k]
+        if x_j < 0 or x_j > superiores[j]:
+            continue
+        outras = linhas_j[~livres]
+        novos = valor[outras] - valores_j[~livres] * x_j / coeficiente[outras]  # nan nas linhas de colunas triangulares
+        if not np.all((novos >= 0) & (novos <= limite[outras])):
+            continue
+        valor[outras] = novos
+        cobertura[linhas_j[k]] = j
+        usadas[j] = True
+    return cobertura
+
+def valores_variaveis_originais(vetor_variaveis, x, deslocamentos=None, sinais_colunas=None):
+    # Converte a solução x da forma padrão (uma posição por coluna) para as variáveis do arquivo:
+    # x = deslocamento + z, ou x = -(deslocamento + z) nas variáveis x' (sinal -1). Só as primeiras len(sinais_colunas)
+    # colunas são do arquivo: folgas, excessos e artificiais vêm depois e não entram (sem sinais_colunas, todas entram)
+    if deslocamentos is None:
+        deslocamentos = np.zeros(len(vetor_variaveis))
+    if sinais_colunas is None:
+        sinais_colunas = np.ones(len(vetor_variaveis))
+    valores = {}
+    for var, valor, deslocamento, sinal in zip(map(str, vetor_variaveis), x, deslocamentos, sinais_colunas):
+        if sinal < 0:
+            valores[var[:-1]] = -(deslocamento + valor)  # Tira o ' de x'
+        else:
+            valores[var] = deslocamento + valor
+    return valores
 
 def variaveis_basicas(indices_colunas, vetor_variaveis):
     vetor_variaveis = vetor_variaveis.tolist()  # Converte para lista, se for um array NumPy
@@ -513,36 +504,46 @@ def variaveis_basicas(indices_colunas, vetor_variaveis):
 def adicionar_variavel_artificial(matriz_coeficientes, vetor_variaveis, restricoes, resultado, coef_objetivo, colunas_nao_encontradas):
     # Converte para lista para adicionar variáveis
     novas_variaveis = vetor_variaveis.tolist()
-    num_linhas = matriz_coeficientes.shape[0]
+    linhas_novas = []
 
-    # Inicializa matriz identidade para as variáveis de folga
-    identidade = np.zeros((num_linhas, 0))  # Começa sem colunas
+    nao_cobertas = set(colunas_nao_encontradas)
     variaveis_artificiais = []
     count = 0
     for i, restricao in enumerate(restricoes):
         if not resultado:
-            if restricao == '>=' or restricao == '>' or restricao == '=':
-                if i in colunas_nao_encontradas:
+            # Também nas linhas "<=": com o escalonamento, a folga pode não ser mais uma coluna unitária
+            if restricao in ('>=', '>', '=', '<=', '<'):
+                if i in nao_cobertas:
                     count += 1
-                    nova_coluna = np.zeros((num_linhas, 1))  # Cria nova coluna
-                    nova_coluna[i, 0] = 1  # Define o 1 na posição correta
-                    identidade = np.hstack((identidade, nova_coluna))  # Adiciona à matriz identidade
+                    linhas_novas.append(i)
                     # O índice da variável artificial será após as variáveis originais e de folga
                     indice_var_artificial = len(novas_variaveis)
                     variaveis_artificiais.append(indice_var_artificial)
                     
                     novas_variaveis.append(f"a_{count}")  # Adiciona a variável artificial
 
-                    # Adiciona 0 no vetor de coeficiente da função objetiva para a variável de excesso
-                    coef_objetivo = np.append(coef_objetivo, 0)
-
-    # Se pelo menos uma coluna foi adicionada, concatena com a matriz de coeficientes
-    if identidade.shape[1] > 0:
-        matriz_coeficientes = np.hstack((matriz_coeficientes, identidade))
+    # Adiciona 0 no vetor de coeficiente da função objetiva para as variáveis artificiais
+    coef_objetivo = np.concatenate((coef_objetivo, np.zeros(count)))
+    # Se pelo menos uma coluna foi adicionada, concatena com a matriz de coeficientes (colunas da identidade)
+    if linhas_novas:
+        matriz_coeficientes = concatenar_colunas(matriz_coeficientes, linhas_novas, 1.0)
 
     return matriz_coeficientes, np.array(novas_variaveis), coef_objetivo, variaveis_artificiais
 
-def gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, coeficientes_objetivo, vetor_variaveis, variaveis_livres, variaveis_sinais, tipo):
+def formatar_numero(valor):
+    return f"{int(valor) if float(valor).is_integer() else valor}"
+
+def formatar_limites(var, inferior, superior):
+    if not np.isfinite(inferior) and not np.isfinite(superior):
+        return f"{var} livre"
+    if not np.isfinite(inferior):
+        return f"{var} <= {formatar_numero(superior)}"
+    if not np.isfinite(superior):
+        return f"{var} >= {formatar_numero(inferior)}"
+    return f"{formatar_numero(inferior)} <= {var} <= {formatar_numero(superior)}"
+
+def gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, coeficientes_objetivo, vetor_variaveis, variaveis_livres, variaveis_sinais, tipo,
+                          limites=None):
     # Função objetivo
     objetivo = "max" if tipo else "min"
     objetivo_str = f"{objetivo} " + " + ".join(
@@ -553,20 +554,26 @@ def gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, coefic
 
     # Restrições
     restricoes_str = "s.a.\n"
+    # Na matriz esparsa, cada linha é densificada apenas no momento de ser escrita
+    linhas_matriz = matriz_coeficientes.transposta() if isinstance(matriz_coeficientes, MatrizCSC) else matriz_coeficientes
     for i in range(matriz_coeficientes.shape[0]):
+        linha_matriz = linhas_matriz[:, i] if isinstance(linhas_matriz, MatrizCSC) else linhas_matriz[i]
         restricao = " ".join(
             [f"+ {int(coef) if coef.is_integer() else coef}{var}" if coef >= 0 
             else f"- {-int(coef) if coef.is_integer() else -coef}{var}"
-            for coef, var in zip(matriz_coeficientes[i], vetor_variaveis)]
+            for coef, var in zip(linha_matriz, vetor_variaveis)]
         )
         operador = vetor_operadores[i]
         b_valor = vetor_b[i]
         restricoes_str += f"    {restricao} {operador} {b_valor}\n"
 
     variaveis_str = ""
-    for var in vetor_variaveis:
+    for k, var in enumerate(vetor_variaveis):
+        # Com os vetores de limites, cada variável é escrita com os seus limites
+        if limites is not None:
+            variaveis_str += formatar_limites(var, limites[0][k], limites[1][k]) + "\n"
         # Verifica se a variável é livre
-        if var in variaveis_livres:
+        elif var in variaveis_livres:
             variaveis_str += f"{var} livre\n"
         # Verifica se a variável é de sinal (não negativa)
         elif var in variaveis_sinais:
@@ -589,13 +596,10 @@ def gerar_formato_textual(matriz_coeficientes, vetor_operadores, vetor_b, coefic
 
     return f"{objetivo_str}\n{restricoes_str}{variaveis_str}"
 
-def vetor_coef_pl_auxiliar(vetor_variaveis):
-    coeficientes_objetivo = np.zeros(len(vetor_variaveis))
-
-    for i, var in enumerate(vetor_variaveis):
-        if var.startswith("a_"):  # Variáveis de folga e artificiais
-            coeficientes_objetivo[i] = 1
-
+def vetor_coef_pl_auxiliar(num_variaveis, variaveis_artificiais):
+    # Custo 1 nas artificiais (pelos índices das colunas, não pelos nomes) e 0 nas demais
+    coeficientes_objetivo = np.zeros(num_variaveis)
+    coeficientes_objetivo[list(variaveis_artificiais)] = 1
     return coeficientes_objetivo
 
 ########################################################################################################################################################################################################
@@ -608,9 +612,15 @@ def gerar_indices_ordenados(solucao_inicial, vetor_variaveis):
     indices.sort()
     return indices
 
+def indices_nao_base(num_colunas, base_indices):
+    # Complemento da base, em ordem crescente, por máscara (sem "i not in base_indices" para cada coluna)
+    na_base = np.zeros(num_colunas, dtype=bool)
+    na_base[np.asarray(base_indices, dtype=np.int64)] = True
+    return np.nonzero(~na_base)[0]
+
 def calcular_vetores_Cn_Cb(matriz_coeficientes, coef_objetivo, base_indices):
     num_linhas, num_colunas = matriz_coeficientes.shape
-    non_base_indices = [i for i in range(num_colunas) if i not in base_indices]
+    non_base_indices = indices_nao_base(num_colunas, base_indices)
     
     # Vetor Cb (coeficientes da função objetivo para as variáveis da base)
     Cb = coef_objetivo[base_indices]
@@ -621,88 +631,99 @@ def calcular_vetores_Cn_Cb(matriz_coeficientes, coef_objetivo, base_indices):
     return Cn, Cb
 
 def calcular_matrizes_B_N(matriz_coeficientes, base_indices):
-    # Matrizes B e N
-    B = matriz_coeficientes[:, base_indices]  # Colunas da base
-    non_base_indices = [i for i in range(matriz_coeficientes.shape[1]) if i not in base_indices]
-    N = matriz_coeficientes[:, non_base_indices]  # Colunas fora da base
+    # Matrizes B e N. A base é quadrada e vai para a fatoração LU densa; N não é copiada: é a partição por índices
+    # sobre a própria matriz (densa ou MatrizCSC), lida no lugar pela precificação e pelo teste da razão
+    non_base_indices = indices_nao_base(matriz_coeficientes.shape[1], base_indices)
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        B = matriz_coeficientes.colunas_densas(base_indices)
+    else:
+        B = matriz_coeficientes[:, base_indices]  # Colunas da base
+    N = ColunasNaoBasicas(matriz_coeficientes, non_base_indices)  # Colunas fora da base
     
     return B, N
 
-def verificar_otimalidade(B, N, Cb, Cn):
-    # Calcula B⁻¹ * N
-    try:
-        B_inv = np.linalg.inv(B)  # Inversa de B
-        # print("Inversa da matriz B:\n", B_inv)
-    except np.linalg.LinAlgError:
-        return False, None  # B não é invertível, indicando um problema na base
-
-    Cn_reduzido = Cn - np.dot(Cb @ B_inv, N)  # Fórmula Cn' - Cb * B⁻¹ * N
-
-    # Se todos os valores de Cn_reduzido são >= 0, a solução é ótima
-    return np.all(Cn_reduzido >= 0), Cn_reduzido
-
-def regra_bland(delta):
-    # Passo 2: Encontrar os índices para os quais delta < 0
-    indices_negativos = np.where(delta < 0)[0]
-    if len(indices_negativos) == 0:
-        return None  # Nenhuma variável pode entrar na base, solução ótima encontrada
-    # Passo 3: Se houver múltiplos, escolher a variável de entrada com a menor posição (menor índice)
-    j_entrada = min(indices_negativos)  # Regra de Bland: primeiro menor índice
-    return j_entrada
-
-def calcular_d_B(B_inv, N, j):
-    # Seleciona a j-ésima coluna de N
-    Nj = N[:, j]  # Coluna j de N
-    # Calcula d_B = -B_inv * Nj
-    d_B = -np.dot(B_inv, Nj)
-    # Verifica se todos os componentes de d_B são não negativos
-    if np.all(d_B >= 0):
-        print("Problema ilimitado")
-        return None
-    else:
-        # print("Problema não ilimitado")
-        return d_B
+def calcular_d_B(fatoracao, N, j):
+    # Calcula d_B = -B_inv * Nj pelo FTRAN: variação de x_B por unidade de avanço da variável que entra
+    return -fatoracao.ftran(N[:, j])
 
-def calcular_x_B(B_inv, b):
-    # Calcula x_B = B_inv * b
-    x_B = np.dot(B_inv, b)
+def calcular_x_B(fatoracao, b):
+    # Calcula x_B = B_inv * b pelo FTRAN
+    x_B = fatoracao.ftran(b)
     return x_B
 
-def calcular_t_star(x_B, d_B):
-    # Filtra os componentes de d_B que são negativos
-    indices_negativos = np.where(d_B < 0)[0]
-    if len(indices_negativos) == 0:
-        return False, False  # Caso não existam direções negativas, retorna infinito
-    # Calcula t* como o mínimo de -x_B[i] / d_B[i] para os componentes negativos de d_B
-    t_values = -x_B[indices_negativos] / d_B[indices_negativos]
-    # print("t_values:", t_values)
-    t_star = np.min(t_values)
-    k = indices_negativos[np.argmin(t_values)]
-    # print("k:", k)
-    return k, t_star
-
-def atualizar_B_N_C(j, k, B, N, C_B, C_N):    
-    # Atualiza a matriz B (substitui a coluna k pela coluna j de N)
-    B_atualizado = B.copy()
-    B_atualizado[:, k] = N[:, j]
-    
-    # Atualiza a matriz N (substitui a coluna j por aquela de B na posição k)
-    N_atualizado = N.copy()
-    N_atualizado[:, j] = B[:, k]
-    
-    # Atualiza os vetores C_B e C_N (substitui a variável que sai pela que entra)
-    C_B_atualizado = C_B.copy()
-    C_B_atualizado[k] = C_N[j]
-    
-    C_N_atualizado = C_N.copy()
-    C_N_atualizado[j] = C_B[k]
-    
-    return B_atualizado, N_atualizado, C_B_atualizado, C_N_atualizado
+def calcular_t_star(x_B, d_B, indices_base=None, superiores_B=None, livres_B=None, limite_entrada=np.inf):
+    # Teste da razão com limites: uma básica que diminui para em 0, uma que aumenta para no seu limite superior,
+    # as livres nunca bloqueiam e a variável que entra para no próprio limite (limite_entrada).
+    # Duas passadas (Harris): a primeira acha o maior passo com os limites folgados em TOLERANCIA_HARRIS e a segunda escolhe,
+    # entre as básicas que bloqueiam até esse passo, a de maior |d_B| (pivô mais estável, em vez do primeiro empate).
+    # Retorna (k, t*, k_no_superior); k None indica que a que entra só troca de limite (t* finito) ou que o PL é ilimitado (t* infinito)
+    razoes = np.full(len(d_B), np.inf)
+    folgadas = np.full(len(d_B), np.inf)
+    diminui = d_B < -TOLERANCIA_PIVO
+    if livres_B is not None:
+        diminui &= ~livres_B
+    razoes[diminui] = np.maximum(-x_B[diminui] / d_B[diminui], 0.0)
+    folgadas[diminui] = (TOLERANCIA_HARRIS - x_B[diminui]) / d_B[diminui]
+    aumenta = np.zeros(len(d_B), dtype=bool)
+    if superiores_B is not None:
+        aumenta = (d_B > TOLERANCIA_PIVO) & np.isfinite(superiores_B)
+        razoes[aumenta] = np.maximum((superiores_B[aumenta] - x_B[aumenta]) / d_B[aumenta], 0.0)
+        folgadas[aumenta] = (superiores_B[aumenta] + TOLERANCIA_HARRIS - x_B[aumenta]) / d_B[aumenta]
+    t_star = np.min(razoes) if len(razoes) else np.inf
+    if limite_entrada <= t_star:
+        return None, limite_entrada, False
+    if not np.isfinite(t_star):
+        return None, np.inf, False
+    if indices_base is None:
+        # Uma básica já fora do limite (razão 0) continua bloqueando na primeira passada
+        candidatos = np.nonzero(razoes <= np.min(np.maximum(folgadas, razoes)))[0]
+        k = candidatos[np.argmax(np.abs(d_B[candidatos]))]
+        t_star = razoes[k]
+    else:
+        # Regra de Bland: no empate, sai a variável básica de menor índice
+        empatados = np.nonzero(razoes <= t_star)[0]
+        k = empatados[np.argmin(np.asarray(indices_base)[empatados])]
+    return k, t_star, bool(aumenta[k])
+
+def inverter_colunas(N, posicoes):
+    # Troca o sinal das colunas de N nas posições dadas, no próprio lugar
+    if isinstance(N, ColunasNaoBasicas):
+        N.inverter(posicoes)
+    elif isinstance(N, MatrizCSC):
+        for j in posicoes:
+            N.dados[N.ponteiros[j]:N.ponteiros[j + 1]] *= -1
+    else:
+        N[:, posicoes] *= -1
+
+def anular_colunas(N, posicoes):
+    # Zera, no próprio lugar, as colunas de N nas posições dadas (custo reduzido 0: não entram mais na base)
+    if isinstance(N, ColunasNaoBasicas):
+        N.anular(posicoes)
+    elif isinstance(N, MatrizCSC):
+        for j in posicoes:
+            N.dados[N.ponteiros[j]:N.ponteiros[j + 1]] = 0.0
+    else:
+        N[:, posicoes] = 0.0
+
+def atualizar_B_N_C(j, k, B, N, C_B, C_N, coluna_saida=None):
+    # Troca, no próprio lugar, a coluna k de B pela coluna j de N (e os custos correspondentes).
+    # Com N implícita, a posição j de N só passa a apontar para coluna_saida (o índice, em A, da que sai da base): O(m) por pivô
+    if isinstance(N, ColunasNaoBasicas):
+        B[:, k] = N[:, j]
+        N.substituir(j, coluna_saida)
+    else:
+        saida = B[:, k].copy()
+        B[:, k] = N[:, j]
+        N[:, j] = saida
+
+    C_B[k], C_N[j] = C_N[j], C_B[k]
 
-def atualizar_indices_base(indices_base, j_entrada, k_saida):
-    indices_atualizados = indices_base.copy()  # Copia para evitar modificar o original
-    indices_atualizados[k_saida] = j_entrada   # Substitui a variável que saiu pela nova
-    return indices_atualizados
+    return B, N, C_B, C_N
+
+def atualizar_indices_base(indices_base, indices_nao_base, j_entrada, k_saida):
+    # A variável que sai da base ocupa, em N, a posição da que entrou
+    indices_base[k_saida], indices_nao_base[j_entrada] = indices_nao_base[j_entrada], indices_base[k_saida]
+    return indices_base, indices_nao_base
 
 def obter_Cn_Cb_N_B(problema: ProblemaPL, colunas_base):
     Cn, Cb = calcular_vetores_Cn_Cb(problema.matriz_coeficientes, problema.vetor_de_custos, colunas_base)
@@ -712,160 +733,534 @@ def obter_Cn_Cb_N_B(problema: ProblemaPL, colunas_base):
     # print("Vetor Cb:", Cb)
     # print("Matriz B:\n", B)
     # print("Matriz N:\n", N)
-    xB = np.dot(np.linalg.inv(B), problema.vetor_b)
-    solucao = np.dot(Cb.T, xB)
-    # print("Colunas que formam a base:", solucao_0, " = ", xB)
-    # print("Custo atual da solução: ", solucao)
     return B, N, Cb, Cn
 
-def verificar_artificiais_na_base(B, variaveis_artificiais, B_inv, vetor_b):
-    # Calcula os valores das variáveis básicas
-    x_B = np.dot(B_inv, vetor_b)
+def verificar_artificiais_na_base(B, variaveis_artificiais, x_B, registro=None):
+    registro = obter_registro(registro)
+    # x_B: valores das variáveis básicas ao fim da Fase I
     # print("x_B", x_B)
     # Identifica quais variáveis artificiais ainda estão na base
     artificiais_na_base = []
     # Vamos iterar sobre as variáveis artificiais
-    for i, var in enumerate(variaveis_artificiais):
-        # Verifica se a variável i (associada ao índice da variável artificial) está na base
+    for i in variaveis_artificiais:
+        # i é a posição da variável artificial na base
         if i < B.shape[1]:  # Assegura que estamos dentro dos limites das colunas de B
             artificiais_na_base.append(i)
     # Verifica se não há variáveis artificiais na base
     # print("artificiais_na_base", artificiais_na_base)
     if not artificiais_na_base:
-        print("Nenhuma variável artificial na base.\nO PL original é viável!")
+        registro("Nenhuma variável artificial na base.\nO PL original é viável!")
         return "viável"
     # Verifica o valor das variáveis artificiais
     for indice_var in artificiais_na_base:
         valor_var = x_B[indice_var]  # Valor da variável artificial na solução básica
-        if valor_var > 0:
-            print(f"Problema inviável! A variável artificial {variaveis_artificiais[indice_var]} está na base com valor positivo ({valor_var}).")
+        if valor_var > TOLERANCIA_PIVO:
+            registro(f"Problema inviável! A variável artificial na posição {indice_var} da base tem valor positivo ({valor_var}).")
             return "inviável"
-    print("Variáveis artificiais estão na base, mas todas com valor zero. Podemos removê-las antes da Fase II.")
+    registro("Variáveis artificiais estão na base, mas todas com valor zero. Podemos removê-las antes da Fase II.")
     return "remover"
 
-def remover_artificiais(B, N, Cb, Cn, vetor_b, variaveis_artificiais):
-    # Encontra as variáveis artificiais que ainda estão na base
-    artificiais_na_base = [i for i, col in enumerate(B.T) if i in variaveis_artificiais]
+def remover_artificiais(estado, artificiais, registro=None):
+    # Tira da base, por pivôs degenerados na própria fatoração, as artificiais que terminaram a Fase I em zero:
+    # a artificial da posição k sai no lugar de uma coluna não básica (não artificial) com (B⁻¹ N)_kj != 0.
+    # Os valores das variáveis não mudam. Se nenhuma coluna serve, a linha é redundante e a artificial fica na base
+    # (fixa em 0). Retorna as posições da base que continuaram com artificiais.
+    registro = obter_registro(registro)
+    artificiais = set(artificiais)
+    eh_artificial_N = np.array([coluna in artificiais for coluna in estado.colunas_nao_base])
+    restantes = []
+    for k in range(len(estado.colunas_base)):
+        if estado.colunas_base[k] not in artificiais:
+            continue
+        e_k = np.zeros(len(estado.colunas_base))
+        e_k[k] = 1.0
+        linha = estado.fatoracao.btran(e_k) @ estado.N  # Linha k de B⁻¹ N
+        linha[eh_artificial_N] = 0.0
+        j = int(np.argmax(np.abs(linha))) if len(linha) else 0
+        if len(linha) == 0 or abs(linha[j]) <= TOLERANCIA_PIVO:
+            registro(f"A artificial da posição {k} da base fica em zero (linha redundante)")
+            restantes.append(k)
+            continue
+        registro(f"Substituindo a artificial da posição {k} da base pela coluna {estado.colunas_nao_base[j]}")
+        # alpha = B⁻¹ a_j com a coluna no sinal original, como no pivô do simplex
+        alpha = -calcular_d_B(estado.fatoracao, estado.N, j) * estado.sentido[j]
+        if estado.sentido[j] < 0:
+            inverter_colunas(estado.N, [j])
+            estado.Cn[j] *= -1
+        atualizar_B_N_C(j, k, estado.B, estado.N, estado.Cb, estado.Cn, estado.colunas_base[k])
+        estado.fatoracao.atualizar(k, alpha)
+        atualizar_indices_base(estado.colunas_base, estado.colunas_nao_base, j, k)
+        # A artificial que saiu fica em N, em zero
+        estado.valores_N[j] = 0.0
+        estado.sentido[j] = 1.0
+        estado.livres_N[j] = False
+        eh_artificial_N[j] = True
+    return restantes
 
-    if not artificiais_na_base:
-        print("Nenhuma variável artificial na base. Pronto para a Fase II.")
-        return B, N, Cb, Cn, vetor_b  # Nenhuma mudança necessária
-
-    print(f"Variáveis artificiais na base: {artificiais_na_base}. Iniciando remoção...")
-
-    for i in artificiais_na_base:
-        # Tenta encontrar uma variável não-básica para entrar no lugar da artificial
-        for j, coluna_N in enumerate(N.T):
-            if coluna_N[i] != 0:  # Se a coluna permitir pivotear
-                print(f"Substituindo variável artificial {i} por variável {j}")
-                
-                # Troca a variável artificial pela variável não-básica correspondente
-                B[:, i] = coluna_N
-                Cb[i] = Cn[j]
-
-                # Atualiza as matrizes removendo a variável artificial e ajustando o vetor_b
-                N = np.delete(N, j, axis=1)  # Remove a variável escolhida de N
-                Cn = np.delete(Cn, j)  # Remove seu custo de Cn
-                
-                break
-    print("Remoção concluída. Pronto para a Fase II.")
-    return B, N, Cb, Cn, vetor_b
-
-def metodo_simplex(B, N, Cb, Cn, vetor_b, vetor_variaveis, colunas_base, iteracao):
-    iteracao = iteracao + 1
-    print("\n------------------------------------------------------------------------------------------------------------------------------------------------------------")
-    
-    print("\nIteração:", iteracao)
-    otimalidade, custos_reduzidos = verificar_otimalidade(B, N, Cb, Cn)
-    xB = np.dot(np.linalg.inv(B), vetor_b)
-    solucao = np.dot(Cb.T, xB)
-    print("Custo atual da solução: ", solucao)
-
-    solucao = variaveis_basicas(colunas_base, vetor_variaveis)
-    print("Colunas que formam a base:", solucao, " = ", xB)
-    indices_artificiais = [i for i, var in enumerate(vetor_variaveis) if var.startswith("a_")]
-
-    if otimalidade:
-        B_inv = np.linalg.inv(B)  
-        xB = np.dot(B_inv, vetor_b)
-        Z_otimo = np.dot(Cb.T, xB)
-        if indices_artificiais:
-            print("\033[32mSolução ótima do PL extra:\033[0m", Z_otimo)
-        else:
-            print("\033[32mSolução ótima do PL original:\033[0m", Z_otimo)
-        
-        return Z_otimo, B, colunas_base, solucao
+@dataclass
+class EstadoSimplex:
+    # Estado do simplex revisado entre chamadas (da Fase I para a Fase II): base e não básicas com a fatoração viva,
+    # as não básicas no limite superior (sentido = -1, colunas e custos com o sinal trocado) e os limites das colunas.
+    # B, N, Cb e Cn são atualizados no próprio lugar a cada pivô.
+    B: np.ndarray
+    N: ColunasNaoBasicas  # Partição por índices sobre A: só os índices mudam a cada pivô
+    Cb: np.ndarray
+    Cn: np.ndarray
+    colunas_base: list
+    colunas_nao_base: list
+    fatoracao: FatoracaoLU
+    livres: np.ndarray  # Por coluna
+    superiores: np.ndarray  # Por coluna
+    sentido: np.ndarray  # Por posição de N
+    valores_N: np.ndarray  # Por posição de N: 0 ou o limite superior
+    livres_N: np.ndarray  # Por posição de N
+
+    @property
+    def tem_superiores(self):
+        return bool(np.any(np.isfinite(self.superiores)))
+
+    def trocar_custos(self, vetor_de_custos):
+        # Novos custos para a mesma base (Fase II): as colunas com sentido -1 continuam com o custo negado
+        vetor_de_custos = np.asarray(vetor_de_custos, dtype=float)
+        self.Cb = vetor_de_custos[self.colunas_base]
+        self.Cn = vetor_de_custos[self.colunas_nao_base] * self.sentido
+
+def iniciar_estado(B, N, Cb, Cn, colunas_base, fatoracao=None, limites=None, x_inicial=None):
+    # B, Cb e Cn são copiados uma única vez; de N (ColunasNaoBasicas) só a partição é copiada, A é compartilhada
+    colunas_base = list(colunas_base)
+    num_colunas = B.shape[1] + N.shape[1]
+    if not isinstance(N, ColunasNaoBasicas):
+        # N explícita (densa ou MatrizCSC): monta A uma vez, na ordem original das colunas
+        matriz = np.zeros((B.shape[0], num_colunas))
+        matriz[:, colunas_base] = B
+        matriz[:, indices_nao_base(num_colunas, colunas_base)] = N.toarray() if isinstance(N, MatrizCSC) else N
+        N = ColunasNaoBasicas(matriz, indices_nao_base(num_colunas, colunas_base))
+    B, N, Cb, Cn = B.copy(), N.copy(), Cb.copy(), Cn.copy()
+    colunas_nao_base = N.indices.tolist()
+    if limites is None:
+        livres = np.zeros(num_colunas, dtype=bool)
+        superiores = np.full(num_colunas, np.inf)
     else:
-        print("\033[31mA solução não é ótima.\033[0m")
-        solucao_0 = variaveis_basicas(colunas_base, vetor_variaveis)
-
-        j_entrada = regra_bland(custos_reduzidos)
-        print("Índice da coluna da matriz N que entrará na base:", j_entrada)
-        B_inv = np.linalg.inv(B)
-        x_B = calcular_x_B(B_inv, vetor_b)
-        d_B = calcular_d_B(B_inv, N, j_entrada)
-        k_saida, t_star = calcular_t_star(x_B, d_B)
-        print("Índice da coluna da matriz B que sairá da base:", k_saida)
-
-        B_atualizado, N_atualizado, C_B_atualizado, C_N_atualizado = atualizar_B_N_C(j_entrada, k_saida, B, N, Cb, Cn)
-        B_inv = np.linalg.inv(B_atualizado)
-        colunas_base = atualizar_indices_base(colunas_base, j_entrada, k_saida)
-
-        return metodo_simplex(B_atualizado, N_atualizado, C_B_atualizado, C_N_atualizado, vetor_b, vetor_variaveis, colunas_base, iteracao)
-
-def metodo_das_duas_fases(resultado, problema: ProblemaPL):
-    resultado0, colunas_base, colunas_nao_encontradas = possui_solucao_basica_viavel(problema.matriz_coeficientes)
-    # Salva os valores do PL original
-    vetor_de_custos_original = problema.vetor_de_custos
-    vetor_variaveis_original = problema.vetor_variaveis
-    matriz_coeficientes_original = problema.matriz_coeficientes 
-
-    print("\nNão há solução básica inicial viável visível. \nNecessita de um PL extra.\n")
-    print(" PL extra: \n")
-    matriz_tratada_aux, novas_variaveis, vetor_coef_tratado_aux, variaveis_artificiais = adicionar_variavel_artificial(problema.matriz_coeficientes, problema.vetor_variaveis, problema.vetor_operadores, resultado, problema.vetor_de_custos, colunas_nao_encontradas)
-    coef_obj_aux = vetor_coef_pl_auxiliar(novas_variaveis)
-    resultado = gerar_formato_textual(matriz_tratada_aux, problema.vetor_operadores_novo, problema.vetor_b, coef_obj_aux, novas_variaveis, [], [], 0)
-    print(resultado)
-
-    ProblemaPL.vetor_variaveis = novas_variaveis
-    ProblemaPL.vetor_de_custos = coef_obj_aux
-    ProblemaPL.matriz_coeficientes = matriz_tratada_aux
-    ProblemaPL.vetor_b = problema.vetor_b
-    PL_aux = ProblemaPL
-
-    # resultado_original = gerar_formato_textual(problema.matriz_coeficientes, problema.vetor_operadores, problema.vetor_b, problema.vetor_de_custos, problema.vetor_variaveis, [], [], 0)
-    # print(resultado_original)
-    resultado2, colunas_base, colunas_nao_encontradas = possui_solucao_basica_viavel(matriz_tratada_aux)
-    B, N, Cb, Cn = obter_Cn_Cb_N_B(PL_aux, colunas_base)
-    Z_otimo, B_aux, colunas_base, solucao = metodo_simplex(B, N, Cb, Cn, PL_aux.vetor_b, PL_aux.vetor_variaveis, colunas_base, 0)
-
-    indices_artificiais = [i for i, var in enumerate(solucao) if var.startswith("a_")]
-    if Z_otimo == 0:
-        resultado = verificar_artificiais_na_base(B_aux, indices_artificiais, np.linalg.inv(B_aux), PL_aux.vetor_b)
-        if resultado == "viável":
-            print("\n------------------------------------------------------------------------------------------------------------------------------------------------------------")
-            print("\nIniciando Fase II...")
-
-            PL_aux.vetor_de_custos = vetor_de_custos_original
-            PL_aux.vetor_variaveis = vetor_variaveis_original
-            PL_aux.matriz_coeficientes = matriz_coeficientes_original
-
-            B, N, Cb, Cn = obter_Cn_Cb_N_B(PL_aux, colunas_base)
-
-            metodo_simplex(B, N, Cb, Cn, PL_aux.vetor_b, PL_aux.vetor_variaveis, colunas_base, 0)  # Chama a Fase II
-        elif resultado == "remover":
-            print("Removendo variáveis artificiais da base antes da Fase II...")
-            B, N, Cb, Cn, vetor_b = remover_artificiais(B, N, Cb, Cn, PL_aux.vetor_b, indices_artificiais)
-            PL_aux.vetor_de_custos = vetor_de_custos_original
-            PL_aux.vetor_variaveis = vetor_variaveis_original
-            PL_aux.matriz_coeficientes = matriz_coeficientes_original
-            print("Iniciando Fase II do Simplex...")
-            metodo_simplex(B, N, Cb, Cn, problema.vetor_b, problema.vetor_variaveis, colunas_base, 0)
+        livres = ~np.isfinite(np.asarray(limites[0], dtype=float))
+        superiores = np.array(limites[1], dtype=float)
+    sentido = np.ones(len(colunas_nao_base))
+    valores_N = np.zeros(len(colunas_nao_base))
+    if x_inicial is not None and np.any(np.isfinite(superiores)):
+        no_superior = np.isfinite(superiores[colunas_nao_base]) & (np.asarray(x_inicial)[colunas_nao_base] != 0)
+        valores_N[no_superior] = superiores[colunas_nao_base][no_superior]
+        sentido[no_superior] = -1.0
+        inverter_colunas(N, np.nonzero(no_superior)[0])
+        Cn[no_superior] *= -1
+    # A fatoração LU da base é criada uma vez e depois apenas atualizada a cada pivô
+    if fatoracao is None:
+        fatoracao = FatoracaoLU(B)
+    return EstadoSimplex(B, N, Cb, Cn, colunas_base, colunas_nao_base, fatoracao, livres, superiores, sentido, valores_N,
+                         livres[colunas_nao_base])
+
+def metodo_simplex(B, N, Cb, Cn, vetor_b, vetor_variaveis, colunas_base, iteracao=0, fatoracao=None,
+                   max_iter=None, time_limit=None, cutoff=None, regra=None, limites=None, x_inicial=None,
+                   registro=None, estatisticas=None, instrumentacao=None, perturbar=True):
+    # Laço do simplex revisado. B, Cb e Cn são copiados uma única vez e depois atualizados no próprio lugar, e N é a
+    # partição por índices sobre A (calcular_matrizes_B_N): um pivô move O(m) valores, não as colunas de N.
+    #   max_iter: número máximo de pivôs
+    #   time_limit: tempo máximo em segundos
+    #   cutoff: interrompe assim que o custo da solução atual for <= cutoff
+    #   regra: regra de precificação ("dantzig", "parcial", "devex", "steepest", "bland" ou uma RegraPrecificacao)
+    #   limites: (inferiores, superiores) de cada coluna, com inferior 0 ou -inf (livre), como na forma padrão
+    #   x_inicial: valores das colunas; só os das não básicas são usados (0 ou o limite superior)
+    #   registro: destino das mensagens (None imprime; REGISTRO_SILENCIOSO não formata nada)
+    #   estatisticas: dicionário em que o número de pivôs é somado em "iteracoes"
+    #   instrumentacao: Instrumentacao que recebe os tempos e os dados de cada pivô (e pode interromper pelo callback)
+    #   perturbar: perturba o lado direito quando o simplex estagna em pivôs degenerados (ver iterar_simplex)
+    # Retorna (status, Z, B, colunas_base, solucao, x), com x o valor de todas as colunas.
+    estado = iniciar_estado(B, N, Cb, Cn, colunas_base, fatoracao, limites, x_inicial)
+    return iterar_simplex(estado, vetor_b, vetor_variaveis, iteracao, max_iter=max_iter, time_limit=time_limit, cutoff=cutoff,
+                          regra=regra, registro=registro, estatisticas=estatisticas, instrumentacao=instrumentacao,
+                          perturbar=perturbar)
+
+def inviabilidades(estado: EstadoSimplex, xB, y):
+    # Maior violação dos limites das básicas e maior custo reduzido com o sinal errado entre as não básicas
+    # (uma livre fora da base com custo reduzido não nulo conta pelo módulo). Só usada pela instrumentação
+    indices_base = np.asarray(estado.colunas_base, dtype=int)
+    violacao = np.maximum(-xB, xB - estado.superiores[indices_base])
+    violacao[estado.livres[indices_base]] = 0.0
+    d = estado.Cn - y @ estado.N
+    d = np.where(estado.livres_N, np.abs(d), -d)
+    return max(float(np.max(violacao, initial=0.0)), 0.0), max(float(np.max(d, initial=0.0)), 0.0)
+
+def perturbar_lado_direito(estado: EstadoSimplex, vetor_b, xB, semente=0):
+    # b + B ε: cada básica se afasta do limite mais próximo por ε_i ~ PERTURBACAO_RELATIVA (1 + |x_B[i]|), com ε aleatório,
+    # e as razões empatadas em 0 do teste da razão (a causa dos pivôs degenerados) deixam de empatar
+    indices_base = np.asarray(estado.colunas_base, dtype=int)
+    superiores_B = estado.superiores[indices_base]
+    epsilon = PERTURBACAO_RELATIVA * (1.0 + np.abs(xB)) * np.random.default_rng(semente).uniform(1.0, 2.0, len(xB))
+    epsilon[xB > superiores_B / 2] *= -1  # Mais perto do limite superior: desce
+    epsilon[estado.livres[indices_base] | (superiores_B < 2 * np.abs(epsilon))] = 0.0  # Livres e intervalos estreitos ficam como estão
+    return vetor_b + estado.B @ epsilon
+
+def retirar_perturbacao(estado: EstadoSimplex, vetor_b, registro, max_pivos=None):
+    # Volta ao b original depois do ótimo do problema perturbado. Os custos não mudaram, então a base continua dual viável;
+    # as básicas que ficaram um pouco fora dos limites são corrigidas pelo simplex dual com limites (a mais violada sai,
+    # no limite que violou, e entra a não básica do teste da razão dual). Retorna o número de pivôs, ou None se uma linha
+    # não pode ser corrigida ou se max_pivos foi atingido. O b original era viável antes da perturbação, então None é falha
+    # numérica, nunca inviabilidade do PL
+    B, N, Cb, Cn = estado.B, estado.N, estado.Cb, estado.Cn
+    colunas_base, colunas_nao_base, fatoracao = estado.colunas_base, estado.colunas_nao_base, estado.fatoracao
+    livres, superiores, sentido, valores_N, livres_N = estado.livres, estado.superiores, estado.sentido, estado.valores_N, estado.livres_N
+    pivos = 0
+    while max_pivos is None or pivos < max_pivos:
+        if fatoracao.precisa_refatorar:
+            fatoracao.refatorar(B)
+        b_atual = vetor_b - N @ (sentido * valores_N) if np.any(valores_N) else vetor_b
+        xB = calcular_x_B(fatoracao, b_atual)
+        indices_base = np.asarray(colunas_base, dtype=int)
+        abaixo = np.where(livres[indices_base], 0.0, -xB)
+        acima = xB - superiores[indices_base]
+        violacao = np.maximum(abaixo, acima)
+        r = int(np.argmax(violacao)) if len(violacao) else 0
+        if len(violacao) == 0 or violacao[r] <= TOLERANCIA_PRIMAL:
+            return pivos
+
+        d = np.maximum(Cn - fatoracao.btran(Cb) @ N, 0.0)  # Dual viável: >= 0 a menos de erro numérico
+        e_r = np.zeros(len(colunas_base))
+        e_r[r] = 1.0
+        linha = fatoracao.btran(e_r) @ N
+        # x_r varia de -linha[j] por unidade de avanço da não básica j: abaixo do limite, entra uma com linha[j] < 0; acima, > 0.
+        # As livres entram no sentido que servir; as fixas (limite superior 0) nunca entram
+        sinal = -1.0 if abaixo[r] >= acima[r] else 1.0
+        fixas = superiores[np.asarray(colunas_nao_base, dtype=int)] <= 0.0
+        candidatos = np.nonzero(((sinal * linha > TOLERANCIA_PIVO) | (livres_N & (np.abs(linha) > TOLERANCIA_PIVO))) & ~fixas)[0]
+        if len(candidatos) == 0:
+            registro("A perturbação não pôde ser retirada: a linha", r, "não tem como voltar ao limite")
+            return None
+        razoes = np.where(livres_N[candidatos], 0.0, d[candidatos]) / np.abs(linha[candidatos])
+        empatados = candidatos[razoes <= razoes.min() + 1e-12]
+        j = empatados[np.argmax(np.abs(linha[empatados]))]
+        if livres_N[j] and sinal * linha[j] < 0:
+            inverter_colunas(N, [j])
+            Cn[j] *= -1
+            sentido[j] *= -1
+
+        alpha = calcular_x_B(fatoracao, N[:, j]) * sentido[j]
+        if sentido[j] < 0:
+            inverter_colunas(N, [j])
+            Cn[j] *= -1
+        coluna_saida = colunas_base[r]
+        atualizar_B_N_C(j, r, B, N, Cb, Cn, coluna_saida)
+        fatoracao.atualizar(r, alpha)
+        atualizar_indices_base(colunas_base, colunas_nao_base, j, r)
+        # A que saiu fica no limite que violava
+        livres_N[j] = livres[coluna_saida]
+        if sinal > 0:
+            valores_N[j] = superiores[coluna_saida]
+            sentido[j] = -1.0
+            inverter_colunas(N, [j])
+            Cn[j] *= -1
+        else:
+            valores_N[j] = 0.0
+            sentido[j] = 1.0
+        pivos += 1
+    return None
+
+def copiar_base(estado: EstadoSimplex):
+    # Cópia da base e da partição das não básicas (A continua compartilhada), para voltar a ela com restaurar_base
+    return (estado.B.copy(), estado.N.copy(), estado.Cb.copy(), estado.Cn.copy(), list(estado.colunas_base),
+            list(estado.colunas_nao_base), estado.sentido.copy(), estado.valores_N.copy(), estado.livres_N.copy())
+
+def restaurar_base(estado: EstadoSimplex, copia):
+    # Volta à base copiada no próprio lugar (o laço do simplex guarda referências aos arrays do estado) e refatora
+    B, N, Cb, Cn, colunas_base, colunas_nao_base, sentido, valores_N, livres_N = copia
+    estado.B[:], estado.Cb[:], estado.Cn[:] = B, Cb, Cn
+    estado.N.indices, estado.N.multiplicador, estado.N.posicao = N.indices.copy(), N.multiplicador.copy(), N.posicao.copy()
+    estado.colunas_base[:], estado.colunas_nao_base[:] = colunas_base, colunas_nao_base
+    estado.sentido[:], estado.valores_N[:], estado.livres_N[:] = sentido, valores_N, livres_N
+    estado.fatoracao.refatorar(estado.B)
+
+def iterar_simplex(estado: EstadoSimplex, vetor_b, vetor_variaveis, iteracao=0, max_iter=None, time_limit=None, cutoff=None,
+                   regra=None, registro=None, estatisticas=None, pl_extra=False, instrumentacao=None, fase="simplex",
+                   perturbar=True):
+    # Pivota a partir do estado (que é atualizado no próprio lugar) até a otimalidade ou um limite.
+    # Uma não básica no limite superior fica em N e Cn com o sinal trocado (sentido = -1): assim a regra de precificação
+    # continua procurando custo reduzido negativo, e a variável entra diminuindo.
+    # Degenerescência: o teste da razão é o de Harris; depois de LIMITE_ESTAGNACAO pivôs degenerados seguidos o lado direito
+    # é perturbado (uma vez, se perturbar), e a perturbação é retirada no ótimo pelo simplex dual (se o simplex dual não
+    # conseguir, o simplex volta à base do momento da perturbação, viável para o b original, e segue sem perturbar); se ainda assim
+    # LIMITE_PIVOS_DEGENERADOS pivôs degenerados se seguirem, a regra de Bland assume até um pivô não degenerado.
+    # pl_extra: só muda a mensagem final (True na Fase I)
+    # fase: nome da fase nas IteracaoSimplex da instrumentação
+    registro = obter_registro(registro)
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    medir = instrumentacao.ativa  # Desligada, nenhum relógio é lido dentro do laço
+    B, N, Cb, Cn = estado.B, estado.N, estado.Cb, estado.Cn
+    colunas_base, colunas_nao_base = estado.colunas_base, estado.colunas_nao_base
+    fatoracao, livres, superiores = estado.fatoracao, estado.livres, estado.superiores
+    sentido, valores_N, livres_N = estado.sentido, estado.valores_N, estado.livres_N
+    tem_superiores = estado.tem_superiores
+    num_colunas = len(livres)
+
+    def montar_x(xB):
+        x = np.zeros(num_colunas)
+        x[colunas_nao_base] = valores_N
+        x[colunas_base] = xB
+        return x
+
+    def lado_direito():
+        # b descontando as não básicas que estão no limite superior: b - N x_N
+        return vetor_b - N @ (sentido * valores_N) if tem_superiores and np.any(valores_N) else vetor_b
+
+    def interromper(status, xB, Z):
+        # Retorno antes do ótimo: com o lado direito perturbado, x e Z são recalculados com o b original
+        if perturbado:
+            xB = calcular_x_B(fatoracao, vetor_b_original - N @ (sentido * valores_N) if tem_superiores else vetor_b_original)
+            Z = np.dot(Cb, xB) + np.dot(Cn, sentido * valores_N)
+        return status, Z, B, colunas_base, variaveis_basicas(colunas_base, vetor_variaveis), montar_x(xB)
+
+    regra = criar_regra(regra)
+    regra.iniciar(fatoracao, N)
+    # Bland só entra como proteção contra ciclagem, depois de muitos pivôs degenerados seguidos
+    regra_bland = RegraBland()
+    pivos_degenerados = 0
+    vetor_b_original = vetor_b
+    perturbado = False
+
+    inicio = time.perf_counter()
+    pivos = 0
+    while True:
+        iteracao = iteracao + 1
+        registro("\n------------------------------------------------------------------------------------------------------------------------------------------------------------")
+
+        registro("\nIteração:", iteracao)
+        if medir:
+            relogio_inicio = time.perf_counter()
+        if fatoracao.precisa_refatorar:
+            fatoracao.refatorar(B)
+            if medir:
+                instrumentacao.somar("refatoracoes")
+        b_atual = lado_direito()
+        xB = calcular_x_B(fatoracao, b_atual)
+        if not fatoracao.residuo_aceitavel(B, xB, b_atual):
+            # As atualizações acumularam erro numérico: refatora a base do zero
+            fatoracao.refatorar(B)
+            xB = calcular_x_B(fatoracao, b_atual)
+            if medir:
+                instrumentacao.somar("refatoracoes")
+        if perturbar and pivos_degenerados >= LIMITE_ESTAGNACAO:
+            # Estagnação: perturba o lado direito (uma vez) e recomeça a contagem antes de recorrer a Bland
+            registro("Estagnação em", pivos_degenerados, "pivôs degenerados: perturbando o lado direito")
+            base_sem_perturbacao = copiar_base(estado)
+            vetor_b = perturbar_lado_direito(estado, vetor_b, xB)
+            perturbar, perturbado, pivos_degenerados = False, True, 0
+            b_atual = lado_direito()
+            xB = calcular_x_B(fatoracao, b_atual)
+            if medir:
+                instrumentacao.somar("perturbacoes")
+        if medir:
+            relogio_fatoracao = time.perf_counter()
+        # Variáveis duais pelo BTRAN: y^T = Cb^T B⁻¹
+        y = fatoracao.btran(Cb)
+        if np.any(livres_N):
+            # Uma livre fora da base pode entrar nos dois sentidos: orienta a coluna pelo sinal do custo reduzido
+            posicoes = np.nonzero(livres_N)[0]
+            colunas_livres = N.colunas_densas(posicoes) if isinstance(N, MatrizCSC) else N[:, posicoes]
+            virar = posicoes[Cn[posicoes] - y @ colunas_livres > TOLERANCIA_PIVO]
+            inverter_colunas(N, virar)
+            Cn[virar] *= -1
+            sentido[virar] *= -1
+        usar_bland = pivos_degenerados >= LIMITE_PIVOS_DEGENERADOS
+        j_entrada = (regra_bland if usar_bland else regra).escolher(y, N, Cn, colunas_nao_base)
+        otimalidade = j_entrada is None
+        if medir:
+            relogio_precificacao = time.perf_counter()
+        Z = np.dot(Cb.T, xB) + np.dot(Cn, sentido * valores_N)
+        registro("Custo atual da solução: ", Z)
+        registro("Colunas que formam a base:", lambda: variaveis_basicas(colunas_base, vetor_variaveis), " = ", xB)
+
+        if otimalidade and perturbado:
+            # Ótimo do problema perturbado: volta ao b original e corrige as básicas fora dos limites pelo simplex dual
+            registro("Ótimo do problema perturbado: retirando a perturbação")
+            vetor_b, perturbado = vetor_b_original, False
+            pivos_duais = retirar_perturbacao(estado, vetor_b, registro, max_pivos=10 * len(colunas_base) + 100)
+            if pivos_duais is None:
+                # Falha numérica ou limite de pivôs, não inviabilidade: a base de antes da perturbação era viável
+                registro("Voltando à base de antes da perturbação, sem perturbar")
+                restaurar_base(estado, base_sem_perturbacao)
+                regra.iniciar(fatoracao, N)
+                pivos_degenerados = 0
+                continue
+            if estatisticas is not None:
+                estatisticas["iteracoes"] = estatisticas.get("iteracoes", 0) + pivos_duais
+            if medir:
+                instrumentacao.somar("pivos_duais", pivos_duais)
+            # Os pivôs duais trocaram a base fora da regra: os pesos dela (Devex) são do referencial antigo
+            regra.iniciar(fatoracao, N)
+            pivos_degenerados = 0
+            continue  # Recalcula x_B e os duais com o b original e confere a otimalidade
+        if otimalidade:
+            if pl_extra:
+                registro("\033[32mSolução ótima do PL extra:\033[0m", Z)
+            else:
+                registro("\033[32mSolução ótima do PL original:\033[0m", Z)
+            return STATUS_OTIMO, Z, B, colunas_base, variaveis_basicas(colunas_base, vetor_variaveis), montar_x(xB)
+
+        registro("\033[31mA solução não é ótima.\033[0m")
+        if cutoff is not None and Z <= cutoff:
+            registro("Custo atingiu o limite informado:", cutoff)
+            return interromper(STATUS_LIMITE_OBJETIVO, xB, Z)
+        if max_iter is not None and pivos >= max_iter:
+            registro("Limite de iterações atingido:", max_iter)
+            return interromper(STATUS_LIMITE_ITERACOES, xB, Z)
+        if time_limit is not None and time.perf_counter() - inicio >= time_limit:
+            registro("Limite de tempo atingido:", time_limit)
+            return interromper(STATUS_LIMITE_TEMPO, xB, Z)
+        if instrumentacao.interrompido:
+            registro("Resolução interrompida pelo callback")
+            return interromper(STATUS_INTERROMPIDO, xB, Z)
+
+        registro("Índice da coluna da matriz N que entrará na base:", j_entrada)
+        coluna_entrada = colunas_nao_base[j_entrada]
+        d_B = calcular_d_B(fatoracao, N, j_entrada)
+        limite_entrada = np.inf if livres[coluna_entrada] else superiores[coluna_entrada]
+        indices_base = np.asarray(colunas_base, dtype=int)
+        k_saida, t_star, saida_no_superior = calcular_t_star(
+            xB, d_B, colunas_base if usar_bland else None,
+            superiores[indices_base] if tem_superiores else None, livres[indices_base], limite_entrada,
+        )
+        pivos_degenerados = pivos_degenerados + 1 if t_star <= TOLERANCIA_PIVO else 0
+        pivos += 1
+        if estatisticas is not None:
+            estatisticas["iteracoes"] = estatisticas.get("iteracoes", 0) + 1
+        if medir:
+            relogio_razao = time.perf_counter()
+            # Medidos com a base antes do pivô; o passo de fatoração do pivô é somado abaixo
+            inviabilidade_primal, inviabilidade_dual = inviabilidades(estado, xB, y)
+            iteracao_medida = IteracaoSimplex(
+                fase, iteracao, coluna_entrada, None if k_saida is None else colunas_base[k_saida], float(t_star),
+                bool(t_star <= TOLERANCIA_PIVO), float(Z), inviabilidade_primal, inviabilidade_dual,
+                relogio_precificacao - relogio_fatoracao, relogio_razao - relogio_precificacao, relogio_fatoracao - relogio_inicio,
+            )
+
+        if k_saida is None:
+            if not np.isfinite(t_star):
+                registro("Problema ilimitado")
+                return STATUS_ILIMITADO, None, B, colunas_base, variaveis_basicas(colunas_base, vetor_variaveis), montar_x(xB)
+            # A variável que entra chega ao outro limite antes de alguma básica sair: a base não muda
+            registro("A variável", vetor_variaveis[coluna_entrada], "passa para o outro limite, sem troca de base")
+            valores_N[j_entrada] = superiores[coluna_entrada] if sentido[j_entrada] > 0 else 0.0
+            inverter_colunas(N, [j_entrada])
+            Cn[j_entrada] *= -1
+            sentido[j_entrada] *= -1
+            if medir:
+                instrumentacao.registrar_iteracao(iteracao_medida)
+            continue
+        registro("Índice da coluna da matriz B que sairá da base:", k_saida)
+
+        # Os pesos da regra são atualizados com a base antiga, antes da troca
+        regra.atualizar(fatoracao, N, j_entrada, k_saida, -d_B)
+        # Na base, a coluna que entra volta ao sinal original: alpha = B⁻¹ a_j = -sentido * d_B
+        alpha = -d_B * sentido[j_entrada]
+        if sentido[j_entrada] < 0:
+            inverter_colunas(N, [j_entrada])
+            Cn[j_entrada] *= -1
+        coluna_saida = colunas_base[k_saida]
+        atualizar_B_N_C(j_entrada, k_saida, B, N, Cb, Cn, coluna_saida)
+        # Atualização na forma produto
+        if medir:
+            relogio_atualizacao = time.perf_counter()
+        fatoracao.atualizar(k_saida, alpha)
+        if medir:
+            iteracao_medida.tempo_fatoracao += time.perf_counter() - relogio_atualizacao
+        atualizar_indices_base(colunas_base, colunas_nao_base, j_entrada, k_saida)
+
+        # A variável que saiu ocupa a posição j_entrada de N, em 0 ou no seu limite superior
+        livres_N[j_entrada] = livres[coluna_saida]
+        if saida_no_superior:
+            valores_N[j_entrada] = superiores[coluna_saida]
+            sentido[j_entrada] = -1.0
+            inverter_colunas(N, [j_entrada])
+            Cn[j_entrada] *= -1
         else:
-            print("\n\n\033[31mPL original inviável!\033[0m")
-            print("(Não possui solução sem auxílio de variáveis artificiais) \n\n")
-            print("Fim do algoritmo: O problema não tem solução viável.")
-    else: 
-        print("\n\n\033[31mPL original inviável!\033[0m")
-        print("(Não possui solução sem auxílio de variáveis artificiais) \n\n")
-        print("Fim do algoritmo: O problema não tem solução viável.")
+            valores_N[j_entrada] = 0.0
+            sentido[j_entrada] = 1.0
+        if medir:
+            instrumentacao.registrar_iteracao(iteracao_medida)
+
+def metodo_das_duas_fases(resultado, problema: ProblemaPL, max_iter=None, time_limit=None, cutoff=None, regra=None,
+                          registro=None, estatisticas=None, instrumentacao=None):
+    # Retorna (status, Z, B, colunas_base, solucao, x) da Fase II, ou o status de inviável se a Fase I não zerar as artificiais.
+    # A Fase II continua do estado da Fase I (mesma base, mesma fatoração, mesmas não básicas nos limites): só os custos
+    # mudam, as artificiais básicas saem por pivôs degenerados e as não básicas ficam em N com a coluna zerada (nunca entram).
+    # Uma artificial que não pode sair (linha redundante) continua na base, fixa em 0; x tem só as colunas do problema.
+    # Com instrumentacao, o tempo de cada fase vai para "fase_1" e "fase_2".
+    registro = obter_registro(registro)
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    inicio = time.perf_counter()
+    limites = None
+    if problema.limites_superiores is not None:
+        limites = (np.asarray(problema.limites_inferiores, dtype=float), np.asarray(problema.limites_superiores, dtype=float))
+    # O crash cobre o que puder; só as linhas que sobrarem recebem artificiais
+    _, colunas_crash, colunas_nao_encontradas = possui_solucao_basica_viavel(
+        problema.matriz_coeficientes, None if limites is None else limites[1], problema.vetor_b
+    )
+    registro("\nNão há solução básica inicial viável visível. \nNecessita de um PL extra.\n")
+    registro(" PL extra: \n")
+    matriz_tratada_aux, novas_variaveis, _, variaveis_artificiais = adicionar_variavel_artificial(problema.matriz_coeficientes, problema.vetor_variaveis, problema.vetor_operadores, resultado, problema.vetor_de_custos, colunas_nao_encontradas)
+    coef_obj_aux = vetor_coef_pl_auxiliar(len(novas_variaveis), variaveis_artificiais)
+    registro(lambda: gerar_formato_textual(matriz_tratada_aux, problema.vetor_operadores_novo, problema.vetor_b, coef_obj_aux, novas_variaveis, [], [], 0))
+
+    # O PL extra é outra instância: o PL original (problema) não muda
+    PL_aux = replace(problema, quantidade_variaveis=len(novas_variaveis), vetor_variaveis=novas_variaveis,
+                     vetor_de_custos=coef_obj_aux, matriz_coeficientes=matriz_tratada_aux)
+
+    # As artificiais ficam em [0, +inf)
+    num_colunas = len(problema.vetor_variaveis)
+    artificiais = len(novas_variaveis) - num_colunas
+    limites_aux = (np.zeros(len(novas_variaveis)), np.full(len(novas_variaveis), np.inf))
+    if limites is not None:
+        limites_aux = (np.concatenate((limites[0], np.zeros(artificiais))), np.concatenate((limites[1], np.full(artificiais, np.inf))))
+    # Base inicial da Fase I: as colunas do crash nas linhas cobertas e as artificiais nas demais, na ordem das linhas
+    coluna_da_linha = dict(zip(colunas_nao_encontradas, variaveis_artificiais))
+    linhas_cobertas = [i for i in range(problema.matriz_coeficientes.shape[0]) if i not in coluna_da_linha]
+    coluna_da_linha.update(zip(linhas_cobertas, colunas_crash))
+    colunas_base = [coluna_da_linha[i] for i in range(len(coluna_da_linha))]
+    B, N, Cb, Cn = obter_Cn_Cb_N_B(PL_aux, colunas_base)
+    with instrumentacao.fase("fase_1"):
+        estado = iniciar_estado(B, N, Cb, Cn, colunas_base, limites=limites_aux)
+        status, Z_otimo, B_aux, colunas_base, solucao, x_aux = iterar_simplex(
+            estado, PL_aux.vetor_b, PL_aux.vetor_variaveis, 0, max_iter=max_iter, time_limit=time_limit, regra=regra,
+            registro=registro, estatisticas=estatisticas, pl_extra=True, instrumentacao=instrumentacao, fase="fase_1",
+        )
+    if status != STATUS_OTIMO:
+        # A Fase I foi interrompida por limite de iterações ou de tempo
+        return status, None, B_aux, colunas_base, solucao, None
+
+    # O limite de tempo vale para as duas fases juntas
+    if time_limit is not None:
+        time_limit = max(time_limit - (time.perf_counter() - inicio), 0.0)
+
+    # Posições da base ocupadas por artificiais: as colunas depois das do problema
+    indices_artificiais = [k for k, coluna in enumerate(colunas_base) if coluna >= num_colunas]
+    if abs(Z_otimo) <= 1e-9:
+        resultado = verificar_artificiais_na_base(B_aux, indices_artificiais, x_aux[colunas_base], registro)
+        if resultado in ("viável", "remover"):
+            if resultado == "remover":
+                registro("Removendo variáveis artificiais da base antes da Fase II...")
+                restantes = remover_artificiais(estado, variaveis_artificiais, registro)
+                # As que ficaram (linhas redundantes) não podem sair de 0 na Fase II
+                estado.superiores[[estado.colunas_base[k] for k in restantes]] = 0.0
+            # As artificiais fora da base nunca entram na Fase II: coluna zerada, custo reduzido 0
+            anular_colunas(estado.N, [j for j, coluna in enumerate(estado.colunas_nao_base) if coluna >= num_colunas])
+            estado.trocar_custos(np.concatenate((np.asarray(problema.vetor_de_custos, dtype=float), np.zeros(artificiais))))
+            registro("\n------------------------------------------------------------------------------------------------------------------------------------------------------------")
+            registro("\nIniciando Fase II...")
+            with instrumentacao.fase("fase_2"):
+                status, Z, B, colunas_base, solucao, x = iterar_simplex(
+                    estado, problema.vetor_b, PL_aux.vetor_variaveis, 0, max_iter=max_iter, time_limit=time_limit, cutoff=cutoff,
+                    regra=regra, registro=registro, estatisticas=estatisticas, pl_extra=False, instrumentacao=instrumentacao,
+                    fase="fase_2",
+                )  # Fase II
+            return status, Z, B, colunas_base, solucao, None if x is None else x[:num_colunas]
+
+    registro("\n\n\033[31mPL original inviável!\033[0m")
+    registro("(Não possui solução sem auxílio de variáveis artificiais) \n\n")
+    registro("Fim do algoritmo: O problema não tem solução viável.")
+    return STATUS_INVIAVEL, None, None, [], [], None
@@ -0,0 +1,110 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+
+# Instrumentação do solver: tempos por fase, contadores e rastro de cada pivô ##########################################################################################################################################################
+@dataclass(slots=True)
+class IteracaoSimplex:
+    # Um pivô do simplex (ou uma troca de limite, com saida None), como é passado ao callback e gravado no rastro
+    fase: str  # "simplex" (uma fase só), "fase_1" ou "fase_2"
+    iteracao: int
+    entrada: int  # Coluna da forma padrão que entra na base
+    saida: int  # Coluna da forma padrão que sai da base (None: a que entra só trocou de limite)
+    t_star: float  # Passo do teste da razão
+    degenerado: bool  # t* <= TOLERANCIA_PIVO
+    objetivo: float  # Custo antes do pivô
+    inviabilidade_primal: float  # Maior violação dos limites das básicas
+    inviabilidade_dual: float  # Maior custo reduzido com o sinal errado entre as não básicas
+    tempo_precificacao: float  # BTRAN dos duais e escolha da coluna que entra
+    tempo_razao: float  # FTRAN da coluna que entra e teste da razão
+    tempo_fatoracao: float  # Refatorações, cálculo de x_B e atualização na forma produto
+
+class RastroJSONL:
+    # Grava cada evento (pivô ou fim de fase) como uma linha JSON, à medida que acontece
+    def __init__(self, arquivo):
+        self.proprio = isinstance(arquivo, str)
+        self.arquivo = open(arquivo, "w", encoding="utf-8") if self.proprio else arquivo
+
+    def escrever(self, evento):
+        self.arquivo.write(json.dumps(evento, ensure_ascii=False, default=_para_json) + "\n")
+
+    def fechar(self):
+        if self.proprio:
+            self.arquivo.close()
+        else:
+            self.arquivo.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+def _para_json(valor):
+    # Escalares do NumPy (np.int64, np.bool_) viram os tipos do Python
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+class Instrumentacao:
+    # Recebe do solver os tempos de cada fase e os dados de cada pivô.
+    #   callback: função chamada com cada IteracaoSimplex; se ela devolver True, o simplex para com STATUS_INTERROMPIDO
+    #   rastro: RastroJSONL (ou qualquer objeto com escrever(dict)) que recebe cada evento
+    #   guardar_iteracoes: guarda as IteracaoSimplex em self.iteracoes
+    # Desligada (INSTRUMENTACAO_DESLIGADA), fase() devolve um contexto vazio e o simplex só testa "ativa" uma vez por pivô.
+    # Ligada, cada pivô custa também uma passada de precificação completa (a inviabilidade dual).
+    def __init__(self, callback=None, rastro=None, guardar_iteracoes=True, ativa=True):
+        self.ativa = ativa
+        self.callback = callback
+        self.rastro = rastro
+        self.tempos = {}  # Fase -> segundos, somados
+        self.contadores = {}  # "pivos", "pivos_degenerados", "trocas_de_limite", "refatoracoes"
+        self.iteracoes = [] if guardar_iteracoes else None
+        self.interrompido = False
+
+    def iniciar_resolucao(self):
+        # Chamado no início de cada resolução: um pedido de interrupção do callback vale só para a resolução em que foi feito
+        # (os tempos e contadores continuam somando)
+        self.interrompido = False
+
+    def fase(self, nome):
+        # Contexto que soma o tempo gasto dentro dele em tempos[nome]
+        if not self.ativa:
+            return _CONTEXTO_VAZIO
+        return self._medir(nome)
+
+    @contextmanager
+    def _medir(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            tempo = time.perf_counter() - inicio
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + tempo
+            if self.rastro is not None:
+                self.rastro.escrever({"evento": "fase", "fase": nome, "tempo": tempo})
+
+    def somar(self, contador, quantidade=1):
+        self.contadores[contador] = self.contadores.get(contador, 0) + quantidade
+
+    def registrar_iteracao(self, iteracao: IteracaoSimplex):
+        # Devolve True se o callback pediu para interromper
+        self.somar("pivos" if iteracao.saida is not None else "trocas_de_limite")
+        if iteracao.degenerado:
+            self.somar("pivos_degenerados")
+        if self.iteracoes is not None:
+            self.iteracoes.append(iteracao)
+        if self.rastro is not None:
+            self.rastro.escrever({"evento": "iteracao", **asdict(iteracao)})
+        if self.callback is not None and self.callback(iteracao):
+            self.interrompido = True
+        return self.interrompido
+
+    def resumo(self):
+        return {"tempos": dict(self.tempos), "contadores": dict(self.contadores)}
+
+_CONTEXTO_VAZIO = nullcontext()
+
+INSTRUMENTACAO_DESLIGADA = Instrumentacao(guardar_iteracoes=False, ativa=False)
+
+def obter_instrumentacao(instrumentacao):
+    return INSTRUMENTACAO_DESLIGADA if instrumentacao is None else instrumentacao
@@ -0,0 +1,105 @@
+# Resolve em lote os arquivos de PL de um diretório (ou de um padrão glob) em um conjunto de processos.
+# Cada processo importa os módulos (NumPy, expressões regulares já compiladas) uma única vez e resolve muitos arquivos;
+# os resultados são gravados em JSONL ou CSV à medida que ficam prontos, com o tempo de cada arquivo.
+#
+# Uso: python lote.py modelos/ --saida resultados.jsonl --processos 4
+#      python lote.py "modelos/**/*.txt" --saida resultados.csv
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import resolvedor
+from cache_modelos import CacheModelos
+
+CAMPOS_CSV = ["arquivo", "status", "objetivo", "iteracoes", "tempo", "erro", "x"]
+
+def listar_arquivos(entrada, padrao="*.txt"):
+    # Um diretório (com os arquivos que seguem o padrão) ou um padrão glob (com ** recursivo)
+    if os.path.isdir(entrada):
+        caminhos = glob.glob(os.path.join(entrada, padrao))
+    else:
+        caminhos = glob.glob(entrada, recursive=True)
+    return sorted(caminho for caminho in caminhos if os.path.isfile(caminho))
+
+def resolver_arquivo(caminho, opcoes):
+    # Executado nos processos de trabalho: devolve só tipos simples, que vão direto para o JSON/CSV
+    inicio = time.perf_counter()
+    try:
+        resultado = resolvedor.solve(caminho, **opcoes)
+    except Exception as erro:  # Um arquivo com problema não interrompe o lote
+        return {"arquivo": caminho, "status": "erro", "objetivo": None, "iteracoes": None,
+                "tempo": time.perf_counter() - inicio, "erro": f"{type(erro).__name__}: {erro}", "x": None}
+    return {
+        "arquivo": caminho, "status": resultado.status, "objetivo": resultado.objetivo, "iteracoes": resultado.iteracoes,
+        "tempo": time.perf_counter() - inicio, "erro": None, "x": resultado.x,
+    }
+
+class Saida:
+    # Grava cada resultado assim que ele chega, em JSONL (uma linha por arquivo) ou CSV (x como JSON em uma coluna)
+    def __init__(self, arquivo, formato):
+        self.arquivo = arquivo
+        self.formato = formato
+        if formato == "csv":
+            self.escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_CSV)
+            self.escritor.writeheader()
+
+    def escrever(self, registro):
+        if self.formato == "csv":
+            self.escritor.writerow({**registro, "x": json.dumps(registro["x"]) if registro["x"] is not None else ""})
+        else:
+            self.arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+
+def resolver_lote(caminhos, saida, processos=None, opcoes=None):
+    # Devolve (tempo total, contagem por status)
+    opcoes = opcoes or {}
+    inicio = time.perf_counter()
+    contagem = {}
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(resolver_arquivo, caminho, opcoes) for caminho in caminhos]
+        for futuro in as_completed(futuros):
+            registro = futuro.result()
+            contagem[registro["status"]] = contagem.get(registro["status"], 0) + 1
+            saida.escrever(registro)
+    return time.perf_counter() - inicio, contagem
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Resolve em lote arquivos de PL em vários processos.")
+    parser.add_argument("entrada", help="diretório ou padrão glob dos arquivos de PL")
+    parser.add_argument("--padrao", default="*.txt", help="padrão dos arquivos quando a entrada é um diretório (padrão: *.txt)")
+    parser.add_argument("--saida", help="arquivo .jsonl ou .csv (padrão: JSONL na saída padrão)")
+    parser.add_argument("--formato", choices=["jsonl", "csv"], help="formato da saída (padrão: pela extensão do arquivo)")
+    parser.add_argument("--processos", type=int, default=None, help="número de processos (padrão: número de CPUs)")
+    parser.add_argument("--regra", default=None, help="regra de precificação (dantzig, parcial, devex, steepest, bland)")
+    parser.add_argument("--metodo", choices=["simplex", "ipm"], default="simplex", help="simplex ou pontos interiores (padrão: simplex)")
+    parser.add_argument("--sem-escalonamento", action="store_true", help="não escalona a forma padrão")
+    parser.add_argument("--sem-presolve", action="store_true", help="não aplica o presolve")
+    parser.add_argument("--cache", help="pasta do cache dos modelos compilados (reaproveitado entre execuções)")
+    argumentos = parser.parse_args(argumentos)
+
+    caminhos = listar_arquivos(argumentos.entrada, argumentos.padrao)
+    if not caminhos:
+        parser.error(f"nenhum arquivo encontrado em {argumentos.entrada}")
+    formato = argumentos.formato or ("csv" if argumentos.saida and argumentos.saida.endswith(".csv") else "jsonl")
+    opcoes = {"method": argumentos.metodo, "regra": argumentos.regra, "escalonar": not argumentos.sem_escalonamento, "usar_presolve": not argumentos.sem_presolve}
+    if argumentos.cache:
+        opcoes["cache"] = CacheModelos(argumentos.cache)  # Cada processo recebe uma cópia; a pasta é compartilhada
+
+    arquivo = open(argumentos.saida, "w", encoding="utf-8", newline="") if argumentos.saida else sys.stdout
+    try:
+        tempo, contagem = resolver_lote(caminhos, Saida(arquivo, formato), argumentos.processos, opcoes)
+    finally:
+        if argumentos.saida:
+            arquivo.close()
+
+    # O resumo vai para stderr, para não se misturar com o JSONL na saída padrão
+    resumo = ", ".join(f"{status}: {quantidade}" for status, quantidade in sorted(contagem.items()))
+    print(f"{len(caminhos)} arquivo(s) em {tempo:.2f} s ({len(caminhos) / tempo:.1f} arquivos/s) - {resumo}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
-import funcoes
+import resolvedor
+from cache_modelos import CacheModelos
+from cache_resultados import CacheResultados
+from instrumentacao import Instrumentacao, RastroJSONL
 
 # Entrada
-arquivo = "arquivo.txt"
+arquivo = "arquivo.txt"  # Formato de texto ("min 2a + 3b", "s.a.") ou MPS (.mps, .mps.gz)
+escalonar = True  # Escalonamento por média geométrica + equilibração antes do simplex
+metodo = "simplex"  # "simplex" ou "ipm" (pontos interiores com crossover para uma base)
+rastro = None  # Arquivo JSONL com o tempo de cada fase e os dados de cada pivô (None: sem instrumentação)
+pasta_cache = None  # Pasta do cache dos modelos compilados (None: compila a cada execução)
+pasta_resultados = None  # Pasta do cache de resultados: um modelo já resolvido (mesmo com as linhas em outra ordem) não é resolvido de novo
+sensibilidade = False  # Preços sombra e faixas dos custos e do lado direito em que a base ótima se mantém (desliga o presolve)
 
-ProblemaPL = funcoes.gerar_formato_matricial(arquivo)
-ProblemaPL_forma_padrao = funcoes.transformar_para_forma_padrao(ProblemaPL, arquivo)
+cache = None if pasta_cache is None else CacheModelos(pasta_cache)
+solve = resolvedor.solve if pasta_resultados is None else CacheResultados(pasta=pasta_resultados).solve
 
-resultado, colunas_base, colunas_nao_encontradas = funcoes.possui_solucao_basica_viavel(ProblemaPL_forma_padrao.matriz_coeficientes)
-if resultado:
-    print("\nNão precisa de PL extra.\n")
-    B, N, Cb, Cn = funcoes.obter_Cn_Cb_N_B(ProblemaPL_forma_padrao, colunas_base)
-    funcoes.metodo_simplex(B, N, Cb, Cn, ProblemaPL_forma_padrao.vetor_b, ProblemaPL_forma_padrao.vetor_variaveis, colunas_base, 0)
+# Presolve, forma padrão, escalonamento, simplex (com Fase I se preciso) e volta para as variáveis do arquivo
+if rastro is None:
+    resultado = solve(arquivo, verbose=True, escalonar=escalonar, method=metodo, cache=cache, sensibilidade=sensibilidade)
 else:
-    funcoes.metodo_das_duas_fases(resultado, ProblemaPL_forma_padrao)
+    with RastroJSONL(rastro) as saida_rastro:
+        instrumentacao = Instrumentacao(rastro=saida_rastro, guardar_iteracoes=False)
+        resultado = solve(arquivo, verbose=True, escalonar=escalonar, method=metodo, instrumentacao=instrumentacao, cache=cache,
+                          sensibilidade=sensibilidade)
+    print("\nTempo por fase (s):", instrumentacao.tempos)
+    print("Contadores:", instrumentacao.contadores)
+if resultado.status == "optimal":
+    print("\nSolução nas variáveis originais:", resultado.x, " valor do objetivo:", resultado.objetivo)
+    print("Duais das restrições:", resultado.duais)
+    print("Custos reduzidos:", resultado.custos_reduzidos)
+    print("Pivôs:", resultado.iteracoes)
+if resultado.sensibilidade is not None:
+    print("\nPreços sombra:", resultado.sensibilidade.precos_sombra)
+    print("Faixas dos custos:", resultado.sensibilidade.faixas_custos)
+    print("Faixas do lado direito:", resultado.sensibilidade.faixas_lado_direito)
@@ -0,0 +1,286 @@
+import gzip
+from array import array
+import numpy as np
+
+from esparsa import MatrizCSC
+from funcoes import ProblemaPL, gerar_formato_textual, limites_das_variaveis, montar_matriz_densa, montar_matriz_esparsa, nomes_das_restricoes
+from registro import obter_registro
+
+# Leitura e gravação no formato MPS (fixo e livre) ##########################################################################################################################################################################################
+# O arquivo é lido linha a linha, uma única vez: os coeficientes vão direto para trincas (linha, coluna, valor) em arrays
+# compactos, sem montar texto intermediário, e no fim viram a MatrizCSC (ou a matriz densa) e os campos do ProblemaPL.
+SECOES = {"NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "ENDATA"}
+OPERADORES_MPS = {"L": "<=", "G": ">=", "E": "="}
+TIPOS_MPS = {"<=": "L", "<": "L", ">=": "G", ">": "G", "=": "E"}
+# Tipos de limite das variáveis inteiras: aceitos, mas as variáveis ficam contínuas (o solver só resolve a relaxação)
+LIMITES_INTEIROS = {"BV", "LI", "UI"}
+LIMITES_SEM_VALOR = {"FR", "MI", "PL", "BV"}
+
+def abrir(arquivo, modo):
+    # Arquivos .gz são lidos e gravados comprimidos, de forma transparente
+    if str(arquivo).endswith(".gz"):
+        return gzip.open(arquivo, modo + "t", encoding="utf-8")
+    return open(arquivo, modo, encoding="utf-8")
+
+def campos_fixos(linha):
+    # MPS fixo: os campos ficam nas colunas 2-3, 5-12, 15-22, 25-36, 40-47 e 50-61 (os nomes podem ter espaços)
+    campos = (linha[1:3], linha[4:12], linha[14:22], linha[24:36], linha[39:47], linha[49:61])
+    return [campo.strip() for campo in campos if campo.strip()]
+
+def ler_mps(arquivo, esparso=False, fixo=False, registro=None) -> ProblemaPL:
+    # Lê um arquivo MPS (livre por padrão; fixo=True para nomes com espaços, pelas colunas do formato fixo).
+    # Seções: NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES, BOUNDS e ENDATA. A primeira linha N é o objetivo (as outras N
+    # são ignoradas) e o RHS dela é o oposto da constante do objetivo. Só vale o primeiro conjunto de RHS, RANGES e BOUNDS.
+    # Uma linha com RANGES vira duas restrições: a original (com o lado direito de um dos extremos) e, depois das linhas do
+    # arquivo, uma cópia com o outro extremo (chamada <linha>_faixa). Os marcadores de inteiras e os limites BV, LI e UI
+    # são aceitos como contínuos.
+    registro = obter_registro(registro)
+    dividir = campos_fixos if fixo else str.split
+
+    tipo = 0
+    objetivo = None
+    indice_linha = {}  # Nome da linha -> índice (o objetivo e as outras linhas N ficam com -1 e -2)
+    operadores = []
+    nomes_linhas = []
+    indice_coluna = {}
+    variaveis = []
+    # Trincas em arrays compactos (8 bytes por valor), crescendo sem listas de objetos do Python
+    linhas, colunas, valores = array("q"), array("q"), array("d")
+    custos = array("d")
+    lado_direito = {}
+    faixas = {}
+    inferiores, superiores, inferior_declarado = {}, {}, set()
+    conjuntos = {}  # Seção -> nome do primeiro conjunto (RHS, RANGES, BOUNDS)
+    constante = 0.0
+    inteiras = False
+    secao = None
+    coluna_atual, j = None, -1
+
+    with abrir(arquivo, "r") as f:
+        for numero_linha, linha in enumerate(f, 1):
+            if not linha.strip() or linha[0] == "*":
+                continue
+            if not linha[0].isspace():
+                # Cabeçalho de seção (começa na primeira coluna)
+                partes = linha.split()
+                secao = partes[0].upper()
+                if secao == "OBJSENSE" and len(partes) > 1:
+                    tipo = 1 if partes[1].upper() in ("MAX", "MAXIMIZE") else 0
+                elif secao not in SECOES:
+                    raise ValueError(f"Linha {numero_linha}: seção MPS desconhecida: {partes[0]}")
+                if secao == "ENDATA":
+                    break
+                continue
+
+            campos = dividir(linha)
+            if secao == "COLUMNS":
+                if len(campos) >= 3 and campos[1] == "'MARKER'":
+                    inteiras = True
+                    continue
+                nome = campos[0]
+                if nome != coluna_atual:
+                    # As colunas costumam vir agrupadas: o dicionário só é consultado quando a coluna muda
+                    coluna_atual = nome
+                    j = indice_coluna.get(nome)
+                    if j is None:
+                        j = indice_coluna[nome] = len(variaveis)
+                        variaveis.append(nome)
+                        custos.append(0.0)
+                for k in range(1, len(campos) - 1, 2):
+                    i = indice_linha.get(campos[k])
+                    if i is None:
+                        raise ValueError(f"Linha {numero_linha}: linha {campos[k]} não declarada em ROWS")
+                    valor = float(campos[k + 1])
+                    if i >= 0:
+                        linhas.append(i)
+                        colunas.append(j)
+                        valores.append(valor)
+                    elif i == -1:
+                        custos[j] = valor
+            elif secao == "ROWS":
+                tipo_linha, nome = campos[0].upper(), campos[1]
+                if tipo_linha == "N":
+                    indice_linha[nome] = -1 if objetivo is None else -2
+                    objetivo = objetivo or nome
+                elif tipo_linha in OPERADORES_MPS:
+                    indice_linha[nome] = len(operadores)
+                    operadores.append(OPERADORES_MPS[tipo_linha])
+                    nomes_linhas.append(nome)
+                else:
+                    raise ValueError(f"Linha {numero_linha}: tipo de linha MPS desconhecido: {campos[0]}")
+            elif secao in ("RHS", "RANGES"):
+                # O nome do conjunto é opcional: com um número ímpar de campos, o primeiro é ele
+                if len(campos) % 2 == 1:
+                    if conjuntos.setdefault(secao, campos[0]) != campos[0]:
+                        continue
+                    campos = campos[1:]
+                destino = lado_direito if secao == "RHS" else faixas
+                for k in range(0, len(campos) - 1, 2):
+                    i = indice_linha.get(campos[k])
+                    if i is None:
+                        raise ValueError(f"Linha {numero_linha}: linha {campos[k]} não declarada em ROWS")
+                    if i >= 0:
+                        destino[i] = float(campos[k + 1])
+                    elif i == -1 and secao == "RHS":
+                        constante = -float(campos[k + 1])
+            elif secao == "BOUNDS":
+                tipo_limite = campos[0].upper()
+                sem_valor = tipo_limite in LIMITES_SEM_VALOR
+                # "tipo [conjunto] coluna [valor]": o conjunto é opcional
+                if len(campos) == (3 if sem_valor else 4):
+                    if conjuntos.setdefault(secao, campos[1]) != campos[1]:
+                        continue
+                    campos = [campos[0], *campos[2:]]
+                nome = campos[1]
+                j = indice_coluna.get(nome)
+                if j is None:
+                    raise ValueError(f"Linha {numero_linha}: coluna {nome} não declarada em COLUMNS")
+                valor = 0.0 if sem_valor else float(campos[2])
+                if tipo_limite in ("UP", "UI"):
+                    superiores[j] = valor
+                    # Convenção do MPS: limite superior negativo sem inferior declarado libera o inferior
+                    if valor < 0 and j not in inferior_declarado:
+                        inferiores[j] = -np.inf
+                elif tipo_limite in ("LO", "LI"):
+                    inferiores[j] = valor
+                    inferior_declarado.add(j)
+                elif tipo_limite == "FX":
+                    inferiores[j] = superiores[j] = valor
+                    inferior_declarado.add(j)
+                elif tipo_limite == "FR":
+                    inferiores[j], superiores[j] = -np.inf, np.inf
+                    inferior_declarado.add(j)
+                elif tipo_limite == "MI":
+                    inferiores[j] = -np.inf
+                    inferior_declarado.add(j)
+                elif tipo_limite == "PL":
+                    superiores[j] = np.inf
+                elif tipo_limite == "BV":
+                    inferiores[j], superiores[j] = 0.0, 1.0
+                    inferior_declarado.add(j)
+                else:
+                    raise ValueError(f"Linha {numero_linha}: tipo de limite MPS não suportado: {campos[0]}")
+                inteiras = inteiras or tipo_limite in LIMITES_INTEIROS
+            elif secao == "OBJSENSE":
+                tipo = 1 if campos[0].upper() in ("MAX", "MAXIMIZE") else 0
+            elif secao != "NAME":
+                raise ValueError(f"Linha {numero_linha}: dados fora de uma seção MPS")
+
+    if objetivo is None:
+        registro("Aviso: arquivo MPS sem linha N; o objetivo é nulo")
+    if inteiras:
+        registro("Aviso: variáveis inteiras do arquivo MPS tratadas como contínuas")
+
+    num_linhas, num_colunas = len(operadores), len(variaveis)
+    linhas = np.frombuffer(linhas, dtype=np.int64) if linhas else np.zeros(0, dtype=np.int64)
+    colunas = np.frombuffer(colunas, dtype=np.int64) if colunas else np.zeros(0, dtype=np.int64)
+    valores = np.frombuffer(valores, dtype=float) if valores else np.zeros(0)
+    vetor_b = np.zeros(num_linhas)
+    if lado_direito:
+        vetor_b[list(lado_direito)] = list(lado_direito.values())
+    operadores = np.array(operadores)
+
+    # RANGES: a linha i vira  inferior <= a_i x <= superior, com a cópia de a_i (o outro extremo) depois das linhas do arquivo
+    if faixas:
+        extras = []
+        for i, faixa in sorted(faixas.items()):
+            if operadores[i] == "<=" or (operadores[i] == "=" and faixa < 0):
+                if operadores[i] == "=":
+                    operadores[i] = "<="
+                extras.append((i, ">=", vetor_b[i] - abs(faixa)))
+            elif faixa != 0 or operadores[i] == ">=":
+                if operadores[i] == "=":
+                    operadores[i] = ">="
+                extras.append((i, "<=", vetor_b[i] + abs(faixa)))
+        originais = np.array([i for i, _, _ in extras], dtype=np.int64)
+        # Trincas das linhas copiadas: as entradas das linhas originais, com o índice da nova linha
+        nova_linha = np.full(num_linhas, -1, dtype=np.int64)
+        nova_linha[originais] = num_linhas + np.arange(len(extras))
+        copiadas = nova_linha[linhas] >= 0
+        linhas = np.concatenate((linhas, nova_linha[linhas[copiadas]]))
+        colunas = np.concatenate((colunas, colunas[copiadas]))
+        valores = np.concatenate((valores, valores[copiadas]))
+        operadores = np.concatenate((operadores, [op for _, op, _ in extras]))
+        nomes_linhas += [f"{nomes_linhas[i]}_faixa" for i, _, _ in extras]
+        vetor_b = np.concatenate((vetor_b, [valor for _, _, valor in extras]))
+        num_linhas += len(extras)
+
+    limites_inferiores = np.zeros(num_colunas)
+    limites_superiores = np.full(num_colunas, np.inf)
+    if inferiores:
+        limites_inferiores[list(inferiores)] = list(inferiores.values())
+    if superiores:
+        limites_superiores[list(superiores)] = list(superiores.values())
+
+    trincas = (linhas, colunas, valores)
+    if esparso:
+        matriz_coeficientes = montar_matriz_esparsa(trincas, num_linhas, num_colunas)
+    else:
+        matriz_coeficientes = montar_matriz_densa(trincas, num_linhas, num_colunas)
+    vetor_variaveis = np.array(variaveis)
+    vetor_de_custos = np.array(custos, dtype=float)
+
+    registro("\n Problema dado:\n")
+    registro(lambda: gerar_formato_textual(matriz_coeficientes, operadores, vetor_b, vetor_de_custos, vetor_variaveis, [], [], tipo,
+                                           limites=(limites_inferiores, limites_superiores)))
+
+    return ProblemaPL(
+        num_colunas, vetor_variaveis, vetor_de_custos, matriz_coeficientes, vetor_b, operadores, None,
+        tipo=tipo, variaveis_livres=np.array([]), variaveis_sinal=np.array([]), esparso=esparso,
+        limites_inferiores=limites_inferiores, limites_superiores=limites_superiores, constante_objetivo=constante,
+        nomes_restricoes=np.array(nomes_linhas),
+    )
+
+def escrever_mps(problema: ProblemaPL, arquivo, nome="PL"):
+    # Grava o PL em MPS livre (com OBJSENSE), coluna a coluna, sem montar o texto inteiro na memória.
+    # As linhas mantêm os nomes do modelo (R1, R2, ... se ele não tiver nomes válidos no MPS livre) e o objetivo se chama
+    # OBJ; os números saem com repr (ida e volta exata pelo ler_mps).
+    nomes = [str(var) for var in problema.vetor_variaveis]
+    if any(not var or any(c.isspace() for c in var) for var in nomes):
+        raise ValueError("O MPS livre não aceita nomes de variáveis vazios ou com espaços")
+    matriz = problema.matriz_coeficientes
+    if not isinstance(matriz, MatrizCSC):
+        matriz = MatrizCSC.de_densa(matriz)
+    num_linhas = matriz.shape[0]
+    custos = np.asarray(problema.vetor_de_custos, dtype=float)
+    vetor_b = np.asarray(problema.vetor_b, dtype=float)
+    inferiores, superiores = limites_das_variaveis(problema)
+    nomes_linhas = nomes_das_restricoes(problema)
+    if (len(set(nomes_linhas)) < num_linhas or "OBJ" in nomes_linhas
+            or any(not linha or any(c.isspace() for c in linha) for linha in nomes_linhas)):
+        nomes_linhas = [f"R{i + 1}" for i in range(num_linhas)]
+
+    with abrir(arquivo, "w") as f:
+        f.write(f"NAME {nome}\n")
+        f.write(f"OBJSENSE\n    {'MAX' if problema.tipo == 1 else 'MIN'}\n")
+        f.write("ROWS\n N  OBJ\n")
+        f.writelines(f" {TIPOS_MPS[op]}  {linha}\n" for op, linha in zip(problema.vetor_operadores, nomes_linhas))
+
+        f.write("COLUMNS\n")
+        ponteiros, indices, dados = matriz.ponteiros.tolist(), matriz.indices.tolist(), matriz.dados.tolist()
+        for j, var in enumerate(nomes):
+            inicio, fim = ponteiros[j], ponteiros[j + 1]
+            entradas = [f"{nomes_linhas[i]}  {valor!r}" for i, valor in zip(indices[inicio:fim], dados[inicio:fim])]
+            # Uma coluna sem coeficientes ainda precisa aparecer (com custo 0) para ser declarada
+            if custos[j] != 0 or inicio == fim:
+                entradas.insert(0, f"OBJ  {float(custos[j])!r}")
+            # Duas entradas por linha, como no MPS usual
+            f.writelines(f"    {var}  {'  '.join(entradas[k:k + 2])}\n" for k in range(0, len(entradas), 2))
+
+        f.write("RHS\n")
+        f.writelines(f"    RHS  {nomes_linhas[i]}  {float(vetor_b[i])!r}\n" for i in np.nonzero(vetor_b)[0])
+        if problema.constante_objetivo != 0:
+            f.write(f"    RHS  OBJ  {-float(problema.constante_objetivo)!r}\n")
+
+        f.write("BOUNDS\n")
+        for var, inferior, superior in zip(nomes, inferiores.tolist(), superiores.tolist()):
+            if inferior == superior:
+                f.write(f" FX BND  {var}  {inferior!r}\n")
+                continue
+            if inferior == -np.inf:
+                f.write(f" {'FR' if superior == np.inf else 'MI'} BND  {var}\n")
+            elif inferior != 0:
+                f.write(f" LO BND  {var}  {inferior!r}\n")
+            if superior != np.inf:
+                f.write(f" UP BND  {var}  {superior!r}\n")
+        f.write("ENDATA\n")
@@ -0,0 +1,87 @@
+import numpy as np
+
+from esparsa import MatrizCSC
+
+# N implícita: partição básicas/não básicas por índices ##################################################################################################################################################################################
+class ColunasNaoBasicas:
+    # As colunas não básicas lidas de A no próprio lugar, sem copiar N. A (densa ou MatrizCSC) é compartilhada e nunca muda.
+    #   indices[p]: coluna de A na posição p de N
+    #   posicao[j]: posição da coluna j de A em N (-1 se ela está na base)
+    #   multiplicador[p]: 1, -1 (não básica no limite superior) ou 0 (coluna anulada), aplicado ao ler a coluna
+    # Um pivô só troca um índice (O(1)); N[:, p], y @ N e N @ v leem as colunas direto de A.
+    __array_ufunc__ = None  # Faz o NumPy delegar "y @ N" para __rmatmul__
+
+    def __init__(self, matriz, indices, multiplicador=None, posicao=None):
+        self.matriz = matriz
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.multiplicador = np.ones(len(self.indices)) if multiplicador is None else multiplicador
+        if posicao is None:
+            posicao = np.full(matriz.shape[1], -1, dtype=np.int64)
+            posicao[self.indices] = np.arange(len(self.indices))
+        self.posicao = posicao
+
+    @property
+    def shape(self):
+        return (self.matriz.shape[0], len(self.indices))
+
+    def copy(self):
+        # Copia só a partição (O(n)); A continua compartilhada
+        return ColunasNaoBasicas(self.matriz, self.indices.copy(), self.multiplicador.copy(), self.posicao.copy())
+
+    def coluna(self, p):
+        j = self.indices[p]
+        coluna = self.matriz.coluna(j) if isinstance(self.matriz, MatrizCSC) else self.matriz[:, j]
+        return coluna * self.multiplicador[p]
+
+    def colunas_densas(self, posicoes):
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        if isinstance(self.matriz, MatrizCSC):
+            colunas = self.matriz.colunas_densas(self.indices[posicoes])
+        else:
+            colunas = self.matriz[:, self.indices[posicoes]]
+        return colunas * self.multiplicador[posicoes]
+
+    def __getitem__(self, chave):
+        # Só leitura de colunas: N[:, p], N[:, inicio:fim] e N[:, posicoes]
+        linhas, colunas = chave
+        if linhas != slice(None):
+            raise IndexError("ColunasNaoBasicas só permite ler colunas inteiras (N[:, j])")
+        if isinstance(colunas, (int, np.integer)):
+            return self.coluna(colunas)
+        if isinstance(colunas, slice):
+            colunas = np.arange(*colunas.indices(len(self.indices)))
+        return self.colunas_densas(colunas)
+
+    def produto_transposto(self, y, inicio=0, fim=None):
+        # y^T N nas posições inicio..fim-1; com o intervalo inteiro, y^T A é calculado sobre A sem juntar as colunas
+        fim = len(self.indices) if fim is None else fim
+        if inicio == 0 and fim == len(self.indices):
+            return (y @ self.matriz)[self.indices] * self.multiplicador
+        indices = self.indices[inicio:fim]
+        if isinstance(self.matriz, MatrizCSC):
+            produto = y @ self.matriz.selecionar_colunas(indices)
+        else:
+            produto = y @ self.matriz[:, indices]
+        return produto * self.multiplicador[inicio:fim]
+
+    def __rmatmul__(self, y):
+        return self.produto_transposto(np.asarray(y, dtype=float))
+
+    def __matmul__(self, v):
+        # N v = A z, com z espalhando v (e os multiplicadores) nas colunas não básicas
+        z = np.zeros(self.matriz.shape[1])
+        z[self.indices] = np.asarray(v, dtype=float) * self.multiplicador
+        return self.matriz @ z
+
+    def inverter(self, posicoes):
+        self.multiplicador[posicoes] *= -1
+
+    def anular(self, posicoes):
+        self.multiplicador[posicoes] = 0.0
+
+    def substituir(self, p, coluna):
+        # A posição p passa a ser a coluna que saiu da base (com multiplicador 1); a que estava em p foi para a base
+        self.posicao[self.indices[p]] = -1
+        self.indices[p] = coluna
+        self.posicao[coluna] = p
+        self.multiplicador[p] = 1.0
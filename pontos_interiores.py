@@ -0,0 +1,388 @@
+import time
+import numpy as np
+
+from esparsa import MatrizCSC
+from fatoracao import FatoracaoCholesky, FatoracaoLU
+from funcoes import (ProblemaPL, STATUS_OTIMO, STATUS_LIMITE_ITERACOES, STATUS_LIMITE_TEMPO, calcular_matrizes_B_N,
+                     calcular_vetores_Cn_Cb, concatenar_colunas, metodo_simplex)
+from instrumentacao import obter_instrumentacao
+from registro import obter_registro
+
+TOLERANCIA_IPM = 1e-8  # Resíduos primal e dual e gap relativos abaixo disso encerram as iterações
+MAX_ITER_IPM = 100
+FRACAO_PASSO = 0.995  # Fração do passo até a fronteira (mantém x, w, s, v estritamente positivos)
+LIMITE_DIVERGENCIA = 1e12  # |x| ou |y| acima disso indica PL inviável ou ilimitado: quem decide é o simplex
+TOLERANCIA_CROSSOVER = 1e-7  # Violação de limite aceita na base do crossover (relativa a |b|; a dos custos, a |c|)
+TOLERANCIA_PIVO_CROSSOVER = 1e-7  # Pivô mínimo do crossover, relativo à maior entrada da coluna (ou linha) do tableau
+TAMANHO_BLOCO = 256  # Colunas densificadas por vez em A Θ A^T, quando a MatrizCSC tem pares de não nulos demais
+LIMITE_PARES = 10 ** 7  # Pares de não nulos (na mesma coluna) acima disso: A Θ A^T por blocos de colunas
+
+def passo_maximo(v, dv):
+    # Maior α em (0, 1] com v + α dv >= 0
+    negativos = dv < 0
+    if not np.any(negativos):
+        return 1.0
+    return min(1.0, float(np.min(-v[negativos] / dv[negativos])))
+
+class EquacoesNormais:
+    # A Θ A^T sem densificar A. Na MatrizCSC, cada coluna soma θ_j a_j a_j^T nas posições dos seus pares de não nulos,
+    # calculados uma única vez; se forem pares demais (colunas densas), a soma é feita por blocos de colunas densas
+    def __init__(self, A):
+        self.A = A
+        self.pares = None
+        if isinstance(A, MatrizCSC):
+            tamanhos = np.diff(A.ponteiros)
+            por_coluna = tamanhos ** 2
+            if np.sum(por_coluna) <= LIMITE_PARES:
+                coluna = np.repeat(np.arange(A.shape[1]), por_coluna)
+                # Par t da coluna j: (ponteiros[j] + t // k, ponteiros[j] + t % k), com k não nulos na coluna
+                t = np.arange(np.sum(por_coluna)) - np.repeat(np.cumsum(por_coluna) - por_coluna, por_coluna)
+                k = tamanhos[coluna]
+                p, q = A.ponteiros[coluna] + t // k, A.ponteiros[coluna] + t % k
+                self.pares = (coluna, A.indices[p] * A.shape[0] + A.indices[q], A.dados[p] * A.dados[q])
+
+    def matriz(self, theta):
+        A = self.A
+        num_linhas = A.shape[0]
+        if not isinstance(A, MatrizCSC):
+            return (A * theta) @ A.T
+        if self.pares is not None:
+            coluna, posicao, produto = self.pares
+            return np.bincount(posicao, weights=produto * theta[coluna], minlength=num_linhas * num_linhas).reshape(num_linhas, num_linhas)
+        M = np.zeros((num_linhas, num_linhas))
+        for inicio in range(0, A.shape[1], TAMANHO_BLOCO):
+            colunas = np.arange(inicio, min(inicio + TAMANHO_BLOCO, A.shape[1]))
+            bloco = A.colunas_densas(colunas)
+            M += (bloco * theta[colunas]) @ bloco.T
+        return M
+
+# Método primal-dual preditor-corretor de Mehrotra #######################################################################################################################################################################################
+def metodo_pontos_interiores(problema: ProblemaPL, max_iter=MAX_ITER_IPM, tolerancia=TOLERANCIA_IPM, time_limit=None,
+                             registro=None, estatisticas=None):
+    # Resolve a forma padrão (min c^T z, A z = b, z >= 0 com limite superior u opcional, ou z livre) pelo método de Mehrotra.
+    # As livres são divididas em z⁺ - z⁻; as com limite superior ganham a folga w = u - z (e o dual v):
+    #   A x = b,  x + w = u,  A^T y + s - v = c,  x s = μ,  w v = μ.
+    # Cada iteração fatora A Θ A^T (Θ = (S/X + V/W)⁻¹) uma única vez pelo Cholesky e a usa no preditor e no corretor.
+    # A MatrizCSC não é densificada: A x e y^T A pelos não nulos, e A Θ A^T pela EquacoesNormais.
+    # Retorna (status, Z, z, y); status None indica que as iterações divergiram (inviável ou ilimitado).
+    registro = obter_registro(registro)
+    A = problema.matriz_coeficientes
+    if not isinstance(A, MatrizCSC):
+        A = np.asarray(A, dtype=float)
+    b = np.asarray(problema.vetor_b, dtype=float)
+    num_linhas, num_colunas = A.shape
+    livres = ~np.isfinite(np.asarray(problema.limites_inferiores, dtype=float)) if problema.limites_inferiores is not None else np.zeros(num_colunas, dtype=bool)
+    superiores = np.asarray(problema.limites_superiores, dtype=float) if problema.limites_superiores is not None else np.full(num_colunas, np.inf)
+
+    # Colunas do método: as da forma padrão e, no fim, as das partes negativas das livres
+    if isinstance(A, MatrizCSC):
+        negativas = A.selecionar_colunas(np.nonzero(livres)[0])
+        A = A.hstack(negativas.escalar_colunas(-np.ones(negativas.shape[1])))
+    else:
+        A = np.hstack((A, -A[:, livres]))
+    c = np.concatenate((np.asarray(problema.vetor_de_custos, dtype=float), -np.asarray(problema.vetor_de_custos, dtype=float)[livres]))
+    u = np.concatenate((superiores, np.full(int(livres.sum()), np.inf)))
+    limitadas = np.isfinite(u)
+    u_lim = u[limitadas]
+
+    # Ponto inicial de Mehrotra (mínimos quadrados), afastado da fronteira
+    equacoes_normais = EquacoesNormais(A)
+    normais = FatoracaoCholesky(equacoes_normais.matriz(np.ones(A.shape[1])))
+    x = normais.resolver(b) @ A
+    y = normais.resolver(A @ c)
+    s = c - y @ A
+    x += max(-1.5 * np.min(x), 0.0) if len(x) else 0.0
+    s += max(-1.5 * np.min(s), 0.0) if len(s) else 0.0
+    produto = x @ s
+    if len(x) and produto > 0:
+        x, s = x + 0.5 * produto / np.sum(s), s + 0.5 * produto / np.sum(x)
+    x = np.maximum(x, 1.0)
+    s = np.maximum(s, 1.0)
+    x[limitadas] = np.minimum(x[limitadas], np.maximum(0.5 * u_lim, 1e-4))
+    w = np.maximum(u_lim - x[limitadas], np.maximum(0.5 * u_lim, 1e-4))
+    v = np.ones(len(u_lim))
+
+    total_pares = num_colunas + int(livres.sum()) + len(u_lim)
+    norma_b = 1.0 + np.linalg.norm(b, np.inf)
+    norma_c = 1.0 + np.linalg.norm(c, np.inf)
+    inicio = time.perf_counter()
+    # Perto da divergência os passos estouram; isso é tratado pelo teste de divergência, sem avisos do NumPy
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        for iteracao in range(1, max_iter + 1):
+            r_p = b - A @ x
+            r_u = u_lim - x[limitadas] - w
+            r_d = c - y @ A - s
+            r_d[limitadas] += v
+            Z = float(c @ x)
+            dual = float(b @ y - u_lim @ v)
+            mu = (x @ s + w @ v) / total_pares
+            erro_primal = max(np.linalg.norm(r_p, np.inf), np.linalg.norm(r_u, np.inf) if len(r_u) else 0.0) / norma_b
+            erro_dual = np.linalg.norm(r_d, np.inf) / norma_c
+            gap = abs(Z - dual) / (1.0 + abs(Z))
+            registro(lambda: f"Iteração IPM {iteracao}: objetivo {Z:.10g}, primal {erro_primal:.2e}, dual {erro_dual:.2e}, gap {gap:.2e}, μ {mu:.2e}")
+            if erro_primal <= tolerancia and erro_dual <= tolerancia and gap <= tolerancia:
+                return STATUS_OTIMO, Z, x[:num_colunas] - desdobrar(x, livres, num_colunas), y
+            if not np.isfinite(mu) or max(np.max(np.abs(x)), np.max(np.abs(y)) if len(y) else 0.0) > LIMITE_DIVERGENCIA:
+                registro("As iterações do IPM divergiram (PL inviável ou ilimitado)")
+                return None, None, None, None
+            if time_limit is not None and time.perf_counter() - inicio >= time_limit:
+                return STATUS_LIMITE_TEMPO, Z, x[:num_colunas] - desdobrar(x, livres, num_colunas), y
+
+            # Θ e a fatoração das equações normais, usada pelas duas direções
+            theta_inv = s / x
+            theta_inv[limitadas] += v / w
+            theta = 1.0 / theta_inv
+            fatoracao = FatoracaoCholesky(equacoes_normais.matriz(theta))
+
+            def direcao(r_xs, r_wv):
+                # Elimina ds, dv e dw e resolve A Θ A^T dy = r_p + A Θ r
+                r = r_d - r_xs / x
+                r[limitadas] += (r_wv - v * r_u) / w
+                dy = fatoracao.resolver(r_p + A @ (theta * r))
+                dx = theta * (dy @ A - r)
+                dw = r_u - dx[limitadas]
+                ds = (r_xs - s * dx) / x
+                dv = (r_wv - v * dw) / w
+                return dx, dy, ds, dw, dv
+
+            # Preditor (direção afim) e escolha de σ = (μ_afim / μ)^3
+            dx, dy, ds, dw, dv = direcao(-x * s, -w * v)
+            alfa_p = min(passo_maximo(x, dx), passo_maximo(w, dw))
+            alfa_d = min(passo_maximo(s, ds), passo_maximo(v, dv))
+            mu_afim = ((x + alfa_p * dx) @ (s + alfa_d * ds) + (w + alfa_p * dw) @ (v + alfa_d * dv)) / total_pares
+            sigma = (mu_afim / mu) ** 3 if mu > 0 else 0.0
+
+            # Corretor (com o termo de segunda ordem do preditor), reaproveitando a fatoração
+            dx, dy, ds, dw, dv = direcao(sigma * mu - x * s - dx * ds, sigma * mu - w * v - dw * dv)
+            alfa_p = min(1.0, FRACAO_PASSO * min(passo_maximo(x, dx), passo_maximo(w, dw)))
+            alfa_d = min(1.0, FRACAO_PASSO * min(passo_maximo(s, ds), passo_maximo(v, dv)))
+            x += alfa_p * dx
+            w += alfa_p * dw
+            y += alfa_d * dy
+            s += alfa_d * ds
+            v += alfa_d * dv
+            if estatisticas is not None:
+                estatisticas["iteracoes_ipm"] = estatisticas.get("iteracoes_ipm", 0) + 1
+
+    return STATUS_LIMITE_ITERACOES, float(c @ x), x[:num_colunas] - desdobrar(x, livres, num_colunas), y
+
+def desdobrar(x, livres, num_colunas):
+    # Parte negativa z⁻ de cada livre, nas posições da forma padrão (zero nas demais)
+    negativa = np.zeros(num_colunas)
+    negativa[livres] = x[num_colunas:]
+    return negativa
+
+# Crossover ##############################################################################################################################################################################################################################
+def crossover(problema: ProblemaPL, z, y, registro=None):
+    # Leva o ponto interior (z, y) a uma base, em duas fases:
+    #   push primal: parte da base só com artificiais (uma coluna unitária por linha, fixa em 0) e leva cada coluna fora
+    #     dos limites (superbásica), da mais afastada deles para a mais próxima, até um limite (as livres até 0). Se a
+    #     coluna usa uma linha que ainda tem artificial, entra no lugar dela; se uma básica chega antes a um limite, a
+    #     superbásica entra no lugar dela. As artificiais que sobram (linhas dependentes) completam a base, fixas em 0.
+    #   push dual: cada básica num limite com custo reduzido s_j = c_j - y^T a_j não nulo (no sentido em que sairia)
+    #     leva s_j a 0 mudando y pela linha dela de B⁻¹; se uma não básica perder antes a viabilidade dual, ela entra no
+    #     lugar (pivô degenerado: x não muda). O simplex de limpeza começa então mais perto do ótimo.
+    # Retorna (colunas_base, x_inicial, linhas_artificiais), com a artificial da k-ésima linha de linhas_artificiais na
+    # coluna num_colunas + k, ou None se a base final não respeitar os limites
+    registro = obter_registro(registro)
+    A = problema.matriz_coeficientes
+    b = np.asarray(problema.vetor_b, dtype=float)
+    c = np.asarray(problema.vetor_de_custos, dtype=float)
+    num_linhas, num_colunas = A.shape
+    livres = ~np.isfinite(np.asarray(problema.limites_inferiores, dtype=float))
+    inferiores = np.where(livres, -np.inf, 0.0)
+    superiores = np.asarray(problema.limites_superiores, dtype=float)
+    tolerancia = TOLERANCIA_CROSSOVER * (1.0 + np.linalg.norm(b, np.inf))
+
+    # Ponto de partida: z dentro dos limites, com as colunas a menos da tolerância de um limite já nele
+    x = np.clip(np.asarray(z, dtype=float), inferiores, superiores)
+    x[~livres & (x <= tolerancia)] = 0.0
+    perto_superior = np.isfinite(superiores) & (superiores - x <= tolerancia)
+    x[perto_superior] = superiores[perto_superior]
+
+    # Base: a artificial da linha i é a coluna num_colunas + i
+    colunas_base = np.arange(num_colunas, num_colunas + num_linhas)
+    basica = np.zeros(num_colunas, dtype=bool)
+    B = np.eye(num_linhas)
+    fatoracao = FatoracaoLU(B)
+
+    def valores_basicos():
+        # x_B = B⁻¹ (b - N x_N), com as artificiais fora da base em 0
+        return fatoracao.ftran(b - A @ np.where(basica, 0.0, x))
+
+    def pivotar(r, j, alfa):
+        # Retorna True se a fatoração foi refeita (e x_B deve ser recalculado do zero)
+        if colunas_base[r] < num_colunas:
+            basica[colunas_base[r]] = False
+        fatoracao.atualizar(r, alfa)
+        B[:, r] = A[:, j]
+        colunas_base[r] = j
+        basica[j] = True
+        if fatoracao.precisa_refatorar:
+            fatoracao.refatorar(B)
+            return True
+        return False
+
+    # Push primal ##########################################################################################
+    s = c - y @ A
+    tolerancia_dual = TOLERANCIA_CROSSOVER * (1.0 + np.linalg.norm(c, np.inf))
+    distancia = np.minimum(x - inferiores, superiores - x)
+    superbasicas = np.nonzero(distancia > 0)[0]
+    x_B = valores_basicos()
+    for j in superbasicas[np.argsort(-distancia[superbasicas], kind="stable")]:
+        alfa = fatoracao.ftran(A[:, j])
+        minimo_pivo = TOLERANCIA_PIVO_CROSSOVER * max(1.0, np.max(np.abs(alfa)) if num_linhas else 0.0)
+        artificiais = np.nonzero((colunas_base >= num_colunas) & (np.abs(alfa) > minimo_pivo))[0]
+        if len(artificiais):
+            # A coluna entra no lugar da artificial da linha que ela usa, com o ajuste que leva a artificial a 0
+            r = artificiais[np.argmax(np.abs(alfa[artificiais]))]
+            passo = x_B[r] / alfa[r]
+            x[j] += passo
+            x_B = x_B - passo * alfa
+            x_B[r] = x[j]
+            if pivotar(r, j, alfa):
+                x_B = valores_basicos()
+            continue
+
+        # Limite alvo: o que não piora o objetivo pelo custo reduzido do IPM, ou o mais próximo (livres: 0)
+        if livres[j]:
+            alvo = 0.0
+        elif s[j] > tolerancia_dual or not np.isfinite(superiores[j]):
+            alvo = 0.0
+        elif s[j] < -tolerancia_dual:
+            alvo = superiores[j]
+        else:
+            alvo = 0.0 if x[j] <= superiores[j] - x[j] else superiores[j]
+        delta = alvo - x[j]
+        if delta == 0.0:
+            continue
+        # Passo θ em [0, 1]: x_j + θ delta e x_B - θ delta alfa; as básicas estruturais limitam θ
+        variacao = -delta * alfa
+        estruturais = colunas_base < num_colunas
+        indices = np.where(estruturais, colunas_base, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            razoes = np.where(variacao > 0, (superiores[indices] - x_B) / variacao, (inferiores[indices] - x_B) / variacao)
+        limitam = estruturais & (np.abs(alfa) > minimo_pivo) & np.isfinite(razoes)
+        theta, r = 1.0, None
+        if np.any(limitam):
+            razoes = np.maximum(np.where(limitam, razoes, np.inf), 0.0)
+            if razoes.min() < 1.0:
+                # No empate, o maior pivô em módulo
+                empatados = np.nonzero(razoes <= razoes.min() + 1e-12)[0]
+                r = empatados[np.argmax(np.abs(alfa[empatados]))]
+                theta = razoes[r]
+        if r is None:
+            x[j] = alvo
+            x_B = x_B + variacao
+            continue
+        # A básica r chega ao limite antes: sai nele, e a superbásica entra com o valor em que parou
+        saindo = colunas_base[r]
+        x[saindo] = superiores[saindo] if variacao[r] > 0 else inferiores[saindo]
+        x[j] += theta * delta
+        x_B = x_B + theta * variacao
+        x_B[r] = x[j]
+        if pivotar(r, j, alfa):
+            x_B = valores_basicos()
+
+    # Push dual ############################################################################################
+    x[colunas_base[colunas_base < num_colunas]] = x_B[colunas_base < num_colunas]
+    custos_base = np.abs(np.where(colunas_base < num_colunas, s[np.minimum(colunas_base, num_colunas - 1)], 0.0))
+    for r in np.argsort(-custos_base, kind="stable"):
+        j = colunas_base[r]
+        if j >= num_colunas or abs(s[j]) <= tolerancia_dual:
+            continue
+        # Só sai uma básica que já está no limite em que o sinal de s_j a deixa dual viável
+        if not ((s[j] > 0 and x[j] - inferiores[j] <= tolerancia) or (s[j] < 0 and superiores[j] - x[j] <= tolerancia)):
+            continue
+        e_r = np.zeros(num_linhas)
+        e_r[r] = 1.0
+        rho = fatoracao.btran(e_r)
+        alfa_r = rho @ A
+        # y + t s_j rho, t em [0, 1]: s_k - t s_j alfa_rk; as não básicas não podem trocar de sinal (as livres saem de 0)
+        variacao = -s[j] * alfa_r
+        minimo_pivo = TOLERANCIA_PIVO_CROSSOVER * max(1.0, np.max(np.abs(alfa_r)))
+        no_superior = np.isfinite(superiores) & (superiores - x <= tolerancia)
+        nao_basicas = ~basica & (superiores - inferiores > tolerancia) & (np.abs(alfa_r) > minimo_pivo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            razoes = np.where(livres, 0.0, np.maximum(-s / variacao, 0.0))
+        limitam = nao_basicas & (livres | np.where(no_superior, variacao > 0, variacao < 0))
+        t, q = 1.0, None
+        if np.any(limitam):
+            razoes = np.where(limitam, razoes, np.inf)
+            if razoes.min() < 1.0:
+                empatados = np.nonzero(razoes <= razoes.min() + 1e-12)[0]
+                q = empatados[np.argmax(np.abs(alfa_r[empatados]))]
+                t = razoes[q]
+        y = y + t * s[j] * rho
+        s = s + t * variacao
+        if q is not None:
+            # A básica sai no limite em que já está e a não básica q entra com o mesmo valor
+            x[j] = 0.0 if s[j] > 0 else superiores[j]
+            s[q] = 0.0
+            pivotar(r, q, fatoracao.ftran(A[:, q]))
+        else:
+            s[j] = 0.0
+
+    x_B = valores_basicos()
+    estruturais = colunas_base < num_colunas
+    indices = np.where(estruturais, colunas_base, 0)
+    violacao = np.maximum(np.where(estruturais, inferiores[indices], 0.0) - x_B, x_B - np.where(estruturais, superiores[indices], 0.0))
+    if np.any(violacao > tolerancia):
+        registro("Crossover: a base encontrada não é viável")
+        return None
+    linhas_artificiais = (colunas_base[~estruturais] - num_colunas).tolist()
+    if linhas_artificiais:
+        registro(f"Crossover: {len(linhas_artificiais)} linha(s) dependente(s), base completada com artificiais")
+    colunas_base[~estruturais] = num_colunas + np.arange(len(linhas_artificiais))
+    x_inicial = np.concatenate((np.where(basica, 0.0, x), np.zeros(len(linhas_artificiais))))
+    x_inicial[colunas_base] = np.where(estruturais, x_B, 0.0)
+    return colunas_base.tolist(), x_inicial, linhas_artificiais
+
+def resolver(problema: ProblemaPL, usar_crossover=True, max_iter=None, time_limit=None, regra=None, registro=None, estatisticas=None,
+             instrumentacao=None):
+    # Pontos interiores na forma padrão e, com usar_crossover, simplex a partir da base do crossover até uma base ótima.
+    # max_iter limita as iterações do IPM (MAX_ITER_IPM se None) e os pivôs do simplex de limpeza.
+    # Retorna (status, Z, B, colunas_base, solucao, x, y) como metodo_simplex mais os duais y
+    # (B, colunas_base e solucao são None sem crossover), ou None se o IPM ou o crossover falharem
+    # Com instrumentacao, os tempos vão para "pontos_interiores" e "crossover" (escolha da base e simplex de limpeza)
+    registro = obter_registro(registro)
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    inicio = time.perf_counter()
+    with instrumentacao.fase("pontos_interiores"):
+        status, Z, z, y = metodo_pontos_interiores(problema, max_iter=MAX_ITER_IPM if max_iter is None else max_iter,
+                                                   time_limit=time_limit, registro=registro, estatisticas=estatisticas)
+    if status != STATUS_OTIMO:
+        return None
+    if not usar_crossover:
+        return status, Z, None, None, None, z, y
+    with instrumentacao.fase("crossover"):
+        return crossover_simplex(problema, z, y, inicio, max_iter, time_limit, regra, registro, estatisticas, instrumentacao)
+
+def crossover_simplex(problema: ProblemaPL, z, y, inicio, max_iter, time_limit, regra, registro, estatisticas, instrumentacao):
+    # Base do crossover e simplex a partir dela; o limite de tempo conta desde inicio.
+    # As artificiais que completam a base entram como na Fase II: colunas unitárias depois das do problema, fixas em 0
+    base = crossover(problema, z, y, registro)
+    if base is None:
+        return None
+    colunas_base, x_inicial, linhas_artificiais = base
+    registro("\nCrossover: simplex a partir da base do ponto interior\n")
+    if time_limit is not None:
+        time_limit = max(time_limit - (time.perf_counter() - inicio), 0.0)
+    A = problema.matriz_coeficientes
+    custos = np.asarray(problema.vetor_de_custos, dtype=float)
+    variaveis = problema.vetor_variaveis
+    num_colunas = A.shape[1]
+    limites = (np.asarray(problema.limites_inferiores, dtype=float), np.asarray(problema.limites_superiores, dtype=float))
+    if linhas_artificiais:
+        artificiais = len(linhas_artificiais)
+        A = concatenar_colunas(A, linhas_artificiais, 1.0)
+        custos = np.concatenate((custos, np.zeros(artificiais)))
+        variaveis = np.concatenate((np.asarray(variaveis), [f"a_{k + 1}" for k in range(artificiais)]))
+        limites = (np.concatenate((limites[0], np.zeros(artificiais))), np.concatenate((limites[1], np.zeros(artificiais))))
+    Cn, Cb = calcular_vetores_Cn_Cb(A, custos, colunas_base)
+    B, N = calcular_matrizes_B_N(A, colunas_base)
+    status, Z, B, colunas_base, solucao, x = metodo_simplex(
+        B, N, Cb, Cn, problema.vetor_b, variaveis, colunas_base, 0, max_iter=max_iter, time_limit=time_limit, regra=regra,
+        limites=limites, x_inicial=x_inicial, registro=registro, estatisticas=estatisticas, instrumentacao=instrumentacao,
+    )
+    return status, Z, B, colunas_base, solucao, None if x is None else x[:num_colunas], None
@@ -0,0 +1,179 @@
+import numpy as np
+
+from esparsa import MatrizCSC
+from particao import ColunasNaoBasicas
+
+# Regras de precificação (escolha da variável que entra na base) ##########################################################################################################################################################################
+TOLERANCIA_OTIMALIDADE = 1e-9  # Custos reduzidos acima de -tolerância são considerados não negativos
+
+def custos_reduzidos_bloco(y, N, Cn, inicio, fim):
+    # Custos reduzidos só das colunas inicio..fim-1 de N: Cn - y^T N
+    if isinstance(N, ColunasNaoBasicas):
+        produto = N.produto_transposto(y, inicio, fim)  # Lê as colunas de A no lugar
+    elif isinstance(N, MatrizCSC):
+        p0, p1 = N.ponteiros[inicio], N.ponteiros[fim]
+        colunas = N.colunas_dos_dados[p0:p1] - inicio
+        produto = np.bincount(colunas, weights=N.dados[p0:p1] * y[N.indices[p0:p1]], minlength=fim - inicio)
+    else:
+        produto = y @ N[:, inicio:fim]
+    return Cn[inicio:fim] - produto
+
+def linha_pivo(fatoracao, N, k):
+    # Linha k de B⁻¹ N: e_k^T B⁻¹ (por um BTRAN) vezes N
+    e_k = np.zeros(N.shape[0])
+    e_k[k] = 1.0
+    return fatoracao.btran(e_k) @ N
+
+def colunas_em_blocos(N, tamanho=256):
+    # Percorre N em blocos de colunas densas (para não densificar N inteira de uma vez)
+    for inicio in range(0, N.shape[1], tamanho):
+        fim = min(inicio + tamanho, N.shape[1])
+        if isinstance(N, (MatrizCSC, ColunasNaoBasicas)):
+            yield inicio, fim, N.colunas_densas(range(inicio, fim))
+        else:
+            yield inicio, fim, N[:, inicio:fim]
+
+class RegraPrecificacao:
+    # Interface usada pelo método simplex:
+    #   iniciar(fatoracao, N): chamada com a base inicial e de novo quando a base muda fora da regra (simplex dual, base restaurada)
+    #   escolher(y, N, Cn, colunas_nao_base): posição em N da coluna que entra, ou None se a base é ótima
+    #   atualizar(fatoracao, N, j, k, alpha): chamada a cada pivô, antes de a base mudar (alpha = B⁻¹ N_j)
+    nome = ""
+
+    def iniciar(self, fatoracao, N):
+        pass
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        raise NotImplementedError
+
+    def atualizar(self, fatoracao, N, j, k, alpha):
+        pass
+
+class RegraBland(RegraPrecificacao):
+    # Menor índice de variável com custo reduzido negativo: lenta, mas impede ciclagem
+    nome = "bland"
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        custos_reduzidos = custos_reduzidos_bloco(y, N, Cn, 0, N.shape[1])
+        indices_negativos = np.nonzero(custos_reduzidos < -TOLERANCIA_OTIMALIDADE)[0]
+        if len(indices_negativos) == 0:
+            return None
+        return indices_negativos[np.argmin(np.asarray(colunas_nao_base)[indices_negativos])]
+
+class RegraDantzig(RegraPrecificacao):
+    # Custo reduzido mais negativo
+    nome = "dantzig"
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        custos_reduzidos = custos_reduzidos_bloco(y, N, Cn, 0, N.shape[1])
+        j = np.argmin(custos_reduzidos) if len(custos_reduzidos) else None
+        if j is None or custos_reduzidos[j] >= -TOLERANCIA_OTIMALIDADE:
+            return None
+        return j
+
+class RegraParcial(RegraPrecificacao):
+    # Precificação parcial: calcula custos reduzidos só de um bloco de colunas por vez, a partir de onde parou,
+    # e escolhe o mais negativo do primeiro bloco que tiver candidatos
+    nome = "parcial"
+
+    def __init__(self, tamanho_bloco=None):
+        self.tamanho_bloco = tamanho_bloco
+        self.inicio = 0
+
+    def iniciar(self, fatoracao, N):
+        if self.tamanho_bloco is None:
+            # Cerca de 10 blocos, mas nunca blocos pequenos demais
+            self.tamanho_bloco = max(N.shape[1] // 10, 64)
+        self.inicio = 0
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        num_colunas = N.shape[1]
+        if num_colunas == 0:
+            return None
+        percorrido = 0
+        while percorrido < num_colunas:
+            inicio = self.inicio % num_colunas
+            fim = min(inicio + self.tamanho_bloco, num_colunas)
+            custos_reduzidos = custos_reduzidos_bloco(y, N, Cn, inicio, fim)
+            percorrido += fim - inicio
+            self.inicio = fim % num_colunas
+            j = np.argmin(custos_reduzidos)
+            if custos_reduzidos[j] < -TOLERANCIA_OTIMALIDADE:
+                return inicio + j
+        return None
+
+class RegraDevex(RegraPrecificacao):
+    # Devex: aproxima o steepest edge com pesos de um referencial, atualizados só com a linha do pivô
+    nome = "devex"
+
+    def iniciar(self, fatoracao, N):
+        self.pesos = np.ones(N.shape[1])
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        custos_reduzidos = custos_reduzidos_bloco(y, N, Cn, 0, N.shape[1])
+        candidatos = custos_reduzidos < -TOLERANCIA_OTIMALIDADE
+        if not np.any(candidatos):
+            return None
+        pontuacao = np.where(candidatos, custos_reduzidos ** 2 / self.pesos, -1.0)
+        return np.argmax(pontuacao)
+
+    def atualizar(self, fatoracao, N, j, k, alpha):
+        alpha_r = linha_pivo(fatoracao, N, k)
+        pivo = alpha[k]
+        peso_entrada = max(self.pesos[j], 1.0)
+        razoes = alpha_r / pivo
+        self.pesos = np.maximum(self.pesos, razoes ** 2 * peso_entrada)
+        # A variável que sai ocupa a posição j de N
+        self.pesos[j] = max(peso_entrada / pivo ** 2, 1.0)
+        # Pesos muito grandes indicam que o referencial se perdeu: recomeça
+        if self.pesos[j] > 1e6:
+            self.pesos[:] = 1.0
+
+class RegraSteepestEdge(RegraPrecificacao):
+    # Steepest edge: escolhe a aresta de maior descida por unidade de comprimento, d_j² / gamma_j,
+    # com gamma_j = 1 + ||B⁻¹ a_j||². Os pesos são atualizados recursivamente (Goldfarb–Reid) a cada pivô.
+    nome = "steepest"
+
+    def iniciar(self, fatoracao, N):
+        self.pesos = np.ones(N.shape[1])
+        for inicio, fim, colunas in colunas_em_blocos(N):
+            self.pesos[inicio:fim] = 1.0 + np.sum(fatoracao.ftran(colunas) ** 2, axis=0)
+
+    def escolher(self, y, N, Cn, colunas_nao_base):
+        custos_reduzidos = custos_reduzidos_bloco(y, N, Cn, 0, N.shape[1])
+        candidatos = custos_reduzidos < -TOLERANCIA_OTIMALIDADE
+        if not np.any(candidatos):
+            return None
+        pontuacao = np.where(candidatos, custos_reduzidos ** 2 / self.pesos, -1.0)
+        return np.argmax(pontuacao)
+
+    def atualizar(self, fatoracao, N, j, k, alpha):
+        alpha_r = linha_pivo(fatoracao, N, k)
+        pivo = alpha[k]
+        gamma_q = 1.0 + alpha @ alpha  # Peso exato da coluna que entra
+        w = fatoracao.btran(alpha)
+        produto = w @ N  # a_j^T B⁻ᵀ alpha_q para todas as colunas não básicas
+        razoes = alpha_r / pivo
+        self.pesos = np.maximum(self.pesos - 2.0 * razoes * produto + razoes ** 2 * gamma_q, 1.0 + razoes ** 2)
+        # A variável que sai ocupa a posição j de N
+        self.pesos[j] = max(gamma_q / pivo ** 2, 1.0)
+
+REGRAS = {
+    RegraBland.nome: RegraBland,
+    RegraDantzig.nome: RegraDantzig,
+    RegraParcial.nome: RegraParcial,
+    RegraDevex.nome: RegraDevex,
+    RegraSteepestEdge.nome: RegraSteepestEdge,
+}
+
+def criar_regra(regra):
+    # Aceita uma instância, uma classe ou o nome da regra
+    if regra is None:
+        return RegraDantzig()
+    if isinstance(regra, str):
+        if regra not in REGRAS:
+            raise ValueError(f"Regra de precificação desconhecida: {regra}. Opções: {', '.join(REGRAS)}")
+        return REGRAS[regra]()
+    if isinstance(regra, type):
+        return regra()
+    return regra
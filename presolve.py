@@ -0,0 +1,410 @@
+import numpy as np
+from dataclasses import dataclass, field
+
+from esparsa import MatrizCSC
+from funcoes import ProblemaPL, STATUS_INVIAVEL, limites_das_variaveis
+from registro import obter_registro
+
+TOLERANCIA = 1e-9
+
+@dataclass
+class DadosPostsolve:
+    vetor_variaveis: np.ndarray  # Nomes das variáveis do problema original
+    colunas_mantidas: np.ndarray  # Índices (no problema original) das colunas que seguem para o simplex
+    valores_fixos: dict  # Nome -> valor das variáveis eliminadas pelo presolve
+    constante_objetivo: float  # Contribuição das variáveis eliminadas ao custo, na forma de minimização
+    status: str = None  # STATUS_INVIAVEL quando o próprio presolve prova que o PL não tem solução
+    relatorio: dict = field(default_factory=dict)
+    # Para levar os duais de volta ao problema original:
+    linhas_mantidas: np.ndarray = None  # Índices (no problema original) das linhas que seguem para o simplex
+    # (linha, colunas que ainda estavam nela) das linhas vazias, de uma variável e redundantes, na ordem de remoção
+    linhas_removidas: list = field(default_factory=list)
+    # Linha -> colunas que estavam nela quando foram fixadas por limites implícitos (e não por limites declarados iguais)
+    fixadas_implicitas: dict = field(default_factory=dict)
+    # Linha -> (linha de origem do lado direito "<=", escala, linha de origem do ">=", escala), para as linhas que
+    # juntaram um grupo de linhas duplicadas; os coeficientes da linha são os da origem divididos pela escala
+    origem_linhas: dict = field(default_factory=dict)
+
+# Presolve ###############################################################################################################################################################################################################################
+def extrair_trincas(matriz_coeficientes):
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        return matriz_coeficientes.indices.copy(), matriz_coeficientes.colunas_dos_dados.copy(), matriz_coeficientes.dados.copy()
+    linhas, colunas = np.nonzero(matriz_coeficientes)
+    return linhas, colunas, matriz_coeficientes[linhas, colunas].astype(float)
+
+def normalizar_operadores(vetor_operadores):
+    return np.array([{'<': '<=', '>': '>='}.get(op, op) for op in vetor_operadores], dtype=object)
+
+def atividade_minima(linhas, colunas, valores, inferiores, superiores, num_linhas):
+    # Menor valor possível de a_i x dentro dos limites: parte finita e número de termos infinitos, por linha
+    contribuicao = np.where(valores > 0, valores * inferiores[colunas], valores * superiores[colunas])
+    infinitos = ~np.isfinite(contribuicao)
+    finita = np.bincount(linhas, weights=np.where(infinitos, 0.0, contribuicao), minlength=num_linhas)
+    quantidade_infinitos = np.bincount(linhas, weights=infinitos, minlength=num_linhas)
+    return finita, quantidade_infinitos, contribuicao, infinitos
+
+def limites_implicitos(linhas, colunas, valores, vetor_b, sentido, inferiores, superiores, num_linhas, num_colunas):
+    # Para cada linha no sentido "a_i x <= b_i" (as de ">=" entram com sinal trocado), isola cada variável:
+    # a_ij x_j <= b_i - (atividade mínima dos demais termos)
+    finita, quantidade_infinitos, contribuicao, infinitos = atividade_minima(linhas, colunas, valores, inferiores, superiores, num_linhas)
+    outros_infinitos = quantidade_infinitos[linhas] - infinitos
+    utilizavel = sentido[linhas] & (outros_infinitos == 0)
+    resto = finita[linhas] - np.where(infinitos, 0.0, contribuicao)
+    limite = (vetor_b[linhas] - resto) / valores
+
+    novos_superiores = np.full(num_colunas, np.inf)
+    novos_inferiores = np.full(num_colunas, -np.inf)
+    positivos = utilizavel & (valores > 0)
+    negativos = utilizavel & (valores < 0)
+    np.minimum.at(novos_superiores, colunas[positivos], limite[positivos])
+    np.maximum.at(novos_inferiores, colunas[negativos], limite[negativos])
+    return novos_inferiores, novos_superiores
+
+def presolve(problema: ProblemaPL, max_passadas=10, registro=None):
+    # Reduz o PL no formato matricial (antes das folgas/excessos):
+    #   - remove linhas vazias e duplicadas (linhas paralelas viram uma só, com o lado direito mais apertado)
+    #   - transforma linhas com uma única variável em limites dessa variável
+    #   - fixa variáveis com limites iguais (inclusive limites implícitos pela atividade das linhas)
+    #   - remove colunas vazias, fixando a variável no limite mais barato
+    #   - remove linhas redundantes em relação aos limites das variáveis
+    # Os limites (declarados e os vindos de linhas de uma variável) seguem nos vetores de limites do problema reduzido.
+    vetor_variaveis = np.asarray(problema.vetor_variaveis)
+    num_linhas, num_colunas = problema.matriz_coeficientes.shape
+    linhas, colunas, valores = extrair_trincas(problema.matriz_coeficientes)
+    vetor_b = np.array(problema.vetor_b, dtype=float)
+    operadores = normalizar_operadores(problema.vetor_operadores)
+    # Custos na forma de minimização
+    custos = np.array(problema.vetor_de_custos, dtype=float) * (-1.0 if problema.tipo == 1 else 1.0)
+
+    declarados_inf, declarados_sup = limites_das_variaveis(problema)
+    inferiores, superiores = declarados_inf.copy(), declarados_sup.copy()
+
+    linha_ativa = np.ones(num_linhas, dtype=bool)
+    coluna_ativa = np.ones(num_colunas, dtype=bool)
+    valores_fixos = {}
+    constante = 0.0
+    relatorio = {"linhas_vazias": 0, "linhas_duplicadas": 0, "linhas_unitarias": 0, "linhas_redundantes": 0,
+                 "variaveis_fixadas": 0, "colunas_vazias": 0}
+    status = None
+    linhas_removidas = []
+    fixadas_implicitas = {}
+    origem_linhas = {}
+
+    def fixar(j, valor):
+        nonlocal constante, linhas, colunas, valores
+        no_j = colunas == j
+        np.subtract.at(vetor_b, linhas[no_j], valores[no_j] * valor)
+        linhas, colunas, valores = linhas[~no_j], colunas[~no_j], valores[~no_j]
+        constante += custos[j] * valor
+        valores_fixos[vetor_variaveis[j]] = valor
+        coluna_ativa[j] = False
+
+    for _ in range(max_passadas):
+        mudou = False
+
+        # Variáveis com limites iguais: substitui o valor e remove a coluna
+        for j in np.nonzero(coluna_ativa & (superiores - inferiores <= TOLERANCIA))[0]:
+            if inferiores[j] > superiores[j] + TOLERANCIA:
+                status = STATUS_INVIAVEL
+                break
+            if declarados_sup[j] - declarados_inf[j] > TOLERANCIA:
+                for i in linhas[colunas == j]:
+                    fixadas_implicitas.setdefault(i, []).append(j)
+            fixar(j, inferiores[j])
+            relatorio["variaveis_fixadas"] += 1
+            mudou = True
+        if status:
+            break
+
+        quantidade_por_linha = np.bincount(linhas, minlength=num_linhas)
+
+        # Linhas vazias: 0 op b precisa ser verdadeiro
+        for i in np.nonzero(linha_ativa & (quantidade_por_linha == 0))[0]:
+            op, b = operadores[i], vetor_b[i]
+            if (op == '<=' and b < -TOLERANCIA) or (op == '>=' and b > TOLERANCIA) or (op == '=' and abs(b) > TOLERANCIA):
+                status = STATUS_INVIAVEL
+                break
+            linha_ativa[i] = False
+            linhas_removidas.append((i, np.zeros(0, dtype=int)))
+            relatorio["linhas_vazias"] += 1
+            mudou = True
+        if status:
+            break
+
+        # Linhas com uma única variável viram limites
+        unitarias = linha_ativa & (quantidade_por_linha == 1)
+        if np.any(unitarias):
+            for k in np.nonzero(unitarias[linhas])[0]:
+                i, j, a = linhas[k], colunas[k], valores[k]
+                limite = vetor_b[i] / a
+                op = operadores[i]
+                linhas_removidas.append((i, np.array([j])))
+                if a < 0:
+                    op = {'<=': '>=', '>=': '<='}.get(op, op)
+                # O limite vale tanto para o trabalho do presolve quanto para o problema reduzido
+                if op in ('<=', '='):
+                    superiores[j] = min(superiores[j], limite)
+                    declarados_sup[j] = min(declarados_sup[j], limite)
+                if op in ('>=', '='):
+                    inferiores[j] = max(inferiores[j], limite)
+                    declarados_inf[j] = max(declarados_inf[j], limite)
+            mantidas = ~unitarias[linhas]
+            linhas, colunas, valores = linhas[mantidas], colunas[mantidas], valores[mantidas]
+            relatorio["linhas_unitarias"] += int(np.sum(unitarias))
+            linha_ativa[unitarias] = False
+            mudou = True
+            if np.any(inferiores > superiores + TOLERANCIA):
+                status = STATUS_INVIAVEL
+                break
+
+        # Colunas vazias: a variável vai para o limite mais barato (se ele for infinito, o simplex decide)
+        quantidade_por_coluna = np.bincount(colunas, minlength=num_colunas)
+        for j in np.nonzero(coluna_ativa & (quantidade_por_coluna == 0))[0]:
+            if custos[j] > 0:
+                valor = inferiores[j]
+            elif custos[j] < 0:
+                valor = superiores[j]
+            else:
+                valor = min(max(0.0, inferiores[j]), superiores[j])
+            if not np.isfinite(valor):
+                continue
+            fixar(j, valor)
+            relatorio["colunas_vazias"] += 1
+            mudou = True
+
+        # Linhas duplicadas (ou múltiplas positivas uma da outra)
+        mudou |= remover_linhas_duplicadas(linhas, colunas, valores, vetor_b, operadores, linha_ativa, relatorio, origem_linhas)
+        mantidas = linha_ativa[linhas]
+        linhas, colunas, valores = linhas[mantidas], colunas[mantidas], valores[mantidas]
+
+        # Linhas redundantes: satisfeitas por quaisquer valores dentro dos limites declarados
+        sentido_menor = np.isin(operadores, ['<=', '='])
+        sentido_maior = np.isin(operadores, ['>=', '='])
+        finita_min, inf_min, _, _ = atividade_minima(linhas, colunas, valores, declarados_inf, declarados_sup, num_linhas)
+        finita_max, inf_max, _, _ = atividade_minima(linhas, colunas, -valores, declarados_inf, declarados_sup, num_linhas)
+        atividade_max = np.where(inf_max > 0, np.inf, -finita_max)
+        atividade_min = np.where(inf_min > 0, -np.inf, finita_min)
+        redundante_menor = ~sentido_maior & (atividade_max <= vetor_b + TOLERANCIA)
+        redundante_maior = ~sentido_menor & (atividade_min >= vetor_b - TOLERANCIA)
+        redundantes = linha_ativa & (redundante_menor | redundante_maior)
+        if np.any(redundantes):
+            relatorio["linhas_redundantes"] += int(np.sum(redundantes))
+            linhas_removidas.extend((i, colunas[linhas == i]) for i in np.nonzero(redundantes)[0])
+            linha_ativa[redundantes] = False
+            mantidas = linha_ativa[linhas]
+            linhas, colunas, valores = linhas[mantidas], colunas[mantidas], valores[mantidas]
+            mudou = True
+
+        # Limites implícitos pela atividade das linhas: apertam os limites de trabalho e, se um intervalo
+        # se fechar, a variável é fixada na próxima passada (as linhas que geraram o limite continuam no PL)
+        for sinal, sentido in ((1.0, sentido_menor), (-1.0, sentido_maior)):
+            novos_inf, novos_sup = limites_implicitos(linhas, colunas, sinal * valores, sinal * vetor_b, sentido & linha_ativa,
+                                                      inferiores, superiores, num_linhas, num_colunas)
+            inferiores = np.maximum(inferiores, novos_inf)
+            superiores = np.minimum(superiores, novos_sup)
+        mudou |= bool(np.any(coluna_ativa & (superiores - inferiores <= TOLERANCIA)))
+
+        if not mudou:
+            break
+
+    dados = DadosPostsolve(vetor_variaveis, np.nonzero(coluna_ativa)[0], valores_fixos, constante, status, relatorio,
+                           np.nonzero(linha_ativa)[0], linhas_removidas, fixadas_implicitas, origem_linhas)
+    relatorio["linhas_antes"], relatorio["colunas_antes"] = num_linhas, num_colunas
+    if status:
+        relatorio["linhas_depois"], relatorio["colunas_depois"] = 0, 0
+        return None, dados
+
+    reduzido = montar_problema_reduzido(problema, dados, linhas, colunas, valores, vetor_b, operadores, linha_ativa,
+                                        declarados_inf, declarados_sup)
+    relatorio["linhas_depois"], relatorio["colunas_depois"] = reduzido.matriz_coeficientes.shape
+    obter_registro(registro)(lambda: resumo_presolve(dados))
+    return reduzido, dados
+
+def remover_linhas_duplicadas(linhas, colunas, valores, vetor_b, operadores, linha_ativa, relatorio, origem_linhas):
+    # Agrupa as linhas pelos coeficientes normalizados (divididos pelo módulo do primeiro coeficiente, ou seja,
+    # linhas que são múltiplas positivas uma da outra)
+    # e junta cada grupo em uma linha "=" ou em no máximo duas linhas "<=" e ">="
+    ordem = np.lexsort((colunas, linhas))
+    grupos = {}
+    linhas_ordenadas = linhas[ordem]
+    fronteiras = np.nonzero(np.diff(linhas_ordenadas))[0] + 1
+    for trecho in np.split(ordem, fronteiras):
+        if len(trecho) == 0:
+            continue
+        i = linhas[trecho[0]]
+        escala = abs(valores[trecho[0]])
+        chave = (tuple(colunas[trecho]), tuple(np.round(valores[trecho] / escala, 12)))
+        grupos.setdefault(chave, []).append((i, escala, trecho))
+
+    mudou = False
+    for grupo in grupos.values():
+        if len(grupo) < 2:
+            continue
+        inferior, superior = -np.inf, np.inf
+        origem_inferior = origem_superior = None
+        for i, escala, _ in grupo:
+            b = vetor_b[i] / escala
+            # Uma linha que já juntou outro grupo guarda a origem do seu lado direito
+            origem_menor, escala_menor, origem_maior, escala_maior = origem_linhas.get(i, (i, 1.0, i, 1.0))
+            if operadores[i] in ('<=', '=') and b < superior:
+                superior, origem_superior = b, (origem_menor, escala_menor * escala)
+            if operadores[i] in ('>=', '=') and b > inferior:
+                inferior, origem_inferior = b, (origem_maior, escala_maior * escala)
+        # Reaproveita as primeiras linhas do grupo, já normalizadas
+        restantes = list(grupo)
+        if superior < inferior - TOLERANCIA:
+            # Intervalo vazio: mantém as duas linhas e deixa o simplex acusar a inviabilidade
+            novas = [('<=', superior), ('>=', inferior)]
+        elif superior - inferior <= TOLERANCIA:
+            novas = [('=', superior)]
+        else:
+            novas = [(op, b) for op, b in (('<=', superior), ('>=', inferior)) if np.isfinite(b)]
+        for (op, b), (i, escala, trecho) in zip(novas, restantes):
+            valores[trecho] /= escala
+            vetor_b[i] = b
+            operadores[i] = op
+            origem_linhas[i] = (*(origem_superior if op in ('<=', '=') else (None, 1.0)),
+                                *(origem_inferior if op in ('>=', '=') else (None, 1.0)))
+        for i, _, _ in restantes[len(novas):]:
+            linha_ativa[i] = False
+            relatorio["linhas_duplicadas"] += 1
+            mudou = True
+    return mudou
+
+def montar_problema_reduzido(problema, dados, linhas, colunas, valores, vetor_b, operadores, linha_ativa, inferiores, superiores):
+    colunas_mantidas = dados.colunas_mantidas
+    linhas_mantidas = np.nonzero(linha_ativa)[0]
+    nova_linha = np.full(len(linha_ativa), -1)
+    nova_linha[linhas_mantidas] = np.arange(len(linhas_mantidas))
+    nova_coluna = np.full(len(dados.vetor_variaveis), -1)
+    nova_coluna[colunas_mantidas] = np.arange(len(colunas_mantidas))
+
+    vetor_variaveis = dados.vetor_variaveis[colunas_mantidas]
+    variaveis_livres = [var for var in (problema.variaveis_livres if problema.variaveis_livres is not None else []) if var in set(vetor_variaveis)]
+    variaveis_sinal = [var for var in (problema.variaveis_sinal if problema.variaveis_sinal is not None else []) if var in set(vetor_variaveis)]
+
+    trincas_linhas = nova_linha[linhas]
+    trincas_colunas = nova_coluna[colunas]
+    trincas_valores = valores
+    novo_b = vetor_b[linhas_mantidas]
+    novos_operadores = operadores[linhas_mantidas]
+
+    forma = (len(novo_b), len(colunas_mantidas))
+    if problema.esparso:
+        matriz = MatrizCSC.de_trincas(trincas_linhas, trincas_colunas, trincas_valores, forma)
+    else:
+        matriz = np.zeros(forma)
+        matriz[trincas_linhas, trincas_colunas] = trincas_valores
+
+    return ProblemaPL(
+        len(vetor_variaveis), vetor_variaveis, np.array(problema.vetor_de_custos, dtype=float)[colunas_mantidas], matriz,
+        np.array(novo_b, dtype=float), np.array(novos_operadores), None,
+        tipo=problema.tipo, variaveis_livres=np.array(variaveis_livres), variaveis_sinal=np.array(variaveis_sinal),
+        esparso=problema.esparso, limites_inferiores=inferiores[colunas_mantidas], limites_superiores=superiores[colunas_mantidas],
+    )
+
+def resumo_presolve(dados: DadosPostsolve):
+    r = dados.relatorio
+    if dados.status:
+        return "Presolve: o PL é inviável."
+    reducao_linhas = 1 - r["linhas_depois"] / r["linhas_antes"] if r["linhas_antes"] else 0.0
+    reducao_colunas = 1 - r["colunas_depois"] / r["colunas_antes"] if r["colunas_antes"] else 0.0
+    return (f"Presolve: {r['linhas_antes']} -> {r['linhas_depois']} restrições ({100 * reducao_linhas:.1f}% a menos), "
+            f"{r['colunas_antes']} -> {r['colunas_depois']} variáveis ({100 * reducao_colunas:.1f}% a menos)\n"
+            f"  linhas vazias: {r['linhas_vazias']}, duplicadas: {r['linhas_duplicadas']}, de uma variável: {r['linhas_unitarias']}, "
+            f"redundantes: {r['linhas_redundantes']}, variáveis fixadas: {r['variaveis_fixadas']}, colunas vazias: {r['colunas_vazias']}")
+
+# Postsolve ##############################################################################################################################################################################################################################
+def postsolve(dados: DadosPostsolve, valores, Z=None):
+    # valores: nome -> valor das variáveis do problema reduzido (nomes originais)
+    # Devolve o valor de todas as variáveis do problema original e o custo corrigido pelas variáveis eliminadas
+    completos = {}
+    for var in map(str, dados.vetor_variaveis):
+        if var in dados.valores_fixos:
+            completos[var] = float(dados.valores_fixos[var])
+        else:
+            completos[var] = float(valores.get(var, 0.0))
+    return completos, (None if Z is None else Z + dados.constante_objetivo)
+
+def linha_da_matriz(matriz_coeficientes, transposta, i):
+    if transposta is not None:
+        return transposta.colunas_densas([i])[:, 0]
+    return np.asarray(matriz_coeficientes[i], dtype=float)
+
+def intervalo_dual(a, custos_reduzidos, x, inferiores, superiores, tolerancia):
+    # Variações t do dual de uma linha (com coeficientes a) que deixam os custos reduzidos d - t a com o sinal certo:
+    # d >= 0 na variável que está no limite inferior, d <= 0 no superior e d = 0 se estiver entre os dois
+    menor, maior = -np.inf, np.inf
+    for j in np.nonzero(a)[0]:
+        no_inferior = abs(x[j] - inferiores[j]) <= tolerancia
+        no_superior = abs(x[j] - superiores[j]) <= tolerancia
+        if no_inferior and no_superior:
+            continue  # Variável fixa: qualquer sinal serve
+        t = custos_reduzidos[j] / a[j]
+        if not no_inferior and not no_superior:
+            menor, maior = max(menor, t), min(maior, t)
+        elif no_inferior == (a[j] > 0):
+            maior = min(maior, t)
+        else:
+            menor = max(menor, t)
+    return menor, maior
+
+def postsolve_duais(dados: DadosPostsolve, problema: ProblemaPL, custos, y, valores, tolerancia=1e-7):
+    # y: duais das linhas do problema reduzido; problema: o PL original, com custos na forma de minimização;
+    # valores: nome -> valor de todas as variáveis (saída do postsolve).
+    # Devolve (duais, custos reduzidos) do problema original, também na forma de minimização:
+    #   - linha mantida: recebe o dual da linha reduzida (se ela juntou linhas duplicadas, vai para a linha de origem do lado direito)
+    #   - linha removida (de uma variável, que ficou vazia ao fixar variáveis ou redundante), desfeita em ordem inversa:
+    #     recebe o menor dual que deixa com o sinal certo os custos reduzidos das variáveis que ainda estavam nela
+    #     e das fixadas por limites implícitos (em geral 0)
+    matriz_coeficientes = problema.matriz_coeficientes
+    transposta = matriz_coeficientes.transposta() if isinstance(matriz_coeficientes, MatrizCSC) else None
+    vetor_b = np.asarray(problema.vetor_b, dtype=float)
+    inferiores, superiores = limites_das_variaveis(problema)
+    operadores = normalizar_operadores(problema.vetor_operadores)
+    duais = np.zeros(matriz_coeficientes.shape[0])
+
+    def origem(i):
+        # Linhas que não juntaram duplicadas são a própria origem, no sentido do seu operador
+        if i in dados.origem_linhas:
+            return dados.origem_linhas[i]
+        return (i if operadores[i] in ('<=', '=') else None, 1.0, i if operadores[i] in ('>=', '=') else None, 1.0)
+
+    def atribuir(i, valor):
+        origem_menor, escala_menor, origem_maior, escala_maior = origem(i)
+        # Na forma de minimização, o dual de uma linha ">=" é >= 0 e o de uma linha "<=" é <= 0
+        if valor > 0 and origem_maior is not None:
+            duais[origem_maior] += valor / escala_maior
+        elif valor < 0 and origem_menor is not None:
+            duais[origem_menor] += valor / escala_menor
+
+    for i, valor in zip(dados.linhas_mantidas, y):
+        atribuir(i, valor)
+    custos = np.asarray(custos, dtype=float)
+    custos_reduzidos = custos - duais @ matriz_coeficientes
+    x = np.array([valores[var] for var in map(str, dados.vetor_variaveis)])
+    for i, colunas_ativas in reversed(dados.linhas_removidas):
+        origem_menor, escala_menor, origem_maior, escala_maior = origem(i)
+        for linha, escala, sinal in ((origem_maior, escala_maior, 1.0), (origem_menor, escala_menor, -1.0)):
+            if linha is None:
+                continue
+            a = linha_da_matriz(matriz_coeficientes, transposta, linha) / escala
+            ativas = np.zeros(len(a), dtype=bool)
+            ativas[colunas_ativas] = True
+            implicitas = np.zeros(len(a), dtype=bool)
+            implicitas[dados.fixadas_implicitas.get(i, [])] = True
+            menor, maior = intervalo_dual(np.where(ativas, a, 0.0), custos_reduzidos, x, inferiores, superiores, tolerancia)
+            # Sinal do dual pelo sentido da linha de origem
+            menor, maior = (max(menor, 0.0), maior) if sinal > 0 else (menor, min(maior, 0.0))
+            # As fixadas por limites implícitos podem ter vindo de outra linha: só entram se couberem no intervalo
+            menor_implicitas, maior_implicitas = intervalo_dual(np.where(implicitas & ~ativas, a, 0.0), custos_reduzidos, x,
+                                                                inferiores, superiores, tolerancia)
+            if max(menor, menor_implicitas) <= min(maior, maior_implicitas) + tolerancia:
+                menor, maior = max(menor, menor_implicitas), min(maior, maior_implicitas)
+            valor = min(max(0.0, menor), maior)
+            ativa = abs(a @ x - vetor_b[linha] / escala) <= tolerancia * max(1.0, abs(vetor_b[linha] / escala))
+            if valor != 0.0 and menor <= maior + tolerancia and ativa:
+                atribuir(i, valor)
+                custos_reduzidos = custos - duais @ matriz_coeficientes
+                break
+    return duais, custos_reduzidos
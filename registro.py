@@ -0,0 +1,22 @@
+import sys
+
+# Registro (log) das mensagens do solver ##################################################################################################################################################################################################
+class Registro:
+    # Recebe as mensagens do solver como partes (igual ao print). Uma parte pode ser uma função sem argumentos:
+    # ela só é chamada se o registro estiver ativo, então um registro desligado não formata nada
+    # (nem o modelo em texto, nem os vetores de cada iteração).
+    def __init__(self, ativo=True, saida=None):
+        self.ativo = ativo
+        self.saida = saida  # Arquivo de saída; None usa o sys.stdout do momento da escrita
+
+    def __call__(self, *partes):
+        if not self.ativo:
+            return
+        print(*(parte() if callable(parte) else parte for parte in partes), file=self.saida or sys.stdout)
+
+REGISTRO_PADRAO = Registro()
+REGISTRO_SILENCIOSO = Registro(ativo=False)
+
+def obter_registro(registro):
+    # Sem registro informado, as funções continuam imprimindo como antes
+    return REGISTRO_PADRAO if registro is None else registro
@@ -0,0 +1,214 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import escalonamento
+import funcoes
+import mps
+import pontos_interiores
+import presolve as presolve_pl
+import sensibilidade as sensibilidade_pl
+from funcoes import STATUS_OTIMO, STATUS_INVIAVEL
+from instrumentacao import obter_instrumentacao
+from registro import REGISTRO_PADRAO, REGISTRO_SILENCIOSO
+
+@dataclass
+class ResultadoPL:
+    status: str
+    objetivo: float = None  # No sentido do arquivo (max ou min)
+    x: dict = None  # Nome -> valor de cada variável do arquivo
+    duais: np.ndarray = None  # Um por restrição do arquivo: variação do objetivo por unidade de b
+    custos_reduzidos: dict = None  # Nome -> custo reduzido de cada variável do arquivo, no sentido do arquivo
+    base: list = None  # Variáveis básicas da forma padrão (já com folgas, excessos e variáveis x') ao final
+    iteracoes: int = 0  # Pivôs da Fase I e da Fase II
+    sensibilidade: sensibilidade_pl.AnaliseSensibilidade = None  # Com solve(..., sensibilidade=True): preços sombra e faixas
+
+def duais_da_base(B, vetor_de_custos, colunas_base):
+    # y^T = Cb^T B⁻¹, com os custos do problema que o simplex resolveu
+    # (uma artificial que ficou na base numa linha redundante, depois das colunas do problema, custa 0)
+    if len(colunas_base) == 0:
+        return np.zeros(0)
+    custos = np.asarray(vetor_de_custos, dtype=float)
+    custos = np.concatenate((custos, np.zeros(max(max(colunas_base) + 1 - len(custos), 0))))
+    return np.linalg.solve(np.asarray(B, dtype=float).T, custos[colunas_base])
+
+def ler_modelo(arquivo, esparso=False, registro=None):
+    # Arquivos .mps (ou .mps.gz) vão para o leitor MPS; os demais, para o formato de texto ("min 2a + 3b", "s.a.")
+    if str(arquivo).lower().endswith((".mps", ".mps.gz")):
+        return mps.ler_mps(arquivo, esparso=esparso, registro=registro)
+    return funcoes.gerar_formato_matricial(arquivo, esparso=esparso, registro=registro)
+
+def resolver_simplex(simplex, max_iter=None, time_limit=None, regra=None, registro=None, estatisticas=None, instrumentacao=None,
+                     base_inicial=None):
+    # Simplex na forma padrão (com Fase I se a base das folgas não servir). Retorna como metodo_simplex
+    # base_inicial: (colunas da base, x) de uma resolução anterior do mesmo modelo; o simplex parte dela, sem Fase I.
+    #   Uma base que terminou com artificiais (linhas redundantes, colunas além das do problema) não serve de partida
+    registro = registro or REGISTRO_SILENCIOSO
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    limites = (simplex.limites_inferiores, simplex.limites_superiores)
+    if base_inicial is not None:
+        colunas_base, x_inicial = base_inicial
+        num_linhas, num_colunas = simplex.matriz_coeficientes.shape
+        if len(colunas_base) == num_linhas and len(x_inicial) == num_colunas and np.all(colunas_base < num_colunas):
+            registro("\nPartindo da base guardada no cache.\n")
+            colunas_base = [int(j) for j in colunas_base]
+            with instrumentacao.fase("simplex"):
+                try:
+                    B, N, Cb, Cn = funcoes.obter_Cn_Cb_N_B(simplex, colunas_base)
+                    return funcoes.metodo_simplex(
+                        B, N, Cb, Cn, simplex.vetor_b, simplex.vetor_variaveis, colunas_base, 0, max_iter=max_iter,
+                        time_limit=time_limit, regra=regra, limites=limites, x_inicial=x_inicial, registro=registro,
+                        estatisticas=estatisticas, instrumentacao=instrumentacao,
+                    )
+                except np.linalg.LinAlgError:
+                    pass  # Base guardada singular: resolve do zero
+    resultado, colunas_base, _ = funcoes.possui_solucao_basica_viavel(simplex.matriz_coeficientes, limites[1], simplex.vetor_b)
+    if resultado:
+        registro("\nNão precisa de PL extra.\n")
+        with instrumentacao.fase("simplex"):
+            B, N, Cb, Cn = funcoes.obter_Cn_Cb_N_B(simplex, colunas_base)
+            return funcoes.metodo_simplex(
+                B, N, Cb, Cn, simplex.vetor_b, simplex.vetor_variaveis, colunas_base, 0, max_iter=max_iter, time_limit=time_limit,
+                regra=regra, limites=limites, registro=registro, estatisticas=estatisticas, instrumentacao=instrumentacao,
+            )
+    return funcoes.metodo_das_duas_fases(
+        resultado, simplex, max_iter=max_iter, time_limit=time_limit, regra=regra, registro=registro, estatisticas=estatisticas,
+        instrumentacao=instrumentacao,
+    )
+
+@dataclass
+class ModeloCompilado:
+    # Tudo o que vem antes do simplex: o que o CacheModelos guarda em disco
+    original: funcoes.ProblemaPL  # Como foi lido do arquivo
+    dados_postsolve: presolve_pl.DadosPostsolve = None  # None sem presolve; com status, o presolve provou inviabilidade
+    forma_padrao: funcoes.ProblemaPL = None
+    simplex: funcoes.ProblemaPL = None  # A forma padrão escalonada (ou a própria forma padrão, sem escalonamento)
+    escala: escalonamento.Escala = None
+
+def compilar(problema, escalonar=True, usar_presolve=True, esparso=False, registro=None, instrumentacao=None):
+    # Leitura, presolve, forma padrão e escalonamento
+    registro = registro or REGISTRO_SILENCIOSO
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    if isinstance(problema, (str, Path)):
+        with instrumentacao.fase("leitura"):
+            problema = ler_modelo(problema, esparso=esparso, registro=registro)
+    modelo = ModeloCompilado(problema)
+
+    reduzido = problema
+    if usar_presolve:
+        with instrumentacao.fase("presolve"):
+            reduzido, modelo.dados_postsolve = presolve_pl.presolve(problema, registro=registro)
+        if modelo.dados_postsolve.status:
+            return modelo
+    inferiores, superiores = funcoes.limites_das_variaveis(reduzido)
+    if np.any(inferiores > superiores):
+        return modelo  # Limite inferior acima do superior ("x <= -5" com o x >= 0 implícito): sem forma padrão, inviável
+    with instrumentacao.fase("forma_padrao"):
+        modelo.forma_padrao = funcoes.transformar_para_forma_padrao(reduzido, registro=registro)
+    modelo.simplex = modelo.forma_padrao
+    if escalonar:
+        with instrumentacao.fase("escalonamento"):
+            modelo.simplex, modelo.escala = escalonamento.escalonar_problema(modelo.forma_padrao, registro=registro)
+    return modelo
+
+# Resolução sem impressão ################################################################################################################################################################################################################
+def solve(problema, verbose=False, regra=None, escalonar=True, usar_presolve=True, esparso=False,
+          max_iter=None, time_limit=None, registro=None, method="simplex", crossover=True, instrumentacao=None, cache=None,
+          sensibilidade=False):
+    # Resolve o PL (um arquivo de texto ou MPS, ou um ProblemaPL no formato matricial) e devolve um ResultadoPL.
+    # Com verbose=False nada é impresso nem formatado; com verbose=True sai o mesmo texto de antes.
+    # method: "simplex" ou "ipm" (pontos interiores de Mehrotra; com crossover, termina numa base ótima do simplex).
+    # Se o IPM não convergir (PL inviável ou ilimitado) ou o crossover não achar uma base viável, o simplex resolve do zero.
+    # registro: um Registro próprio (por exemplo, gravando em arquivo), no lugar do escolhido por verbose
+    # instrumentacao: Instrumentacao que recebe os tempos de cada fase ("leitura", "presolve", "forma_padrao", "escalonamento",
+    #   "simplex" ou "fase_1"/"fase_2", "pontos_interiores", "crossover", "pos_processamento", "cache", "sensibilidade") e os
+    #   dados de cada pivô; se o callback dela devolver True, a resolução para com status "interrupted"
+    # cache: CacheModelos; um arquivo já compilado (mesmo conteúdo e mesmas opções) é carregado do disco, sem leitura,
+    #   presolve, forma padrão nem escalonamento (e sem o texto do modelo no registro), e o simplex parte da última base ótima
+    # sensibilidade: com True, o resultado traz a AnaliseSensibilidade da base ótima (preços sombra, custos reduzidos e faixas
+    #   dos custos e do lado direito). O presolve fica desligado: ele aperta limites e junta ou remove linhas e colunas, e as
+    #   faixas da base do modelo reduzido não seriam as do arquivo. Sem base ao final (IPM sem crossover), fica None
+    if method not in ("simplex", "ipm"):
+        raise ValueError(f"Método desconhecido: {method}")
+    if registro is None:
+        registro = REGISTRO_PADRAO if verbose else REGISTRO_SILENCIOSO
+    instrumentacao = obter_instrumentacao(instrumentacao)
+    instrumentacao.iniciar_resolucao()
+    usar_presolve = usar_presolve and not sensibilidade
+
+    modelo = chave = None
+    if cache is not None and isinstance(problema, (str, Path)):
+        chave = cache.chave(problema, {"esparso": esparso, "usar_presolve": usar_presolve, "escalonar": escalonar})
+        with instrumentacao.fase("cache"):
+            modelo = cache.carregar(chave)
+    if modelo is None:
+        modelo = compilar(problema, escalonar, usar_presolve, esparso, registro, instrumentacao)
+        if chave is not None:
+            with instrumentacao.fase("cache"):
+                cache.guardar(chave, modelo)
+    if modelo.simplex is None:
+        # O presolve provou a inviabilidade, ou algum limite inferior está acima do superior
+        registro("\n\033[31mPL original inviável!\033[0m (detectado antes do simplex)")
+        return ResultadoPL(STATUS_INVIAVEL)
+    simplex = modelo.simplex
+
+    estatisticas = {"iteracoes": 0}
+    resultado_ipm = None
+    if method == "ipm":
+        resultado_ipm = pontos_interiores.resolver(simplex, usar_crossover=crossover, max_iter=max_iter, time_limit=time_limit,
+                                                   regra=regra, registro=registro, estatisticas=estatisticas,
+                                                   instrumentacao=instrumentacao)
+    if resultado_ipm is not None:
+        status, Z, B, colunas_base, solucao, x, y = resultado_ipm
+    else:
+        base_inicial = cache.carregar_base(chave) if chave is not None else None
+        status, Z, B, colunas_base, solucao, x = resolver_simplex(simplex, max_iter, time_limit, regra, registro, estatisticas,
+                                                                  instrumentacao, base_inicial)
+        y = None
+    if status != STATUS_OTIMO:
+        return ResultadoPL(status, base=None if solucao is None else list(solucao), iteracoes=estatisticas["iteracoes"])
+    if chave is not None:
+        cache.guardar_base(chave, colunas_base, x)
+    with instrumentacao.fase("pos_processamento"):
+        resultado = resultado_otimo(modelo.original, modelo.forma_padrao, simplex, modelo.escala, modelo.dados_postsolve,
+                                    Z, B, colunas_base, solucao, x, y, estatisticas["iteracoes"])
+    if sensibilidade and B is not None:
+        with instrumentacao.fase("sensibilidade"):
+            resultado.sensibilidade = sensibilidade_pl.analisar_sensibilidade(modelo.original, modelo.forma_padrao, simplex,
+                                                                              modelo.escala, B, colunas_base, x)
+    return resultado
+
+def resultado_otimo(original, forma_padrao, simplex, escala, dados_postsolve, Z, B, colunas_base, solucao, x, y, iteracoes):
+    # Volta para as variáveis do arquivo (desfazendo o escalonamento, a forma padrão e o presolve)
+    if y is None:
+        y = duais_da_base(B, simplex.vetor_de_custos, colunas_base)
+    if escala is not None:
+        x = escalonamento.desescalonar_x(escala, x)
+        y = escalonamento.desescalonar_duais(escala, y)
+    valores = funcoes.valores_variaveis_originais(forma_padrao.vetor_variaveis, x, forma_padrao.deslocamentos,
+                                                forma_padrao.sinais_colunas)
+    Z = Z + np.dot(forma_padrao.vetor_de_custos, forma_padrao.deslocamentos)
+    # Linhas multiplicadas por -1 na forma padrão têm o dual com o sinal trocado
+    y = y * forma_padrao.sinais_linhas
+
+    # Duais e custos reduzidos na forma de minimização e depois no sentido do arquivo
+    sinal = -1.0 if original.tipo == 1 else 1.0
+    custos = np.asarray(original.vetor_de_custos, dtype=float) * sinal
+    if dados_postsolve is not None:
+        valores, Z = presolve_pl.postsolve(dados_postsolve, valores, Z)
+        duais, custos_reduzidos = presolve_pl.postsolve_duais(dados_postsolve, original, custos, y, valores)
+    else:
+        duais, custos_reduzidos = y, custos - y @ original.matriz_coeficientes
+    return ResultadoPL(
+        STATUS_OTIMO, float(sinal * Z + original.constante_objetivo), {var: float(valor) for var, valor in valores.items()}, sinal * duais,
+        dict(zip(map(str, original.vetor_variaveis), (sinal * custos_reduzidos).tolist())),
+        None if solucao is None else list(solucao), iteracoes,
+    )
+
+def solve_many(problemas, max_workers=None, **opcoes):
+    # Resolve vários PL (arquivos ou ProblemaPL) em um conjunto de threads e devolve os ResultadoPL na mesma ordem.
+    # Cada resolução só usa as suas próprias instâncias, e o NumPy libera o GIL na álgebra linear (fatoração, FTRAN/BTRAN).
+    # opcoes: os mesmos argumentos de solve (verbose, regra, escalonar, ...)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda problema: solve(problema, **opcoes), problemas))
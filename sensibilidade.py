@@ -0,0 +1,150 @@
+import numpy as np
+from dataclasses import dataclass
+
+import escalonamento
+import funcoes
+from esparsa import MatrizCSC
+from fatoracao import FatoracaoLU
+
+# Análise de sensibilidade da base ótima ###############################################################################################################################################################################################
+# Tudo sai de uma única fatoração da base final, sem resolver o PL de novo: um BTRAN com os custos das básicas dá os
+# preços sombra (y^T = c_B^T B⁻¹), um FTRAN com as m colunas da identidade dá B⁻¹ de uma vez, e as linhas do tableau
+# (B⁻¹ A_N), usadas nas faixas dos custos das básicas, saem de produtos de B⁻¹ por blocos de colunas não básicas.
+# As faixas valem para a base final: dentro delas a mesma base continua ótima (custos) ou viável (lado direito). Em um
+# PL degenerado outra base ótima pode dar faixas diferentes.
+TOLERANCIA_PIVO = 1e-9  # Entradas do tableau menores que isso (em módulo) não limitam as faixas
+TOLERANCIA_LIMITE = 1e-9  # Folga relativa para uma não básica contar como no limite superior (ou como fixa)
+TAMANHO_BLOCO = 256  # Colunas não básicas por produto B⁻¹ A_N
+
+@dataclass
+class AnaliseSensibilidade:
+    # No sentido do arquivo (max ou min), com os nomes das variáveis e das restrições do arquivo
+    precos_sombra: dict  # Restrição -> variação do objetivo por unidade de b
+    custos_reduzidos: dict  # Variável -> custo reduzido
+    faixas_custos: dict  # Variável -> (mínimo, máximo) do custo com a base final ainda ótima
+    faixas_lado_direito: dict  # Restrição -> (mínimo, máximo) de b com a base final ainda viável
+
+def matriz_da_base(matriz_coeficientes, B, colunas_base):
+    # Colunas da base tiradas de A: o B do simplex pode ter colunas negadas (não básicas que estavam no limite superior).
+    # Uma artificial que ficou na base (linha redundante) é uma coluna unitária que só existe no B devolvido.
+    n = matriz_coeficientes.shape[1]
+    estruturais = colunas_base < n
+    base = np.array(B, dtype=float)
+    indices = colunas_base[estruturais]
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        base[:, estruturais] = matriz_coeficientes.colunas_densas(indices)
+    else:
+        base[:, estruturais] = np.asarray(matriz_coeficientes, dtype=float)[:, indices]
+    return base
+
+def limitar(delta_min, delta_max, alfa, folgas, eixo):
+    # Impõe folgas - δ alfa >= 0 em cada entrada: alfa > 0 limita δ por cima, alfa < 0 por baixo.
+    # O eixo é o das restrições que limitam cada δ (reduzido com min/max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        razoes = folgas / alfa
+    np.minimum(delta_max, np.min(np.where(alfa > TOLERANCIA_PIVO, razoes, np.inf), axis=eixo), out=delta_max)
+    np.maximum(delta_min, np.max(np.where(alfa < -TOLERANCIA_PIVO, razoes, -np.inf), axis=eixo), out=delta_min)
+
+def variacoes_na_base(simplex, B, colunas_base, x, tamanho_bloco=TAMANHO_BLOCO):
+    # No problema que o simplex resolveu (forma padrão escalonada): y, d e as variações [mínimo, máximo] de cada custo
+    # (uma linha por coluna) e de cada b_i (uma linha por restrição) que mantêm a base
+    A = simplex.matriz_coeficientes
+    m, n = A.shape
+    custos = np.asarray(simplex.vetor_de_custos, dtype=float)
+    inferiores = np.zeros(n) if simplex.limites_inferiores is None else np.asarray(simplex.limites_inferiores, dtype=float)
+    superiores = np.full(n, np.inf) if simplex.limites_superiores is None else np.asarray(simplex.limites_superiores, dtype=float)
+    x = np.asarray(x, dtype=float)
+    colunas_base = np.asarray(colunas_base, dtype=np.int64)
+    estruturais = colunas_base < n
+    indices_base = np.where(estruturais, colunas_base, 0)
+
+    fatoracao = FatoracaoLU(matriz_da_base(A, B, colunas_base))
+    y = fatoracao.btran(np.where(estruturais, custos[indices_base], 0.0))  # Artificial na base custa 0
+    d = custos - y @ A
+    B_inv = fatoracao.ftran(np.eye(m))
+
+    # Não básicas: no limite inferior, no superior, livres (valor 0, sem limites) ou fixas (l = u, nunca limitam)
+    nao_basicas = np.setdiff1d(np.arange(n), colunas_base[estruturais])
+    l_N, u_N, x_N = inferiores[nao_basicas], superiores[nao_basicas], x[nao_basicas]
+    folga_limite = TOLERANCIA_LIMITE * (1.0 + np.abs(np.where(np.isfinite(u_N), u_N, 0.0)))
+    fixas = np.isfinite(l_N) & (u_N - l_N <= folga_limite)
+    livres = ~np.isfinite(l_N) & ~np.isfinite(u_N)
+    no_superior = ~fixas & np.isfinite(u_N) & (np.abs(x_N - u_N) <= folga_limite)
+    # Custo reduzido do lado em que a base é ótima (>= 0): o próprio d no limite inferior, -d no superior, 0 nas livres
+    sentido = np.where(no_superior, -1.0, 1.0)
+    d_viavel = np.where(livres, 0.0, np.maximum(sentido * d[nao_basicas], 0.0))
+
+    faixas_custos = np.empty((n, 2))
+    faixas_custos[nao_basicas, 0] = np.where(no_superior, -np.inf, -d_viavel)
+    faixas_custos[nao_basicas, 1] = np.where(no_superior, d_viavel, np.inf)
+    faixas_custos[nao_basicas[livres]] = 0.0
+    faixas_custos[nao_basicas[fixas]] = (-np.inf, np.inf)
+
+    # Custo da básica na posição p: c + δ muda d_k para d_k - δ alfa_pk, que não pode sair do lado viável
+    delta_min, delta_max = np.full(m, -np.inf), np.full(m, np.inf)
+    limitantes = np.nonzero(~fixas)[0]
+    for inicio in range(0, len(limitantes), tamanho_bloco):
+        bloco = limitantes[inicio:inicio + tamanho_bloco]
+        colunas = nao_basicas[bloco]
+        A_N = A.colunas_densas(colunas) if isinstance(A, MatrizCSC) else A[:, colunas]
+        alfa = (B_inv @ A_N) * sentido[bloco]
+        limitar(delta_min, delta_max, alfa, d_viavel[bloco], eixo=1)
+        if np.any(livres[bloco]):
+            # Livre não básica: d_k tem que continuar 0, então limita nos dois sentidos
+            limitar(delta_min, delta_max, -alfa[:, livres[bloco]], d_viavel[bloco][livres[bloco]], eixo=1)
+    faixas_custos[colunas_base[estruturais], 0] = delta_min[estruturais]
+    faixas_custos[colunas_base[estruturais], 1] = delta_max[estruturais]
+
+    # b_i + δ muda x_B para x_B + δ B⁻¹ e_i, que tem que ficar nos limites das básicas (artificial: fixa em 0)
+    x_base = np.where(estruturais, x[indices_base], 0.0)
+    folga_superior = np.maximum(np.where(estruturais, superiores[indices_base], 0.0) - x_base, 0.0)[:, None]
+    folga_inferior = np.maximum(x_base - np.where(estruturais, inferiores[indices_base], 0.0), 0.0)[:, None]
+    faixas_lado_direito = np.empty((m, 2))
+    for inicio in range(0, m, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, m)
+        delta_min, delta_max = np.full(fim - inicio, -np.inf), np.full(fim - inicio, np.inf)
+        limitar(delta_min, delta_max, B_inv[:, inicio:fim], folga_superior, eixo=0)
+        limitar(delta_min, delta_max, -B_inv[:, inicio:fim], folga_inferior, eixo=0)
+        faixas_lado_direito[inicio:fim, 0], faixas_lado_direito[inicio:fim, 1] = delta_min, delta_max
+    return y, d, faixas_custos, faixas_lado_direito
+
+def faixa(valor, fator, variacao):
+    # valor + fator * [mínimo, máximo], com os extremos trocados se o fator for negativo
+    extremos = sorted((fator * variacao[0], fator * variacao[1]))
+    return float(valor + extremos[0]), float(valor + extremos[1])
+
+def analisar_sensibilidade(original, forma_padrao, simplex, escala, B, colunas_base, x) -> AnaliseSensibilidade:
+    # Análise da base ótima, de volta ao arquivo. Supõe o modelo sem presolve: as linhas da forma padrão são as do
+    # arquivo, na mesma ordem (algumas multiplicadas por -1), e as colunas são as variáveis do arquivo (x' negadas),
+    # seguidas de folgas e excessos. Os deslocamentos dos limites não mudam as variações, só os valores de partida.
+    y, d, faixas_custos, faixas_lado_direito = variacoes_na_base(simplex, B, colunas_base, x)
+    m, n = simplex.matriz_coeficientes.shape
+    # Sem escala, fatores 1; com escala, c_e = fator_coluna * c e b_e = fator_linha * b
+    fatores_colunas = np.ones(n) if escala is None else escala.fatores_colunas
+    fatores_linhas = np.ones(m) if escala is None else escala.fatores_linhas
+    sinal = -1.0 if original.tipo == 1 else 1.0  # O simplex minimiza -c nos problemas de max
+    sinais_linhas = forma_padrao.sinais_linhas
+
+    if escala is not None:
+        y = escalonamento.desescalonar_duais(escala, y)
+        d = escalonamento.desescalonar_custos_reduzidos(escala, d)
+
+    restricoes = funcoes.nomes_das_restricoes(original)
+    vetor_b = np.asarray(original.vetor_b, dtype=float)
+    precos_sombra = sinal * y * sinais_linhas
+    fatores_b = sinais_linhas / fatores_linhas
+    faixas_b = {nome: faixa(vetor_b[i], fatores_b[i], faixas_lado_direito[i]) for i, nome in enumerate(restricoes)}
+
+    indice = {str(var): j for j, var in enumerate(original.vetor_variaveis)}
+    custos = np.asarray(original.vetor_de_custos, dtype=float)
+    custos_reduzidos, faixas_c = {}, {}
+    # As variáveis do arquivo são as primeiras colunas (uma por sinal); folgas e excessos vêm depois, seja qual for o nome
+    for j, sinal_coluna in enumerate(forma_padrao.sinais_colunas):
+        var = str(forma_padrao.vetor_variaveis[j])
+        # Coluna de x' = -x: custo e custo reduzido com o sinal trocado
+        nome = var[:-1] if sinal_coluna < 0 else var
+        custos_reduzidos[nome] = float(sinal * sinal_coluna * d[j])
+        faixas_c[nome] = faixa(custos[indice[nome]], sinal * sinal_coluna / fatores_colunas[j], faixas_custos[j])
+    return AnaliseSensibilidade(
+        dict(zip(restricoes, precos_sombra.tolist())), custos_reduzidos, faixas_c, faixas_b,
+    )
@@ -0,0 +1,204 @@
+import time
+import numpy as np
+
+import funcoes
+import sensibilidade
+from esparsa import MatrizCSC
+from fatoracao import FatoracaoLU
+from funcoes import ProblemaPL, STATUS_OTIMO, STATUS_INVIAVEL, STATUS_LIMITE_ITERACOES, STATUS_LIMITE_TEMPO, TOLERANCIA_PIVO
+
+TOLERANCIA_PRIMAL = 1e-9  # x_B[i] >= -tolerância é considerado viável
+
+# Método simplex dual ####################################################################################################################################################################################################################
+def colunas_da_matriz(matriz_coeficientes, colunas):
+    if isinstance(matriz_coeficientes, MatrizCSC):
+        return matriz_coeficientes.colunas_densas(colunas)
+    return matriz_coeficientes[:, colunas]
+
+def metodo_simplex_dual(matriz_coeficientes, vetor_de_custos, vetor_b, colunas_base, fatoracao=None,
+                        max_iter=None, time_limit=None, livres=None, superiores=None, sentido=None, B=None):
+    # Parte de uma base dual viável (custos reduzidos >= 0 nas não básicas no limite inferior, <= 0 nas que estão no
+    # superior), possivelmente primal inviável (algum x_B fora dos limites), e pivota até que 0 <= x_B <= u_B.
+    # Retorna (status, Z, colunas_base, x_B, pivos, sentido).
+    # A fatoração passada é atualizada no próprio lugar e, ao final, corresponde à base retornada.
+    # livres: colunas sem limites; nunca saem da base e, fora dela (custo reduzido 0), entram em qualquer sentido
+    # superiores: limite superior de cada coluna (inf se não tiver); sentido: -1 nas não básicas que estão no limite
+    # superior (como no simplex primal), 1 nas demais. As colunas fixas (u = 0) nunca entram na base.
+    # B: matriz da base, obrigatória se alguma artificial da Fase I (índice >= número de colunas) ficou na base por
+    # causa de uma linha redundante. Ela é uma coluna unitária fixa em 0, com custo 0, e não volta depois de sair.
+    num_linhas, num_colunas = matriz_coeficientes.shape
+    colunas_base = np.array(colunas_base, dtype=int)
+    nao_basica = np.ones(num_colunas, dtype=bool)
+    nao_basica[colunas_base[colunas_base < num_colunas]] = False
+    if livres is None:
+        livres = np.zeros(num_colunas, dtype=bool)
+    superiores = np.full(num_colunas, np.inf) if superiores is None else np.asarray(superiores, dtype=float)
+    sentido = np.ones(num_colunas) if sentido is None else np.array(sentido, dtype=float)
+    sentido[~nao_basica] = 1.0
+    fixas = superiores <= 0.0
+
+    B = colunas_da_matriz(matriz_coeficientes, colunas_base) if B is None else np.array(B, dtype=float)
+    if fatoracao is None:
+        fatoracao = FatoracaoLU(B)
+
+    inicio = time.perf_counter()
+    pivos = 0
+    while True:
+        # Não básicas no limite superior entram no lado direito: B x_B = b - N x_N
+        valores = np.where(sentido < 0, superiores, 0.0)
+        lado_direito = vetor_b - matriz_coeficientes @ valores if np.any(sentido < 0) else vetor_b
+        if fatoracao.precisa_refatorar:
+            fatoracao.refatorar(B)
+        x_B = fatoracao.ftran(lado_direito)
+        if not fatoracao.residuo_aceitavel(B, x_B, lado_direito):
+            fatoracao.refatorar(B)
+            x_B = fatoracao.ftran(lado_direito)
+
+        # Linha que sai: a básica mais fora dos limites, abaixo de 0 ou acima de u (as livres podem ficar negativas)
+        estruturais = colunas_base < num_colunas
+        indices = np.where(estruturais, colunas_base, 0)
+        custos_base = np.where(estruturais, vetor_de_custos[indices], 0.0)
+        abaixo = np.where(estruturais & livres[indices], -np.inf, -x_B)
+        acima = x_B - np.where(estruturais, superiores[indices], 0.0)
+        violacao = np.maximum(abaixo, acima)
+        r = np.argmax(violacao) if num_linhas else 0
+        if num_linhas == 0 or violacao[r] <= TOLERANCIA_PRIMAL:
+            Z = custos_base @ x_B + vetor_de_custos @ valores
+            return STATUS_OTIMO, Z, colunas_base.tolist(), x_B, pivos, sentido
+        if max_iter is not None and pivos >= max_iter:
+            return STATUS_LIMITE_ITERACOES, None, colunas_base.tolist(), x_B, pivos, sentido
+        if time_limit is not None and time.perf_counter() - inicio >= time_limit:
+            return STATUS_LIMITE_TEMPO, None, colunas_base.tolist(), x_B, pivos, sentido
+        # x_r abaixo de 0 precisa subir (sinal -1), acima de u precisa descer (sinal 1)
+        sinal = 1.0 if acima[r] > abaixo[r] else -1.0
+
+        # Custos reduzidos no sentido de cada não básica (não negativos, a base é dual viável) e linha r de B⁻¹ A
+        y = fatoracao.btran(custos_base)
+        custos_reduzidos = np.maximum(sentido * (vetor_de_custos - y @ matriz_coeficientes), 0.0)
+        e_r = np.zeros(num_linhas)
+        e_r[r] = 1.0
+        alpha_r = sentido * (fatoracao.btran(e_r) @ matriz_coeficientes)
+
+        custos_reduzidos[livres] = 0.0
+        candidatos = np.nonzero(nao_basica & ~fixas & ((sinal * alpha_r > TOLERANCIA_PIVO) | (livres & (np.abs(alpha_r) > TOLERANCIA_PIVO))))[0]
+        if len(candidatos) == 0:
+            # A linha r não pode ser corrigida: o PL não tem solução viável
+            return STATUS_INVIAVEL, None, colunas_base.tolist(), x_B, pivos, sentido
+
+        # Teste da razão dual; no empate, prefere o maior pivô em módulo
+        razoes = custos_reduzidos[candidatos] / np.abs(alpha_r[candidatos])
+        empatados = candidatos[razoes <= razoes.min() + 1e-12]
+        q = empatados[np.argmax(np.abs(alpha_r[empatados]))]
+
+        # A que sai fica no limite que violava; a que entra vai para B com a coluna original (sem o sentido)
+        coluna_q = colunas_da_matriz(matriz_coeficientes, [q])[:, 0]
+        fatoracao.atualizar(r, fatoracao.ftran(coluna_q))
+        B[:, r] = coluna_q
+        if estruturais[r]:
+            nao_basica[colunas_base[r]] = True
+            sentido[colunas_base[r]] = -1.0 if sinal > 0 else 1.0
+        nao_basica[q] = False
+        sentido[q] = 1.0
+        colunas_base[r] = q
+        pivos += 1
+
+class ProblemaResolvido:
+    # Guarda a forma padrão de um PL já resolvido junto com a base ótima e sua fatoração.
+    # resolve(novo_b) reotimiza pelo simplex dual a partir dessa base: mudar só o lado direito
+    # mantém a base dual viável, então em geral bastam poucos pivôs (sem Fase I).
+    TOLERANCIA_LIMITE = 1e-9  # Folga relativa para uma não básica contar como no limite superior
+
+    def __init__(self, problema: ProblemaPL, status, Z, colunas_base, fatoracao=None, x=None, B=None):
+        self.matriz_coeficientes = problema.matriz_coeficientes
+        self.vetor_de_custos = problema.vetor_de_custos
+        self.vetor_variaveis = problema.vetor_variaveis
+        self.vetor_b = problema.vetor_b
+        self.sinais_linhas = problema.sinais_linhas if problema.sinais_linhas is not None else np.ones(len(problema.vetor_b))
+        num_colunas = len(problema.vetor_variaveis)
+        self.limites_inferiores = problema.limites_inferiores if problema.limites_inferiores is not None else np.zeros(num_colunas)
+        self.limites_superiores = problema.limites_superiores if problema.limites_superiores is not None else np.full(num_colunas, np.inf)
+        self.deslocamentos = problema.deslocamentos if problema.deslocamentos is not None else np.zeros(num_colunas)
+        # Custo das variáveis do arquivo = custo da forma padrão + c^T deslocamentos
+        self.constante_objetivo = float(np.dot(self.vetor_de_custos, self.deslocamentos))
+        self.status = status
+        self.Z = None if Z is None else Z + self.constante_objetivo
+        self.colunas_base = list(colunas_base)
+        # -1 nas não básicas que terminaram no limite superior (x vem da forma padrão, sem as artificiais)
+        self.sentido = np.ones(num_colunas)
+        if x is not None:
+            superiores = self.limites_superiores
+            finitos = np.isfinite(superiores)
+            no_superior = finitos & (np.abs(np.asarray(x) - np.where(finitos, superiores, 0.0))
+                                     <= self.TOLERANCIA_LIMITE * (1.0 + np.abs(np.where(finitos, superiores, 0.0))))
+            no_superior[[j for j in self.colunas_base if j < num_colunas]] = False
+            self.sentido[no_superior & (superiores > 0.0)] = -1.0
+        # Matriz da base: as colunas de A e, para uma artificial que ficou na base (linha redundante), a coluna unitária do B
+        self.B = None
+        if status == STATUS_OTIMO:
+            self.B = (colunas_da_matriz(self.matriz_coeficientes, self.colunas_base) if B is None
+                      else sensibilidade.matriz_da_base(self.matriz_coeficientes, B, np.asarray(self.colunas_base)))
+        self.fatoracao = fatoracao
+        if status == STATUS_OTIMO and self.fatoracao is None:
+            self.fatoracao = FatoracaoLU(self.B)
+
+    def basicas(self, colunas_base, x_B):
+        # Nomes e valores das básicas, sem as artificiais (sempre 0 numa base viável)
+        nomes = self.vetor_variaveis.tolist()
+        estruturais = [k for k, coluna in enumerate(colunas_base) if coluna < len(nomes)]
+        return [nomes[colunas_base[k]] for k in estruturais], np.asarray(x_B)[estruturais]
+
+    def valores_nao_basicos(self):
+        # Valor de cada coluna fora da base: o limite superior nas que estão nele, 0 nas demais
+        return np.where(self.sentido < 0, self.limites_superiores, 0.0)
+
+    def valores_basicos(self):
+        lado_direito = self.vetor_b - self.matriz_coeficientes @ self.valores_nao_basicos()
+        return dict(zip(*self.basicas(self.colunas_base, self.fatoracao.ftran(lado_direito))))
+
+    def valores(self):
+        # Todas as colunas da forma padrão (básicas e não básicas)
+        valores = dict(zip(map(str, self.vetor_variaveis), self.valores_nao_basicos().tolist()))
+        valores.update((str(var), float(valor)) for var, valor in self.valores_basicos().items())
+        return valores
+
+    def resolve(self, novo_b, max_iter=None, time_limit=None):
+        # novo_b segue a orientação das restrições do arquivo; as linhas invertidas na forma padrão são invertidas aqui também
+        if self.status != STATUS_OTIMO:
+            raise ValueError("resolve() precisa de uma base ótima anterior")
+        # Os limites inferiores deslocados também descontam do novo lado direito: b - A d
+        vetor_b = np.asarray(novo_b, dtype=float) * self.sinais_linhas - self.matriz_coeficientes @ self.deslocamentos
+        status, Z, colunas_base, x_B, pivos, sentido = metodo_simplex_dual(
+            self.matriz_coeficientes, self.vetor_de_custos, vetor_b, self.colunas_base, self.fatoracao,
+            max_iter=max_iter, time_limit=time_limit, livres=~np.isfinite(self.limites_inferiores),
+            superiores=self.limites_superiores, sentido=self.sentido, B=self.B,
+        )
+        if Z is not None:
+            Z = Z + self.constante_objetivo
+        if status == STATUS_OTIMO:
+            # A nova base ótima vira o ponto de partida da próxima chamada
+            self.vetor_b, self.Z, self.colunas_base, self.sentido = vetor_b, Z, colunas_base, sentido
+            self.B = sensibilidade.matriz_da_base(self.matriz_coeficientes, self.B, np.asarray(colunas_base))
+        else:
+            # A fatoração foi alterada durante a tentativa: volta para a última base ótima
+            self.fatoracao.refatorar(self.B)
+        return (status, Z, *self.basicas(colunas_base, x_B))
+
+def resolver_problema(problema: ProblemaPL, regra=None, max_iter=None, time_limit=None, registro=None):
+    # Resolve a forma padrão (com Fase I se preciso) e devolve um ProblemaResolvido pronto para resolve(novo_b)
+    limites = None if problema.limites_superiores is None else (problema.limites_inferiores, problema.limites_superiores)
+    resultado, colunas_base, colunas_nao_encontradas = funcoes.possui_solucao_basica_viavel(
+        problema.matriz_coeficientes, None if limites is None else limites[1], problema.vetor_b
+    )
+    if resultado:
+        B, N, Cb, Cn = funcoes.obter_Cn_Cb_N_B(problema, colunas_base)
+        fatoracao = FatoracaoLU(B)
+        status, Z, B, colunas_base, solucao, x = funcoes.metodo_simplex(
+            B, N, Cb, Cn, problema.vetor_b, problema.vetor_variaveis, colunas_base, 0,
+            fatoracao=fatoracao, max_iter=max_iter, time_limit=time_limit, regra=regra, limites=limites, registro=registro,
+        )
+    else:
+        status, Z, B, colunas_base, solucao, x = funcoes.metodo_das_duas_fases(
+            resultado, problema, max_iter=max_iter, time_limit=time_limit, regra=regra, registro=registro,
+        )
+        fatoracao = None  # Refeita a partir das colunas da base ótima
+    return ProblemaResolvido(problema, status, Z, colunas_base, fatoracao, x, B)
@@ -0,0 +1,198 @@
+import numpy as np
+from dataclasses import dataclass
+
+from esparsa import MatrizCSC
+from funcoes import (ProblemaPL, STATUS_OTIMO, STATUS_ILIMITADO, STATUS_INVIAVEL, STATUS_LIMITE_ITERACOES,
+                     LIMITE_PIVOS_DEGENERADOS, TOLERANCIA_PIVO, limites_das_variaveis)
+from precificacao import TOLERANCIA_OTIMALIDADE
+
+TOLERANCIA_VIABILIDADE = 1e-9  # Custo da Fase I abaixo disso (relativo a |b|) é considerado zero
+
+@dataclass
+class ResultadoCenarios:
+    status: np.ndarray  # Um status por cenário
+    objetivo: np.ndarray  # No sentido do arquivo; nan nos cenários sem solução ótima
+    x: np.ndarray  # Cenários x variáveis do arquivo; nan nos cenários sem solução ótima
+    vetor_variaveis: np.ndarray
+    iteracoes: np.ndarray  # Pivôs de cada cenário (Fase I + Fase II)
+
+@dataclass
+class FormaPadraoLote:
+    # Forma padrão min c_z^T z  s.a.  A z = r, z >= 0, montada uma vez para todos os cenários:
+    # x = deslocamentos + T z (x do arquivo), r = b - A_original deslocamentos (mais as linhas de limite superior)
+    matriz: np.ndarray  # m x N: colunas z seguidas das folgas/excessos
+    transformacao: np.ndarray  # n x num_z
+    deslocamentos: np.ndarray
+    limites_linhas: np.ndarray  # Lado direito (fixo) das linhas z_j <= u_j - l_j, que ficam no fim
+    colunas_folga: np.ndarray  # Coluna da folga (+1) ou do excesso (-1) de cada linha, ou -1
+    sinais_folga: np.ndarray
+
+# Forma padrão compartilhada ############################################################################################################################################################################################################
+def montar_forma_padrao_lote(problema: ProblemaPL):
+    # Sem depender de b (que muda de cenário para cenário): as linhas com b < 0 não são invertidas aqui,
+    # quem cuida disso é o sinal das artificiais no simplex em lote
+    A = problema.matriz_coeficientes
+    if isinstance(A, MatrizCSC):
+        A = A.colunas_densas(range(A.shape[1]))
+    A = np.asarray(A, dtype=float)
+    num_linhas, num_variaveis = A.shape
+    inferiores, superiores = limites_das_variaveis(problema)
+
+    # Cada variável vira uma coluna z >= 0 (x = l + z ou x = u - z) ou duas, se for livre (x = z⁺ - z⁻)
+    colunas = []  # (variável, sinal)
+    deslocamentos = np.zeros(num_variaveis)
+    limites = []  # (coluna z, u - l)
+    for j in range(num_variaveis):
+        if np.isfinite(inferiores[j]):
+            deslocamentos[j] = inferiores[j]
+            colunas.append((j, 1.0))
+            if np.isfinite(superiores[j]):
+                limites.append((len(colunas) - 1, superiores[j] - inferiores[j]))
+        elif np.isfinite(superiores[j]):
+            deslocamentos[j] = superiores[j]
+            colunas.append((j, -1.0))
+        else:
+            colunas.extend(((j, 1.0), (j, -1.0)))
+    transformacao = np.zeros((num_variaveis, len(colunas)))
+    for k, (j, sinal) in enumerate(colunas):
+        transformacao[j, k] = sinal
+
+    # Linhas do arquivo seguidas das linhas de limite superior
+    linhas_limite = np.zeros((len(limites), len(colunas)))
+    linhas_limite[np.arange(len(limites)), [k for k, _ in limites]] = 1.0
+    matriz = np.vstack((A @ transformacao, linhas_limite))
+    operadores = [{'<': '<=', '>': '>='}.get(op, op) for op in problema.vetor_operadores] + ['<='] * len(limites)
+
+    # Folgas (+e_i) nas linhas "<=" e excessos (-e_i) nas ">="
+    total_linhas = len(operadores)
+    com_folga = [i for i, op in enumerate(operadores) if op != '=']
+    sinais_folga = np.zeros(total_linhas)
+    colunas_folga = np.full(total_linhas, -1)
+    folgas = np.zeros((total_linhas, len(com_folga)))
+    for k, i in enumerate(com_folga):
+        sinais_folga[i] = 1.0 if operadores[i] == '<=' else -1.0
+        colunas_folga[i] = len(colunas) + k
+        folgas[i, k] = sinais_folga[i]
+    return FormaPadraoLote(np.hstack((matriz, folgas)), transformacao, deslocamentos,
+                           np.array([u for _, u in limites], dtype=float), colunas_folga, sinais_folga)
+
+# Simplex em lote ########################################################################################################################################################################################################################
+def simplex_em_lote(A, custos, lados_direitos, colunas_folga, sinais_folga, max_iter=None):
+    # Resolve min c_k^T z  s.a.  A z = r_k, z >= 0  para todos os cenários k ao mesmo tempo (simplex revisado com
+    # as bases empilhadas em um array K x m x m e np.linalg.solve em lote). A artificial da linha i do cenário k
+    # é sinal(r_k[i]) e_i, então as linhas com r < 0 não precisam ser invertidas. As artificiais nunca entram na base;
+    # na Fase II, uma artificial que sobrou na base (em zero) sai no primeiro pivô em que a sua linha for afetada.
+    # Cada iteração trabalha só com os cenários ainda ativos (máscara dos que já terminaram).
+    # Retorna (status, z, iteracoes).
+    num_cenarios, num_linhas = lados_direitos.shape
+    num_colunas = A.shape[1]
+    sinais = np.where(lados_direitos < 0, -1.0, 1.0)
+    colunas_estendidas = np.vstack((A.T, np.eye(num_linhas)))  # Linha p = coluna p de [A | I]
+
+    # Base inicial: a folga (ou o excesso) da linha quando ela já é viável, senão a artificial
+    base = np.tile(num_colunas + np.arange(num_linhas), (num_cenarios, 1))
+    com_folga = colunas_folga >= 0
+    viavel = com_folga & (lados_direitos * sinais_folga >= 0)
+    base[viavel] = np.broadcast_to(colunas_folga, base.shape)[viavel]
+
+    custos_fase1 = np.concatenate((np.zeros(num_colunas), np.ones(num_linhas)))
+    fase = np.where(np.any(base >= num_colunas, axis=1), 1, 2)
+    status = np.full(num_cenarios, None, dtype=object)
+    z = np.full((num_cenarios, num_colunas), np.nan)
+    iteracoes = np.zeros(num_cenarios, dtype=int)
+    degenerados = np.zeros(num_cenarios, dtype=int)
+    ativos = np.arange(num_cenarios)
+
+    while len(ativos):
+        bas = base[ativos]
+        artificial = bas >= num_colunas
+        linha_artificial = np.where(artificial, bas - num_colunas, 0)
+        fator = np.where(artificial, np.take_along_axis(sinais[ativos], linha_artificial, axis=1), 1.0)
+        Bt = colunas_estendidas[bas] * fator[..., None]  # Bt[k] = B_k^T
+        B = Bt.transpose(0, 2, 1)
+        r = lados_direitos[ativos]
+        x_B = np.linalg.solve(B, r[..., None])[..., 0]
+
+        # Custos da fase de cada cenário; na Fase II as artificiais custam 0 (ficam em zero)
+        na_fase1 = fase[ativos] == 1
+        c = np.where(na_fase1[:, None], custos_fase1[:num_colunas], custos[ativos])
+        c_B = np.where(artificial, np.where(na_fase1[:, None], 1.0, 0.0), np.take_along_axis(c, np.where(artificial, 0, bas), axis=1))
+        y = np.linalg.solve(Bt, c_B[..., None])[..., 0]
+        d = c - y @ A
+        linhas_k, posicoes = np.nonzero(~artificial)
+        d[linhas_k, bas[linhas_k, posicoes]] = np.inf  # Básicas não entram
+
+        # Precificação: Dantzig, ou Bland (menor índice) depois de muitos pivôs degenerados seguidos
+        candidatos = d < -TOLERANCIA_OTIMALIDADE
+        usar_bland = degenerados[ativos] >= LIMITE_PIVOS_DEGENERADOS
+        q = np.where(usar_bland, np.argmax(candidatos, axis=1), np.argmin(d, axis=1))
+        otimo = ~np.any(candidatos, axis=1)
+
+        # Fim da Fase I: custo zero passa para a Fase II, custo positivo é inviável
+        custo_fase1 = np.sum(np.where(artificial, x_B, 0.0), axis=1)
+        fim_fase1 = otimo & na_fase1
+        inviavel = fim_fase1 & (custo_fase1 > TOLERANCIA_VIABILIDADE * (1.0 + np.abs(r).sum(axis=1)))
+        status[ativos[inviavel]] = STATUS_INVIAVEL
+        fase[ativos[fim_fase1 & ~inviavel]] = 2
+        fim_fase2 = otimo & ~na_fase1
+        status[ativos[fim_fase2]] = STATUS_OTIMO
+        k_otimo = np.nonzero(fim_fase2)[0]
+        z[ativos[k_otimo]] = 0.0
+        estruturais = ~artificial[k_otimo]
+        linhas_otimo = np.nonzero(estruturais)
+        z[ativos[k_otimo[linhas_otimo[0]]], bas[k_otimo][estruturais]] = x_B[k_otimo][estruturais]
+
+        # Teste da razão dos cenários que pivotam
+        pivotam = ~otimo
+        if max_iter is not None:
+            no_limite = pivotam & (iteracoes[ativos] >= max_iter)
+            status[ativos[no_limite]] = STATUS_LIMITE_ITERACOES
+            pivotam &= ~no_limite
+        k_piv = np.nonzero(pivotam)[0]
+        if len(k_piv):
+            coluna_q = A[:, q[k_piv]].T
+            alpha = np.linalg.solve(B[k_piv], coluna_q[..., None])[..., 0]
+            x_piv = np.maximum(x_B[k_piv], 0.0)
+            razoes = np.where(alpha > TOLERANCIA_PIVO, x_piv / np.where(alpha > TOLERANCIA_PIVO, alpha, 1.0), np.inf)
+            # Na Fase II, uma artificial básica (em zero) bloqueia com razão 0 em qualquer sentido
+            presa = artificial[k_piv] & ~na_fase1[k_piv, None] & (np.abs(alpha) > TOLERANCIA_PIVO)
+            razoes = np.where(presa, 0.0, razoes)
+            t_star = razoes.min(axis=1)
+            ilimitado = ~np.isfinite(t_star)
+            status[ativos[k_piv[ilimitado]]] = STATUS_ILIMITADO
+
+            # Linha que sai: menor razão; no empate, a variável básica de menor índice
+            empatados = razoes <= t_star[:, None] + 1e-12
+            saida = np.argmin(np.where(empatados, bas[k_piv], np.iinfo(np.int64).max), axis=1)
+            troca = ~ilimitado
+            cenarios = ativos[k_piv[troca]]
+            base[cenarios, saida[troca]] = q[k_piv[troca]]
+            iteracoes[cenarios] += 1
+            degenerados[cenarios] = np.where(t_star[troca] <= TOLERANCIA_PIVO, degenerados[cenarios] + 1, 0)
+
+        ativos = ativos[status[ativos] == None]  # noqa: E711 (comparação elemento a elemento)
+
+    return status, z, iteracoes
+
+def resolver_cenarios(problema: ProblemaPL, custos=None, lados_direitos=None, max_iter=None):
+    # Resolve de uma vez vários cenários de um PL com a mesma matriz A (e os mesmos operadores e limites),
+    # mudando só c e/ou b. custos: K x n (ou n, igual para todos); lados_direitos: K x m (ou m); None usa os do problema.
+    # Ambos seguem o sentido do arquivo (max/min e orientação das restrições).
+    custos = np.atleast_2d(np.asarray(problema.vetor_de_custos if custos is None else custos, dtype=float))
+    lados_direitos = np.atleast_2d(np.asarray(problema.vetor_b if lados_direitos is None else lados_direitos, dtype=float))
+    num_cenarios = max(len(custos), len(lados_direitos))
+    custos = np.broadcast_to(custos, (num_cenarios, custos.shape[1]))
+    lados_direitos = np.broadcast_to(lados_direitos, (num_cenarios, lados_direitos.shape[1]))
+
+    forma = montar_forma_padrao_lote(problema)
+    sinal = -1.0 if problema.tipo == 1 else 1.0
+    # Lado direito de cada cenário: b - A d nas linhas do arquivo, u - l (fixo) nas linhas de limite
+    deslocado = problema.matriz_coeficientes @ forma.deslocamentos
+    r = np.hstack((lados_direitos - deslocado, np.broadcast_to(forma.limites_linhas, (num_cenarios, len(forma.limites_linhas)))))
+    num_folgas = forma.matriz.shape[1] - forma.transformacao.shape[1]
+    c_z = np.hstack((sinal * custos @ forma.transformacao, np.zeros((num_cenarios, num_folgas))))
+
+    status, z, iteracoes = simplex_em_lote(forma.matriz, c_z, r, forma.colunas_folga, forma.sinais_folga, max_iter)
+    x = forma.deslocamentos + z[:, :forma.transformacao.shape[1]] @ forma.transformacao.T
+    objetivo = np.einsum("kj,kj->k", custos, x) + problema.constante_objetivo
+    return ResultadoCenarios(status, objetivo, x, np.asarray(problema.vetor_variaveis), iteracoes)
@@ -0,0 +1,50 @@
+# Cache de modelos compilados: um arquivo repetido é carregado do disco e o simplex parte da última base ótima.
+#
+# Uso: python -m pytest tests
+import pytest
+
+import cache_modelos
+import resolvedor
+
+MODELO = "max 3x + 2y + 4z\ns.a. x + y + 2z <= 4\n2x + z <= 5\nx + 3y + z <= 7\n"
+
+def test_acerto_parte_da_base_guardada(tmp_path):
+    arquivo = tmp_path / "modelo.txt"
+    arquivo.write_text(MODELO)
+    cache = cache_modelos.CacheModelos(tmp_path / "cache")
+    primeiro = resolvedor.solve(str(arquivo), cache=cache)
+    assert (cache.acertos, cache.faltas) == (0, 1)
+    assert primeiro.iteracoes > 0
+
+    chave = cache.chave(str(arquivo), {"esparso": False, "usar_presolve": True, "escalonar": True})
+    assert cache.carregar_base(chave) is not None
+    segundo = resolvedor.solve(str(arquivo), cache=cache)
+    assert (cache.acertos, cache.faltas) == (1, 1)
+    assert segundo.iteracoes == 0  # A base guardada já é ótima: nem Fase I nem pivôs
+    assert segundo.objetivo == pytest.approx(primeiro.objetivo)
+    assert segundo.x == pytest.approx(primeiro.x)
+    assert segundo.duais == pytest.approx(primeiro.duais)
+
+def test_arquivo_alterado_e_outras_opcoes_nao_acertam(tmp_path):
+    arquivo = tmp_path / "modelo.txt"
+    arquivo.write_text(MODELO)
+    cache = cache_modelos.CacheModelos(tmp_path / "cache")
+    resolvedor.solve(str(arquivo), cache=cache)
+    resolvedor.solve(str(arquivo), cache=cache, usar_presolve=False)
+    arquivo.write_text(MODELO.replace("<= 4", "<= 3"))
+    resultado = resolvedor.solve(str(arquivo), cache=cache)
+    assert (cache.acertos, cache.faltas) == (0, 3)
+    assert resultado.objetivo == pytest.approx(resolvedor.solve(str(arquivo)).objetivo)
+    assert len(cache.entradas()) == 3
+
+def test_lru_remove_a_entrada_mais_antiga(tmp_path):
+    cache = cache_modelos.CacheModelos(tmp_path / "cache")
+    for k in range(2):
+        arquivo = tmp_path / f"modelo{k}.txt"
+        arquivo.write_text(MODELO.replace("<= 4", f"<= {4 + k}"))
+        resolvedor.solve(str(arquivo), cache=cache)
+        # Cabe uma entrada e meia: a segunda tira a primeira
+        cache.tamanho_maximo = cache.tamanho() * 3 // 2
+    entradas = cache.entradas()
+    assert len(entradas) == 1
+    assert entradas[0][2].endswith(cache.chave(str(arquivo), {"esparso": False, "usar_presolve": True, "escalonar": True}))
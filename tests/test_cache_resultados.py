@@ -0,0 +1,65 @@
+# Cache de resultados: uma cópia do modelo com linhas permutadas, sinais trocados e outros nomes acerta a mesma entrada,
+# e o resultado guardado volta na ordem, nos sinais e nos nomes de quem pediu.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import cache_resultados
+import resolvedor
+from funcoes import ProblemaPL
+
+def original():
+    # min 2x + 3y + z:  A: x + y + z >= 4,  B: x - y = 1,  C: x + 3z <= 9
+    # Ótimo não degenerado (x = 6/5, y = 1/5, z = 13/5, as três linhas ativas): duais e faixas únicos
+    return ProblemaPL(3, np.array(["x", "y", "z"]), np.array([2.0, 3.0, 1.0]),
+                      np.array([[1.0, 1.0, 1.0], [1.0, -1.0, 0.0], [1.0, 0.0, 3.0]]), np.array([4.0, 1.0, 9.0]),
+                      np.array([">=", "=", "<="]), None, nomes_restricoes=np.array(["A", "B", "C"]))
+
+def copia():
+    # As linhas na ordem C, A, B, com A escrita como "<=" e B multiplicada por -1, e as variáveis renomeadas
+    return ProblemaPL(3, np.array(["a", "b", "c"]), np.array([2.0, 3.0, 1.0]),
+                      np.array([[1.0, 0.0, 3.0], [-1.0, -1.0, -1.0], [-1.0, 1.0, 0.0]]), np.array([9.0, -4.0, -1.0]),
+                      np.array(["<=", "<=", "="]), None, nomes_restricoes=np.array(["c3", "a1", "b2"]))
+
+def test_forma_canonica_igual():
+    assert cache_resultados.forma_canonica(original()).chave == cache_resultados.forma_canonica(copia()).chave
+    # Outro lado direito é outro modelo
+    diferente = copia()
+    diferente.vetor_b[0] = 8.0
+    assert cache_resultados.forma_canonica(diferente).chave != cache_resultados.forma_canonica(original()).chave
+
+def test_copia_permutada_acerta_e_adapta():
+    cache = cache_resultados.CacheResultados()
+    guardado = cache.solve(original(), sensibilidade=True)
+    assert guardado.status == "optimal"
+    adaptado = cache.solve(copia(), sensibilidade=True)
+    assert (cache.acertos, cache.faltas) == (1, 1)
+
+    # O resultado adaptado é o mesmo de resolver a cópia do zero
+    direto = resolvedor.solve(copia(), sensibilidade=True)
+    assert adaptado.objetivo == pytest.approx(direto.objetivo)
+    assert adaptado.x == pytest.approx(direto.x)
+    assert adaptado.custos_reduzidos == pytest.approx(direto.custos_reduzidos)
+    np.testing.assert_allclose(adaptado.duais, direto.duais, atol=1e-9)
+    assert adaptado.x == pytest.approx({"a": 1.2, "b": 0.2, "c": 2.6})
+    # Duais do original: A 2.8, B -0.2, C -0.6. Linha trocada de sinal tem o dual trocado (A >= 4 vira -x - y - z <= -4)
+    np.testing.assert_allclose(adaptado.duais, [-0.6, -2.8, 0.2], atol=1e-9)
+    np.testing.assert_allclose(guardado.duais, [2.8, -0.2, -0.6], atol=1e-9)
+
+    analise, referencia = adaptado.sensibilidade, direto.sensibilidade
+    assert list(analise.precos_sombra) == ["c3", "a1", "b2"]
+    assert analise.precos_sombra == pytest.approx(referencia.precos_sombra)
+    assert analise.custos_reduzidos == pytest.approx(referencia.custos_reduzidos)
+    for nome, faixa in referencia.faixas_lado_direito.items():
+        assert analise.faixas_lado_direito[nome] == pytest.approx(faixa)
+    for var, faixa in referencia.faixas_custos.items():
+        assert analise.faixas_custos[var] == pytest.approx(faixa)
+
+def test_mesmo_modelo_devolve_o_objeto_guardado():
+    cache = cache_resultados.CacheResultados()
+    primeiro = cache.solve(original())
+    assert cache.solve(original()) is primeiro
+    # Opções que mudam o resultado entram na chave
+    cache.solve(original(), usar_presolve=False)
+    assert (cache.acertos, cache.faltas) == (1, 2)
@@ -0,0 +1,27 @@
+# Linhas de uma variável no formato de texto viram limites, com o mesmo significado que tinham como linhas da matriz:
+# apertam o domínio da variável (x >= 0, ou sem limite inferior se "livre" ou declarada "x <= 0").
+#
+# Uso: python -m pytest tests
+import pytest
+
+import resolvedor
+
+CASOS = [
+    # (restrições além de "x + y >= -10", status, objetivo de min x + y, x)
+    (["x <= -5"], "infeasible", None, None),  # x >= 0 continua valendo
+    (["x <= 0"], "optimal", -10.0, -10.0),  # Declaração de sinal: x <= 0, sem limite inferior
+    (["x <= 0", "x <= -5"], "optimal", -10.0, -10.0),
+    (["x >= -5"], "optimal", 0.0, 0.0),  # Não libera x abaixo de 0
+    (["x livre", "x >= -5"], "optimal", -5.0, -5.0),  # Livre, com o limite declarado
+]
+
+@pytest.mark.parametrize("usar_presolve", [True, False])
+@pytest.mark.parametrize("linhas, status, objetivo, x", CASOS)
+def test_limites_de_uma_variavel(tmp_path, linhas, status, objetivo, x, usar_presolve):
+    caminho = tmp_path / "modelo.txt"
+    caminho.write_text("\n".join(["min x + y", "s.a. x + y >= -10", *linhas]) + "\n")
+    resultado = resolvedor.solve(str(caminho), usar_presolve=usar_presolve)
+    assert resultado.status == status
+    if objetivo is not None:
+        assert resultado.objetivo == pytest.approx(objetivo)
+        assert resultado.x["x"] == pytest.approx(x)
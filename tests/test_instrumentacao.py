@@ -0,0 +1,22 @@
+# Instrumentacao reaproveitada entre resoluções: a interrupção pedida pelo callback vale só para a resolução em que foi feita.
+#
+# Uso: python -m pytest tests
+import numpy as np
+
+import resolvedor
+from funcoes import ProblemaPL
+from instrumentacao import Instrumentacao
+
+def problema():
+    # max 3 x1 + 5 x2  s.a.  x1 <= 4,  2 x2 <= 12,  3 x1 + 2 x2 <= 18: ótimo 36, com alguns pivôs
+    return ProblemaPL(2, np.array(["x1", "x2"]), np.array([3.0, 5.0]), np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]),
+                      np.array([4.0, 12.0, 18.0]), np.array(["<=", "<=", "<="]), None, tipo=1)
+
+def test_interrupcao_nao_passa_para_a_proxima_resolucao():
+    parar = [True]
+    instrumentacao = Instrumentacao(callback=lambda iteracao: parar[0])
+    assert resolvedor.solve(problema(), instrumentacao=instrumentacao).status == "interrupted"
+    parar[0] = False
+    resultado = resolvedor.solve(problema(), instrumentacao=instrumentacao)
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == 36.0
@@ -0,0 +1,137 @@
+# Leitura e gravação de MPS: RANGES, BOUNDS, nomes de conjunto opcionais, formato fixo, .gz e ida e volta.
+#
+# Uso: python -m pytest tests
+import gzip
+
+import numpy as np
+import pytest
+
+import funcoes
+import mps
+import resolvedor
+from registro import REGISTRO_SILENCIOSO
+
+# min x - y + z - w + v + u + 10, cada linha isolando uma variável:
+#   E1: x = 4 com RANGE -3 -> 1 <= x <= 4     (x = 1)
+#   E2: y = 2 com RANGE +3 -> 2 <= y <= 5     (y = 5)
+#   L1: z <= 6 com RANGE 4 -> 2 <= z <= 6     (z = 2)
+#   G1: w >= 1 com RANGE -2 -> 1 <= w <= 3    (w = 3; em L e G vale |R|)
+#   G2: v >= -7, com UP v -2 sem LO: o limite inferior 0 é liberado (v = -7)
+#   u fixo em 3 (FX)
+# Ótimo: 1 - 5 + 2 - 3 - 7 + 3 + 10 = 1
+LINHAS = [
+    ("NAME", "TESTE"),
+    ("ROWS",),
+    ("", "N", "CUSTO"),
+    ("", "E", "E1"), ("", "E", "E2"), ("", "L", "L1"), ("", "G", "G1"), ("", "G", "G2"),
+    ("COLUMNS",),
+    ("", "", "x", "CUSTO", "1", "E1", "1"),
+    ("", "", "y", "CUSTO", "-1", "E2", "1"),
+    ("", "", "z", "CUSTO", "1", "L1", "1"),
+    ("", "", "w", "CUSTO", "-1", "G1", "1"),
+    ("", "", "v", "CUSTO", "1", "G2", "1"),
+    ("", "", "u", "CUSTO", "1"),
+    ("RHS",),
+    ("", "", "RHS", "E1", "4", "E2", "2"),
+    ("", "", "RHS", "L1", "6", "G1", "1"),
+    ("", "", "RHS", "G2", "-7", "CUSTO", "-10"),
+    ("", "", "OUTRO", "E1", "100"),  # Segundo conjunto de RHS: ignorado
+    ("RANGES",),
+    ("", "", "RNG", "E1", "-3", "E2", "3"),
+    ("", "", "RNG", "L1", "4", "G1", "-2"),
+    ("BOUNDS",),
+    ("", "UP", "BND", "v", "-2"),
+    ("", "FX", "BND", "u", "3"),
+    ("ENDATA",),
+]
+OTIMO = {"x": 1.0, "y": 5.0, "z": 2.0, "w": 3.0, "v": -7.0, "u": 3.0}
+
+def mps_livre(sem_conjuntos=False):
+    texto = []
+    for campos in LINHAS:
+        if len(campos) == 1 or campos[0] == "NAME":
+            texto.append(" ".join(campos))
+            continue
+        campos = [c for c in campos[1:] if c]
+        if sem_conjuntos and campos[0] == "OUTRO":
+            continue  # Sem nomes de conjunto, um segundo conjunto não teria como ser separado do primeiro
+        if sem_conjuntos and texto[-1] != "COLUMNS" and campos[0] in ("RHS", "RNG", "UP", "FX"):
+            # Sem o nome do conjunto (RHS e RANGES perdem o primeiro campo, BOUNDS o segundo)
+            campos = campos[1:] if campos[0] in ("RHS", "RNG") else [campos[0], *campos[2:]]
+        texto.append("    " + "  ".join(campos))
+    return "\n".join(texto) + "\n"
+
+def mps_fixo(espaco):
+    # Campos nas colunas 2-3, 5-12, 15-22, 25-36, 40-47 e 50-61; com espaco=True os nomes das variáveis têm espaços
+    larguras = ((1, 2), (4, 8), (14, 8), (24, 12), (39, 8), (49, 12))
+    texto = []
+    for campos in LINHAS:
+        if len(campos) == 1 or campos[0] == "NAME":
+            texto.append(" ".join(campos))
+            continue
+        linha = [" "] * 61
+        for (inicio, largura), campo in zip(larguras, campos[1:]):
+            if espaco and campo in OTIMO:
+                campo = f"var {campo}"
+            linha[inicio:inicio + len(campo)] = campo
+        texto.append("".join(linha).rstrip())
+    return "\n".join(texto) + "\n"
+
+def conferir(problema, nomes=None):
+    resultado = resolvedor.solve(problema)
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == pytest.approx(1.0)
+    for var, valor in OTIMO.items():
+        assert resultado.x[(nomes or {}).get(var, var)] == pytest.approx(valor)
+
+@pytest.mark.parametrize("sem_conjuntos", [False, True])
+def test_ranges_e_bounds(tmp_path, sem_conjuntos):
+    caminho = tmp_path / "teste.mps"
+    caminho.write_text(mps_livre(sem_conjuntos))
+    problema = mps.ler_mps(caminho, registro=REGISTRO_SILENCIOSO)
+    # As duas linhas com RANGE em E viram <= e >=; as cópias (com o outro extremo) vêm depois das linhas do arquivo
+    assert list(problema.vetor_operadores) == ["<=", ">=", "<=", ">=", ">=", ">=", "<=", ">=", "<="]
+    assert list(problema.vetor_b) == [4, 2, 6, 1, -7, 1, 5, 2, 3]
+    assert list(problema.nomes_restricoes[5:]) == ["E1_faixa", "E2_faixa", "L1_faixa", "G1_faixa"]
+    inferiores, superiores = funcoes.limites_das_variaveis(problema)
+    assert inferiores[4] == -np.inf and superiores[4] == -2
+    assert inferiores[5] == superiores[5] == 3
+    assert problema.constante_objetivo == 10
+    conferir(problema)
+
+@pytest.mark.parametrize("espaco", [False, True])
+def test_formato_fixo(tmp_path, espaco):
+    caminho = tmp_path / "teste.mps"
+    caminho.write_text(mps_fixo(espaco))
+    problema = mps.ler_mps(caminho, fixo=True, registro=REGISTRO_SILENCIOSO)
+    conferir(problema, {var: f"var {var}" for var in OTIMO} if espaco else None)
+
+def test_gz(tmp_path):
+    caminho = tmp_path / "teste.mps.gz"
+    with gzip.open(caminho, "wt", encoding="utf-8") as f:
+        f.write(mps_livre())
+    conferir(str(caminho))  # solve() reconhece .mps.gz pelo nome
+
+@pytest.mark.parametrize("esparso", [False, True])
+@pytest.mark.parametrize("extensao", [".mps", ".mps.gz"])
+def test_ida_e_volta(tmp_path, esparso, extensao):
+    original = tmp_path / "original.mps"
+    original.write_text(mps_livre())
+    problema = mps.ler_mps(original, esparso=esparso, registro=REGISTRO_SILENCIOSO)
+    copia = tmp_path / f"copia{extensao}"
+    mps.escrever_mps(problema, copia)
+    relido = mps.ler_mps(copia, esparso=esparso, registro=REGISTRO_SILENCIOSO)
+
+    def densa(p):
+        matriz = p.matriz_coeficientes
+        return matriz.toarray() if esparso else np.asarray(matriz)
+    assert np.array_equal(densa(relido), densa(problema))
+    assert list(relido.vetor_variaveis) == list(problema.vetor_variaveis)
+    assert list(relido.vetor_operadores) == list(problema.vetor_operadores)
+    assert list(relido.nomes_restricoes) == list(problema.nomes_restricoes)
+    assert np.array_equal(relido.vetor_b, problema.vetor_b)
+    assert np.array_equal(relido.vetor_de_custos, problema.vetor_de_custos)
+    assert relido.constante_objetivo == problema.constante_objetivo
+    for antes, depois in zip(funcoes.limites_das_variaveis(problema), funcoes.limites_das_variaveis(relido)):
+        assert np.array_equal(antes, depois)
+    conferir(relido)
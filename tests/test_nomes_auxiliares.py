@@ -0,0 +1,77 @@
+# Variáveis do arquivo com nomes iguais aos das colunas auxiliares da forma padrão (folgas f_k, excessos e_k,
+# artificiais a_k, variáveis negadas x'): as auxiliares são reconhecidas pela posição da coluna, não pelo nome.
+#
+# Uso: python -m pytest tests
+import pytest
+
+import resolvedor
+
+MODELO_MPS = """NAME COLISAO
+ROWS
+ N  OBJ
+ G  r1
+ L  r2
+COLUMNS
+    a_1  OBJ  1  r1  1
+    a_1  r2  1
+    f_1  OBJ  2  r1  1
+RHS
+    RHS  r1  2  r2  10
+ENDATA
+"""
+
+# min -2 x' - z  s.a.  x' + z <= 4,  x' <= 3,  z <= 2 (sem limite inferior: z vira uma coluna negada, z'): x' = 3, z = 1
+MODELO_LINHA = """NAME LINHA
+ROWS
+ N  OBJ
+ L  r1
+COLUMNS
+    x'  OBJ  -2  r1  1
+    z  OBJ  -1  r1  1
+RHS
+    RHS  r1  4
+BOUNDS
+ UP BND  x'  3
+ MI BND  z
+ UP BND  z  2
+ENDATA
+"""
+
+@pytest.fixture
+def arquivo_mps(tmp_path):
+    # min a_1 + 2 f_1  s.a.  a_1 + f_1 >= 2,  a_1 <= 10: ótimo em a_1 = 2, f_1 = 0
+    caminho = tmp_path / "colisao.mps"
+    caminho.write_text(MODELO_MPS)
+    return str(caminho)
+
+@pytest.mark.parametrize("usar_presolve", [True, False])
+@pytest.mark.parametrize("method", ["simplex", "ipm"])
+def test_variaveis_com_nomes_de_auxiliares(arquivo_mps, usar_presolve, method):
+    resultado = resolvedor.solve(arquivo_mps, usar_presolve=usar_presolve, method=method)
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == pytest.approx(2.0)
+    assert resultado.x == pytest.approx({"a_1": 2.0, "f_1": 0.0})
+    assert resultado.custos_reduzidos == pytest.approx({"a_1": 0.0, "f_1": 1.0})
+
+@pytest.mark.parametrize("usar_presolve", [True, False])
+def test_variavel_com_nome_de_coluna_negada(tmp_path, usar_presolve):
+    caminho = tmp_path / "linha.mps"
+    caminho.write_text(MODELO_LINHA)
+    resultado = resolvedor.solve(str(caminho), usar_presolve=usar_presolve)
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == pytest.approx(-7.0)
+    assert resultado.x == pytest.approx({"x'": 3.0, "z": 1.0})
+
+def test_sensibilidade_com_nomes_de_auxiliares(arquivo_mps, tmp_path):
+    resultado = resolvedor.solve(arquivo_mps, sensibilidade=True)
+    analise = resultado.sensibilidade
+    assert analise.custos_reduzidos == pytest.approx({"a_1": 0.0, "f_1": 1.0})
+    assert set(analise.faixas_custos) == {"a_1", "f_1"}
+    assert analise.faixas_custos["f_1"][0] == pytest.approx(1.0)
+
+    caminho = tmp_path / "linha.mps"
+    caminho.write_text(MODELO_LINHA)
+    analise = resolvedor.solve(str(caminho), sensibilidade=True).sensibilidade
+    # x' (nome do arquivo) não é uma coluna negada; z é (sem limite inferior) e volta com o nome e o sinal do arquivo
+    assert analise.custos_reduzidos == pytest.approx({"x'": -1.0, "z": 0.0})
+    assert set(analise.faixas_custos) == {"x'", "z"}
@@ -0,0 +1,52 @@
+# Retirada da perturbação do lado direito: se o simplex dual não conseguir voltar ao b original, o simplex volta à base
+# do momento da perturbação (viável) e continua; o PL nunca é dado como inviável por isso.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import funcoes
+import resolvedor
+from funcoes import ProblemaPL
+from instrumentacao import Instrumentacao
+from precificacao import RegraDevex
+
+def atribuicao(n=8, semente=0):
+    # Atribuição n x n: muito degenerada, o simplex perturba o lado direito na Fase I e na Fase II
+    custos = np.random.default_rng(semente).integers(1, 20, (n, n)).astype(float).ravel()
+    A = np.zeros((2 * n, n * n))
+    for i in range(n):
+        A[i, n * i:n * i + n] = 1
+        A[n + i, i::n] = 1
+    return ProblemaPL(n * n, np.array([f"x{j + 1}" for j in range(n * n)]), custos, A, np.ones(2 * n), np.array(["="] * (2 * n)), None)
+
+def test_falha_ao_retirar_perturbacao_nao_vira_inviavel(monkeypatch):
+    referencia = resolvedor.solve(atribuicao(), usar_presolve=False)
+    monkeypatch.setattr(funcoes, "retirar_perturbacao", lambda *args, **kwargs: None)
+    instrumentacao = Instrumentacao()
+    resultado = resolvedor.solve(atribuicao(), usar_presolve=False, instrumentacao=instrumentacao)
+    assert instrumentacao.contadores.get("perturbacoes", 0) >= 1
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == pytest.approx(referencia.objetivo)
+
+def test_regra_reiniciada_depois_de_retirar_perturbacao(monkeypatch):
+    # Os pivôs duais da retirada trocam a base sem passar pela regra: ela tem de ser reiniciada logo depois
+    eventos = []
+    retirar = funcoes.retirar_perturbacao
+
+    def retirar_e_anotar(*args, **kwargs):
+        pivos = retirar(*args, **kwargs)
+        if pivos is not None:
+            eventos.append("retirada")
+        return pivos
+
+    class RegraAnotada(RegraDevex):
+        def iniciar(self, fatoracao, N):
+            eventos.append("iniciar")
+            super().iniciar(fatoracao, N)
+
+    monkeypatch.setattr(funcoes, "retirar_perturbacao", retirar_e_anotar)
+    resultado = resolvedor.solve(atribuicao(), usar_presolve=False, regra=RegraAnotada())
+    assert resultado.status == "optimal"
+    assert "retirada" in eventos
+    assert all(eventos[k + 1:k + 2] == ["iniciar"] for k, evento in enumerate(eventos) if evento == "retirada")
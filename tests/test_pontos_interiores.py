@@ -0,0 +1,38 @@
+# Crossover do ponto interior para uma base, com linhas dependentes e faces ótimas degeneradas.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import pontos_interiores
+import resolvedor
+from funcoes import ProblemaPL
+from registro import REGISTRO_SILENCIOSO
+
+def transporte_balanceado():
+    # 3 fornecedores x 3 clientes com oferta = demanda: as 6 igualdades têm uma linha dependente, e os custos
+    # empatados deixam uma face ótima inteira (o ponto interior fica no meio dela)
+    oferta, demanda = [10, 20, 30], [15, 25, 20]
+    A = np.zeros((6, 9))
+    for i in range(3):
+        A[i, 3 * i:3 * i + 3] = 1
+        A[3 + i, i::3] = 1
+    custos = np.array([1, 1, 2, 1, 1, 2, 2, 2, 1], dtype=float)
+    return ProblemaPL(9, np.array([f"x{j + 1}" for j in range(9)]), custos, A, np.array(oferta + demanda, dtype=float),
+                      np.array(["="] * 6), None)
+
+@pytest.mark.parametrize("esparso", [False, True])
+def test_crossover_com_linha_dependente(esparso):
+    simplex = resolvedor.compilar(transporte_balanceado(), usar_presolve=False, esparso=esparso).simplex
+    resultado = pontos_interiores.resolver(simplex, registro=REGISTRO_SILENCIOSO)
+    assert resultado is not None
+    status, Z, B, colunas_base, _, x, _ = resultado
+    referencia = resolvedor.resolver_simplex(simplex, registro=REGISTRO_SILENCIOSO)
+    assert status == "optimal"
+    assert Z == pytest.approx(referencia[1])
+    assert len(colunas_base) == 6
+
+def test_solve_ipm_transporte():
+    resultado = resolvedor.solve(transporte_balanceado(), method="ipm", usar_presolve=False)
+    assert resultado.status == "optimal"
+    assert resultado.objetivo == pytest.approx(resolvedor.solve(transporte_balanceado()).objetivo)
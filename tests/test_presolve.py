@@ -0,0 +1,77 @@
+# Presolve: cada redução tem de deixar a mesma solução (primal e duais) que o PL resolvido sem ela.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import presolve
+import resolvedor
+from funcoes import ProblemaPL
+
+def problema(custos, A, b, operadores, tipo=0, inferiores=None, superiores=None):
+    n = len(custos)
+    return ProblemaPL(n, np.array([f"x{j + 1}" for j in range(n)]), np.array(custos, dtype=float), np.array(A, dtype=float),
+                      np.array(b, dtype=float), np.array(operadores), None, tipo=tipo,
+                      limites_inferiores=np.array(np.zeros(n) if inferiores is None else inferiores, dtype=float),
+                      limites_superiores=np.array(np.full(n, np.inf) if superiores is None else superiores, dtype=float))
+
+# (modelo, contador do relatório que a redução incrementa, objetivo). Todos têm primal e duais únicos.
+CASOS = {
+    # max x1 + 2 x2: x1 + x2 <= 4, x1 <= 3, 2 x2 <= 4 (ativa: o dual vem do postsolve), -x1 >= -3
+    "linhas_unitarias": (lambda: problema([1, 2], [[1, 1], [1, 0], [0, 2], [-1, 0]], [4, 3, 4, -3], ["<=", "<=", "<=", ">="], tipo=1),
+                         "linhas_unitarias", 6.0),
+    # max 3 x1 + 2 x2: x1 + x2 <= 4 e 2 x1 + 2 x2 <= 6 são paralelas (o dual fica na mais apertada), x1 - x2 <= 1
+    "linhas_duplicadas": (lambda: problema([3, 2], [[1, 1], [2, 2], [1, -1]], [4, 6, 1], ["<=", "<=", "<="], tipo=1),
+                          "linhas_duplicadas", 8.0),
+    # min 2 x1 + 3 x2 - x3 + x4: uma linha vazia e x3, x4 fora de todas as linhas (x3 vai a 5, x4 a 0)
+    "colunas_vazias": (lambda: problema([2, 3, -1, 1], [[1, 1, 0, 0], [0, 0, 0, 0], [1, 2, 0, 0]], [2, 1, 3], [">=", "<=", ">="],
+                                        superiores=[np.inf, np.inf, 5, np.inf]),
+                       "colunas_vazias", 0.0),
+    # min 2 x1 + 3 x2 + x3 com x3 fixa em 2 e x1, x2 <= 10: x1 + x2 <= 100 é redundante pelos limites
+    "variaveis_fixadas": (lambda: problema([2, 3, 1], [[1, 1, 1], [1, 2, 0], [1, 1, 0]], [4, 3, 100], [">=", ">=", "<="],
+                                           inferiores=[0, 0, 2], superiores=[10, 10, 2]),
+                          "variaveis_fixadas", 7.0),
+    "linhas_redundantes": (lambda: problema([2, 3, 1], [[1, 1, 1], [1, 2, 0], [1, 1, 0]], [4, 3, 100], [">=", ">=", "<="],
+                                            inferiores=[0, 0, 2], superiores=[10, 10, 2]),
+                           "linhas_redundantes", 7.0),
+    # min -x1 - x2 - 2 x3: x1 + x2 <= 0 fixa x1 e x2 em 0 pela atividade (limites implícitos)
+    "limites_implicitos": (lambda: problema([-1, -1, -2], [[1, 1, 0], [1, 0, 1], [0, 1, 1]], [0, 4, 6], ["<=", "<=", "<="]),
+                           "variaveis_fixadas", -8.0),
+}
+
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_mesma_solucao_com_e_sem_presolve(caso):
+    modelo, contador, objetivo = CASOS[caso]
+    reduzido, dados = presolve.presolve(modelo())
+    assert dados.relatorio[contador] > 0  # A redução realmente aconteceu
+    com = resolvedor.solve(modelo(), usar_presolve=True)
+    sem = resolvedor.solve(modelo(), usar_presolve=False)
+    assert com.status == sem.status == "optimal"
+    assert com.objetivo == pytest.approx(objetivo)
+    assert sem.objetivo == pytest.approx(objetivo)
+    for var in sem.x:
+        assert com.x[var] == pytest.approx(sem.x[var], abs=1e-9)
+        assert com.custos_reduzidos[var] == pytest.approx(sem.custos_reduzidos[var], abs=1e-9)
+    # Duais recuperados pelo postsolve_duais, inclusive das linhas removidas
+    np.testing.assert_allclose(com.duais, sem.duais, atol=1e-9)
+
+def test_duais_das_linhas_removidas():
+    # A linha de uma variável 2 x2 <= 4 está ativa e a paralela mais frouxa não: o postsolve devolve o dual a cada uma
+    resultado = resolvedor.solve(CASOS["linhas_unitarias"][0]())
+    np.testing.assert_allclose(resultado.duais, [1.0, 0.0, 0.5, 0.0], atol=1e-9)
+    resultado = resolvedor.solve(CASOS["linhas_duplicadas"][0]())
+    np.testing.assert_allclose(resultado.duais, [0.0, 1.25, 0.5], atol=1e-9)
+
+@pytest.mark.parametrize("modelo", [
+    # Linhas de uma variável que se contradizem: x1 >= 3 e x1 <= 2
+    lambda: problema([1, 1], [[1, 1], [1, 0], [1, 0]], [10, 3, 2], ["<=", ">=", "<="]),
+    # Linha vazia impossível: 0 >= 1
+    lambda: problema([1, 1], [[1, 1], [0, 0]], [10, 1], ["<=", ">="]),
+    # Limite implícito abaixo do declarado: x1 + x2 <= 1 com x1 >= 2
+    lambda: problema([1, 1], [[1, 1], [1, -1]], [1, 5], ["<=", "<="], inferiores=[2, 0]),
+])
+def test_inviavel_no_presolve(modelo):
+    reduzido, dados = presolve.presolve(modelo())
+    assert reduzido is None and dados.status == "infeasible"
+    assert resolvedor.solve(modelo(), usar_presolve=True).status == "infeasible"
+    assert resolvedor.solve(modelo(), usar_presolve=False).status == "infeasible"
@@ -0,0 +1,19 @@
+# Entradas de resolvedor chamadas sem os argumentos opcionais.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import resolvedor
+from funcoes import ProblemaPL
+
+def test_resolver_simplex_sem_registro():
+    # max 3x + 2y  s.a.  x + y <= 4,  x + 3y <= 6: a base das folgas já é viável (sem Fase I)
+    problema = ProblemaPL(2, np.array(["x", "y"]), np.array([3.0, 2.0]), np.array([[1.0, 1.0], [1.0, 3.0]]),
+                          np.array([4.0, 6.0]), np.array(["<=", "<="]), None, tipo=1)
+    modelo = resolvedor.compilar(problema, usar_presolve=False)
+    status, Z, _, colunas_base, _, x = resolvedor.resolver_simplex(modelo.simplex)
+    assert status == "optimal"
+    assert resolvedor.solve(problema).objetivo == pytest.approx(12.0)
+    # Partindo de uma base guardada (o caminho do cache), também sem registro
+    assert resolvedor.resolver_simplex(modelo.simplex, base_inicial=(np.asarray(colunas_base), x))[0] == "optimal"
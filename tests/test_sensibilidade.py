@@ -0,0 +1,24 @@
+# Análise de sensibilidade: preços sombra, custos reduzidos e faixas voltam do escalonamento para o arquivo.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import resolvedor
+from funcoes import ProblemaPL
+
+def mal_escalonado():
+    # max 3e3 x + 2e-2 y + z  s.a.  1e3 x + 1e-2 y <= 4e3,  1e3 x + 3e-2 y + 2 z <= 9e3,  z <= 2: coeficientes de 1e-2 a 3e3
+    return ProblemaPL(3, np.array(["x", "y", "z"]), np.array([3e3, 2e-2, 1.0]),
+                      np.array([[1e3, 1e-2, 0.0], [1e3, 3e-2, 2.0], [0.0, 0.0, 1.0]]), np.array([4e3, 9e3, 2.0]),
+                      np.array(["<=", "<=", "<="]), None, tipo=1)
+
+def test_mesma_analise_com_e_sem_escalonamento():
+    com = resolvedor.solve(mal_escalonado(), escalonar=True, sensibilidade=True).sensibilidade
+    sem = resolvedor.solve(mal_escalonado(), escalonar=False, sensibilidade=True).sensibilidade
+    assert com.precos_sombra == pytest.approx(sem.precos_sombra)
+    assert com.custos_reduzidos == pytest.approx(sem.custos_reduzidos)
+    for var, faixa in sem.faixas_custos.items():
+        assert com.faixas_custos[var] == pytest.approx(faixa)
+    for nome, faixa in sem.faixas_lado_direito.items():
+        assert com.faixas_lado_direito[nome] == pytest.approx(faixa)
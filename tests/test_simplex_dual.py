@@ -0,0 +1,42 @@
+# Reotimização pelo simplex dual (ProblemaResolvido.resolve) depois de mudar só o lado direito.
+#
+# Uso: python -m pytest tests
+import numpy as np
+import pytest
+
+import funcoes
+import simplex_dual
+from funcoes import ProblemaPL
+from registro import REGISTRO_SILENCIOSO
+
+def resolvido(custos, A, b, operadores, inferiores=None, superiores=None):
+    n = len(custos)
+    problema = ProblemaPL(n, np.array([f"x{j + 1}" for j in range(n)]), np.array(custos, dtype=float), np.array(A, dtype=float),
+                          np.array(b, dtype=float), np.array(operadores), None, tipo=0,
+                          limites_inferiores=inferiores, limites_superiores=superiores)
+    forma_padrao = funcoes.transformar_para_forma_padrao(problema, registro=REGISTRO_SILENCIOSO)
+    return simplex_dual.resolver_problema(forma_padrao, registro=REGISTRO_SILENCIOSO)
+
+def test_linha_redundante_deixa_artificial_na_base():
+    # min x1 + x2  s.a.  x1 + x2 = 4,  x1 + x2 = 4,  2 x1 + x2 >= 5: a segunda igualdade deixa uma artificial na base
+    resultado = resolvido([1, 1], [[1, 1], [1, 1], [2, 1]], [4, 4, 5], ["=", "=", ">="])
+    assert resultado.status == "optimal"
+    assert resultado.Z == pytest.approx(4.0)
+    status, Z, basicas, _ = resultado.resolve([3, 3, 5])
+    assert (status, Z) == ("optimal", pytest.approx(3.0))
+    assert all(nome in ("x1", "x2", "e_1") for nome in basicas)
+    assert resultado.valores()["x1"] == pytest.approx(2.0)
+    # Igualdades redundantes que deixam de concordar: a artificial não pode sair de 0
+    assert resultado.resolve([3, 2, 5])[0] == "infeasible"
+
+def test_resolve_com_limite_superior():
+    # min -x1 - 2 x2  s.a.  x1 + x2 <= b,  x1 <= 3,  x2 <= 2
+    resultado = resolvido([-1, -2], [[1, 1]], [4], ["<="], np.zeros(2), np.array([3.0, 2.0]))
+    assert resultado.Z == pytest.approx(-6.0)
+    status, Z, _, _ = resultado.resolve([10])
+    assert (status, Z) == ("optimal", pytest.approx(-7.0))
+    assert resultado.valores()["x1"] == pytest.approx(3.0)
+    assert resultado.valores()["x2"] == pytest.approx(2.0)
+    status, Z, _, _ = resultado.resolve([1])
+    assert (status, Z) == ("optimal", pytest.approx(-2.0))
+    assert resultado.valores()["x2"] == pytest.approx(1.0)